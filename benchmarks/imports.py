@@ -0,0 +1,87 @@
+'''
+Measure import time of pyrpiic modules in fresh interpreters and check that importing one
+driver does not load the dependencies of others.
+
+Usage:
+    python benchmarks/imports.py [-k FILTER] [--repeat N]
+'''
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that importing the key must not load
+IMPORT_BUDGETS: Dict[str, List[str]] = {
+    'pyrpiic': ['pyrpio', 'numpy', 'bitarray'],
+    'pyrpiic.clock': ['pyrpio', 'numpy', 'bitarray'],
+    'pyrpiic.clock.lmk61e2': ['numpy', 'pyrpiic.clock.si570'],
+    'pyrpiic.clock.si570': ['numpy', 'pyrpiic.clock.lmk61e2'],
+    'pyrpiic.eeprom': ['pyrpio', 'numpy', 'bitarray'],
+    'pyrpiic.eeprom.instances': ['numpy', 'bitarray'],
+    'pyrpiic.ioexpander': ['pyrpio', 'numpy', 'bitarray'],
+    'pyrpiic.ioexpander.tca6416a': ['numpy', 'bitarray', 'pyrpiic.ioexpander.pca9698'],
+    'pyrpiic.sensor.hdc1080': ['numpy', 'bitarray'],
+    'pyrpiic.sensor.ldc161x': ['numpy', 'bitarray'],
+    'pyrpiic.sim': ['pyrpio', 'numpy', 'pyrpiic.sim.sensor'],
+}
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'time': elapsed, 'modules': sorted(sys.modules)}}))
+'''
+
+
+def measure_import(module: str, repeat: int = 1) -> Dict[str, object]:
+    '''
+    Import module in fresh interpreters.
+
+    Returns:
+        Dict[str, object]: median import time (s) and modules loaded by the import
+    '''
+    times = []
+    modules: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module)], cwd=REPO_DIR, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True
+        ).stdout
+        result = json.loads(output)
+        times.append(result['time'])
+        modules = result['modules']
+    return {'time': statistics.median(times), 'modules': modules}
+
+
+def violations(module: str, loaded: List[str]) -> List[str]:
+    ''' Forbidden modules (or their submodules) loaded by importing module. '''
+    forbidden = IMPORT_BUDGETS.get(module, [])
+    return [name for name in forbidden if any(m == name or m.startswith(name + '.') for m in loaded)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='pyrpiic import time benchmark')
+    parser.add_argument('-k', dest='filter', default='', help='only measure modules containing FILTER')
+    parser.add_argument('--repeat', type=int, default=5, help='interpreters per module (median is reported)')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    print(f'{"module":<32} {"import ms":>10}  unexpected')
+    for module in IMPORT_BUDGETS:
+        if args.filter not in module:
+            continue
+        result = measure_import(module, repeat=args.repeat)
+        unexpected = violations(module, result['modules'])
+        failures += bool(unexpected)
+        print(f'{module:<32} {result["time"] * 1e3:>10.1f}  {", ".join(unexpected)}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
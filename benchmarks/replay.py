@@ -0,0 +1,71 @@
+'''
+Record a driver sequence against hardware once, then replay and profile it w/o hardware.
+
+SEQUENCE is "module:function"; the function takes an (open) bus and runs drivers on it,
+e.g. a full board bring-up.
+
+Usage:
+    python benchmarks/replay.py --record /dev/i2c-3 CAPTURE SEQUENCE
+    python benchmarks/replay.py CAPTURE SEQUENCE [--time-scale S]
+'''
+import argparse
+import importlib
+import os
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # run from source tree
+from pyrpiic.capture import Capture, RecordingI2C, ReplayI2C  # noqa: E402 pylint: disable=wrong-import-position
+from pyrpiic.profiler import I2CProfiler  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def load_sequence(spec: str) -> Callable:
+    ''' Import "module:function". '''
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+def record(bus_path: str, capture_path: str, sequence: Callable):
+    ''' Run sequence on hardware bus and record its traffic. '''
+    from pyrpio.i2c import I2C  # pylint: disable=import-outside-toplevel
+    bus = RecordingI2C(I2C(bus_path), capture_path)
+    bus.open()
+    try:
+        sequence(bus)
+    finally:
+        bus.close()
+    print(f'recorded {len(bus.capture)} operations ({bus.capture.duration * 1e3:.3f} ms) to {capture_path}')
+
+
+def replay(capture_path: str, sequence: Callable, time_scale: float = 1.0) -> int:
+    ''' Replay sequence against capture under the profiler. '''
+    capture = Capture.load(capture_path)
+    profiler = I2CProfiler()
+    bus = ReplayI2C(capture, time_scale=time_scale)
+    with profiler:
+        start = time.perf_counter()
+        sequence(profiler.wrap_bus(bus))
+        elapsed = time.perf_counter() - start
+    print(profiler.summary())
+    print(f'replayed {bus.position}/{len(capture)} operations in {elapsed * 1e3:.3f} ms '
+          f'(recorded {capture.duration * 1e3:.3f} ms, time scale {time_scale})')
+    return 0 if bus.done else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='pyrpiic I2C record/replay')
+    parser.add_argument('capture', help='capture file')
+    parser.add_argument('sequence', help='module:function taking a bus')
+    parser.add_argument('--record', metavar='BUS', help='record on hardware bus (e.g. /dev/i2c-3) instead of replaying')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='recorded time multiplier (0 = no waits)')
+    args = parser.parse_args(argv)
+    sequence = load_sequence(args.sequence)
+    if args.record:
+        record(args.record, args.capture, sequence)
+        return 0
+    return replay(args.capture, sequence, time_scale=args.time_scale)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+'''
+Run driver benchmarks on the simulated bus and compare against stored baseline.
+
+Usage:
+    python benchmarks/run.py [-k FILTER] [--update-baseline] [--baseline PATH] [--json PATH]
+'''
+import argparse
+import json
+import os
+import sys
+from typing import Dict
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))  # run from source tree w/o installing
+from scenarios import SCENARIOS, compare, run_scenario  # noqa: E402 pylint: disable=wrong-import-position
+
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+BASELINE_METRICS = ('transactions', 'bytes_read', 'bytes_written', 'sleeps', 'sleep_time', 'sim_time')
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    ''' Load baseline results (empty if missing). '''
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = BASELINE_PATH):
+    ''' Store deterministic metrics of results as baseline. '''
+    baseline = {
+        name: {key: round(result[key], 9) for key in BASELINE_METRICS}
+        for name, result in sorted(results.items())
+    }
+    with open(path, 'w', encoding='utf-8') as fp:
+        json.dump(baseline, fp, indent=2)
+        fp.write('\n')
+
+
+def format_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> str:
+    ''' Render results as a text table. '''
+    header = (f'{"scenario":<40} {"txns":>6} {"base":>6} {"rd B":>7} {"wr B":>7} {"sleeps":>6} '
+              f'{"sleep ms":>9} {"sim ms":>9} {"wall ms":>9}')
+    rows = [header, '-' * len(header)]
+    for name, r in results.items():
+        base = baseline.get(name, {}).get('transactions', '-')
+        rows.append(f'{name:<40} {r["transactions"]:>6} {base:>6} {r["bytes_read"]:>7} {r["bytes_written"]:>7} '
+                    f'{r["sleeps"]:>6} {r["sleep_time"] * 1e3:>9.3f} {r["sim_time"] * 1e3:>9.3f} '
+                    f'{r["wall_time"] * 1e3:>9.3f}')
+    return '\n'.join(rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='pyrpiic driver benchmarks')
+    parser.add_argument('-k', dest='filter', default='', help='only run scenarios containing FILTER')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON path')
+    parser.add_argument('--update-baseline', action='store_true', help='store results as new baseline')
+    parser.add_argument('--json', dest='json_path', help='write full results to JSON path')
+    args = parser.parse_args(argv)
+
+    results = {name: run_scenario(name) for name in SCENARIOS if args.filter in name}
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as fp:
+            json.dump(results, fp, indent=2)
+    if args.update_baseline:
+        save_baseline({**baseline, **results}, args.baseline)
+        print(f'Baseline updated: {args.baseline}')
+        return 0
+    failures = compare(results, baseline)
+    for name, reason in failures.items():
+        print(f'BUDGET EXCEEDED {name}: {reason}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,391 @@
+''' Driver benchmark scenarios: public pyrpiic driver operations on a simulated bus. '''
+import time
+from typing import Callable, Dict
+from pyrpio.i2c.types import I2CBase
+from pyrpiic.clock.lmk61e2 import LMK61E2
+from pyrpiic.clock.si570 import SI570
+from pyrpiic.eeprom import M24C02
+from pyrpiic.ioexpander import GPIODir, PCA9698, TCA6416A
+from pyrpiic.profiler import I2CProfiler
+from pyrpiic.profiles import compile_profile
+from pyrpiic.scheduler import StepScheduler
+from pyrpiic.sensor.hdc1080 import HDC1080
+from pyrpiic.sensor.ldc161x import LDC161X
+from pyrpiic.sensor.ldc_stream import LDCStream
+from pyrpiic.sim import (SimEEPROM, SimHDC1080, SimI2C, SimLDC1614, SimLMK61E2, SimPCA9698, SimSI570,
+                         SimTCA6416A)
+from pyrpiic.steps import run_steps
+
+EEPROM_ADDRESS = 0x50
+LMK61E2_ADDRESS = 0x5A
+SI570_ADDRESS = 0x55
+TCA6416A_ADDRESS = 0x20
+PCA9698_ADDRESS = 0x21
+HDC1080_ADDRESS = 0x40
+LDC1614_ADDRESS = 0x2A
+
+# Metrics that must not grow relative to baseline
+BUDGET_METRICS = ('transactions',)
+
+Scenario = Callable[[I2CBase], Callable[[], object]]
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str):
+    ''' Register scenario. Decorated function builds drivers on bus and returns measured operation. '''
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def make_bus() -> SimI2C:
+    ''' Simulated bus w/ every supported chip attached. '''
+    bus = SimI2C('/dev/i2c-sim')
+    bus.attach(EEPROM_ADDRESS, SimEEPROM())
+    bus.attach(LMK61E2_ADDRESS, SimLMK61E2())
+    bus.attach(SI570_ADDRESS, SimSI570())
+    bus.attach(TCA6416A_ADDRESS, SimTCA6416A())
+    bus.attach(PCA9698_ADDRESS, SimPCA9698())
+    bus.attach(HDC1080_ADDRESS, SimHDC1080())
+    bus.attach(LDC1614_ADDRESS, SimLDC1614())
+    bus.open()
+    return bus
+
+
+def run_scenario(name: str) -> Dict[str, float]:
+    '''
+    Run scenario on a fresh simulated bus.
+
+    Returns:
+        Dict[str, float]: transactions, bytes_read, bytes_written, sleeps, sleep_time (s),
+            sim_time (simulated bus + sleep time) (s) and wall_time (s)
+    '''
+    sim = make_bus()
+    profiler = I2CProfiler(sleep=sim.clock.sleep)
+    bus = profiler.wrap_bus(sim)
+    with sim.clock.patch_sleep():
+        operation = SCENARIOS[name](bus)
+    profiler.reset()
+    sim_start = sim.clock.now()
+    with profiler:
+        start = time.perf_counter()
+        operation()
+        wall_time = time.perf_counter() - start
+    totals = {'transactions': 0, 'bytes_read': 0, 'bytes_written': 0, 'sleeps': 0, 'sleep_time': 0.0}
+    for stats in profiler.devices.values():
+        for key in totals:
+            totals[key] += getattr(stats, key)
+    totals['sim_time'] = sim.clock.now() - sim_start
+    totals['wall_time'] = wall_time
+    return totals
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> Dict[str, str]:
+    ''' Budget violations per scenario (scenarios missing from baseline are not checked). '''
+    failures = {}
+    for name, result in results.items():
+        budget = baseline.get(name)
+        if budget is None:
+            continue
+        grown = [f'{key} {budget[key]} -> {result[key]}' for key in BUDGET_METRICS if result[key] > budget[key]]
+        if grown:
+            failures[name] = ', '.join(grown)
+    return failures
+
+
+# EEPROM
+
+@scenario('eeprom.read_byte')
+def eeprom_read_byte(bus):
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    return lambda: eeprom.read_byte(0x10)
+
+
+@scenario('eeprom.write_byte')
+def eeprom_write_byte(bus):
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    return lambda: eeprom.write_byte(0x10, b'\x5A')
+
+
+@scenario('eeprom.write_string')
+def eeprom_write_string(bus):
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    return lambda: eeprom.write_string(0x08, 'SERIAL-0123456789')
+
+
+@scenario('eeprom.read_string')
+def eeprom_read_string(bus):
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    eeprom.write_string(0x08, 'SERIAL-0123456789')
+    return lambda: eeprom.read_string(0x08)
+
+
+@scenario('eeprom.dump')
+def eeprom_dump(bus):
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    return eeprom.dump
+
+
+@scenario('eeprom.program')
+def eeprom_program(bus):
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    image = bytes(range(256))
+    return lambda: eeprom.write_sequential_bytes(0x00, image)
+
+
+@scenario('eeprom.erase_all')
+def eeprom_erase_all(bus):
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    return eeprom.erase_all
+
+
+# Clocks
+
+@scenario('lmk61e2.get_frequency')
+def lmk61e2_get_frequency(bus):
+    clock = LMK61E2(bus, LMK61E2_ADDRESS)
+    return clock.get_frequency
+
+
+@scenario('lmk61e2.set_frequency')
+def lmk61e2_set_frequency(bus):
+    clock = LMK61E2(bus, LMK61E2_ADDRESS)
+    return lambda: clock.set_frequency(100e6)
+
+
+@scenario('lmk61e2.set_frequency_nonvolatile')
+def lmk61e2_set_frequency_nonvolatile(bus):
+    clock = LMK61E2(bus, LMK61E2_ADDRESS)
+    return lambda: clock.set_frequency(100e6, nonvolatile=True)
+
+
+@scenario('si570.get_frequency')
+def si570_get_frequency(bus):
+    clock = SI570(bus, SI570_ADDRESS)
+    return clock.get_frequency
+
+
+@scenario('si570.set_frequency')
+def si570_set_frequency(bus):
+    clock = SI570(bus, SI570_ADDRESS)
+    return lambda: clock.set_frequency(156.25e6)
+
+
+# GPIO expanders
+
+def _expander_scenarios(prefix: str, cls, address: int, pins):
+    def build(bus, shadow: bool = False):
+        expander = cls(bus, address, shadow=shadow)
+        expander.set_gpio_directions({pin: GPIODir.OUT for pin in pins})
+        return expander
+
+    @scenario(f'{prefix}.toggle_pin')
+    def toggle_pin(bus):
+        expander = build(bus)
+        return lambda: [expander.set_gpio_output(pins[0], i % 2) for i in range(10)]
+
+    @scenario(f'{prefix}.toggle_pin_shadow')
+    def toggle_pin_shadow(bus):
+        expander = build(bus, shadow=True)
+        return lambda: [expander.set_gpio_output(pins[0], i % 2) for i in range(10)]
+
+    @scenario(f'{prefix}.set_gpio_outputs')
+    def set_gpio_outputs(bus):
+        expander = build(bus)
+        return lambda: expander.set_gpio_outputs({pin: i % 2 for i, pin in enumerate(pins)})
+
+    @scenario(f'{prefix}.set_output_ports')
+    def set_output_ports(bus):
+        expander = build(bus)
+        return lambda: expander.set_output_ports([0xA5] * expander.NUM_PORTS)
+
+    @scenario(f'{prefix}.get_gpio_input')
+    def get_gpio_input(bus):
+        expander = build(bus)
+        return lambda: expander.get_gpio_input(pins[0])
+
+    @scenario(f'{prefix}.get_gpio_inputs')
+    def get_gpio_inputs(bus):
+        expander = build(bus)
+        return expander.get_gpio_inputs
+
+    @scenario(f'{prefix}.set_gpio_direction')
+    def set_gpio_direction(bus):
+        expander = build(bus)
+        return lambda: expander.set_gpio_direction(pins[-1], GPIODir.IN)
+
+
+_expander_scenarios('tca6416a', TCA6416A, TCA6416A_ADDRESS, ['P00', 'P07', 'P10', 'P17'])
+_expander_scenarios('pca9698', PCA9698, PCA9698_ADDRESS, ['IO0_0', 'IO1_3', 'IO2_5', 'IO4_7'])
+
+
+# Sensors
+
+@scenario('hdc1080.read_temperature')
+def hdc1080_read_temperature(bus):
+    sensor = HDC1080(bus, HDC1080_ADDRESS)
+    return sensor.read_temperature
+
+
+@scenario('hdc1080.read_humidity')
+def hdc1080_read_humidity(bus):
+    sensor = HDC1080(bus, HDC1080_ADDRESS)
+    return sensor.read_humidity
+
+
+@scenario('hdc1080.read_temperature_humidity')
+def hdc1080_read_temperature_humidity(bus):
+    sensor = HDC1080(bus, HDC1080_ADDRESS)
+    sensor.configure()
+    return sensor.read_temperature_humidity
+
+
+@scenario('hdc1080.read_temperature_humidity_poll')
+def hdc1080_read_temperature_humidity_poll(bus):
+    sensor = HDC1080(bus, HDC1080_ADDRESS, poll_ready=True)
+    sensor.configure()
+    return sensor.read_temperature_humidity
+
+
+@scenario('hdc1080.set_resolution')
+def hdc1080_set_resolution(bus):
+    sensor = HDC1080(bus, HDC1080_ADDRESS)
+    return lambda: (sensor.set_temperature_resolution(HDC1080.TempResolution.eleven),
+                    sensor.set_humidity_resolution(HDC1080.HumidityResolution.eight))
+
+
+@scenario('hdc1080.read_ids')
+def hdc1080_read_ids(bus):
+    sensor = HDC1080(bus, HDC1080_ADDRESS)
+    return lambda: (sensor.read_manufacturer_id(), sensor.read_device_id(), sensor.read_serial_number())
+
+
+def _ldc(bus) -> LDC161X:
+    ldc = LDC161X(bus, LDC1614_ADDRESS)
+    ldc.apply_timing_plan(ldc.plan_timing(40e6, 1e6, 5e6, num_chs=4, sample_rate=1000))
+    ldc.configure_sequential_channels(4)
+    ldc.sleep_mode = False
+    return ldc
+
+
+@scenario('ldc1614.apply_timing_plan')
+def ldc1614_apply_timing_plan(bus):
+    ldc = LDC161X(bus, LDC1614_ADDRESS)
+    plan = ldc.plan_timing(40e6, 1e6, 5e6, num_chs=4, sample_rate=1000)
+    return lambda: ldc.apply_timing_plan(plan)
+
+
+@scenario('ldc1614.get_channel_data')
+def ldc1614_get_channel_data(bus):
+    ldc = _ldc(bus)
+    return lambda: [ldc.get_channel_data(ch) for ch in range(4)]
+
+
+@scenario('ldc1614.read_all_channels')
+def ldc1614_read_all_channels(bus):
+    ldc = _ldc(bus)
+    return ldc.read_all_channels
+
+
+@scenario('ldc1614.get_channel_config')
+def ldc1614_get_channel_config(bus):
+    ldc = _ldc(bus)
+    return lambda: [ldc.get_channel_config(ch, 40e6) for ch in range(4)]
+
+
+@scenario('ldc1614.data_ready')
+def ldc1614_data_ready(bus):
+    ldc = _ldc(bus)
+    return lambda: ldc.data_ready
+
+
+@scenario('ldc1614.stream_acquire')
+def ldc1614_stream_acquire(bus):
+    ldc = _ldc(bus)
+    stream = LDCStream(ldc, channels=range(4), fclk=40e6, capacity=64)
+    stream.configure()
+    return lambda: stream.acquire(10, configure=False)
+
+
+# Scheduling
+
+def _board_bring_up_steps(bus):
+    ''' Program EEPROM, store clock frequency in NVM and take a sensor reading. '''
+    eeprom = M24C02(bus, EEPROM_ADDRESS)
+    clock = LMK61E2(bus, LMK61E2_ADDRESS)
+    sensor = HDC1080(bus, HDC1080_ADDRESS)
+    sensor.configure()
+    image = bytes(range(256))
+    return lambda: [eeprom.write_sequential_bytes_steps(0x00, image),
+                    clock.set_frequency_steps(100e6, nonvolatile=True),
+                    sensor.read_temperature_humidity_steps()]
+
+
+@scenario('board.bring_up_blocking')
+def board_bring_up_blocking(bus):
+    operations = _board_bring_up_steps(bus)
+    return lambda: [run_steps(steps) for steps in operations()]
+
+
+@scenario('board.bring_up_scheduled')
+def board_bring_up_scheduled(bus):
+    operations = _board_bring_up_steps(bus)
+
+    def bring_up():
+        scheduler = StepScheduler(clock=bus.clock.now)
+        for steps in operations():
+            scheduler.submit(steps)
+        return scheduler.run()
+    return bring_up
+
+
+# Snapshots
+
+def _board_test_mode(bus):
+    ''' Drivers and setter sequence configuring a board test mode. '''
+    clock = LMK61E2(bus, LMK61E2_ADDRESS)
+    expander = PCA9698(bus, PCA9698_ADDRESS)
+    ldc = LDC161X(bus, LDC1614_ADDRESS)
+    plan = ldc.plan_timing(40e6, 1e6, 5e6, num_chs=4, sample_rate=1000)
+    pins = ['IO0_0', 'IO1_3', 'IO2_5', 'IO4_7']
+
+    def test_mode():
+        clock.set_frequency(100e6)
+        expander.set_gpio_directions({pin: GPIODir.OUT for pin in pins})
+        expander.set_gpio_outputs({pin: i % 2 for i, pin in enumerate(pins)})
+        ldc.apply_timing_plan(plan)
+        ldc.configure_sequential_channels(4)
+        ldc.sleep_mode = False
+    return (clock, expander, ldc), test_mode
+
+
+@scenario('board.test_mode_setters')
+def board_test_mode_setters(bus):
+    _, test_mode = _board_test_mode(bus)
+    return test_mode
+
+
+@scenario('board.test_mode_restore')
+def board_test_mode_restore(bus):
+    drivers, test_mode = _board_test_mode(bus)
+    defaults = [driver.snapshot() for driver in drivers]
+    test_mode()
+    snapshots = [driver.snapshot() for driver in drivers]
+    for driver, snapshot in zip(drivers, defaults):
+        driver.restore(snapshot)
+    return lambda: [driver.restore(snapshot) for driver, snapshot in zip(drivers, snapshots)]
+
+
+@scenario('board.test_mode_profiles')
+def board_test_mode_profiles(bus):
+    pins = ['IO0_0', 'IO1_3', 'IO2_5', 'IO4_7']
+    compiled = [compile_profile(profile, cache_dir=None) for profile in (
+        {'device': 'LMK61E2', 'address': LMK61E2_ADDRESS, 'settings': {'frequency': 100e6}},
+        {'device': 'PCA9698', 'address': PCA9698_ADDRESS, 'settings': {
+            'outputs': {pin: i % 2 for i, pin in enumerate(pins)}, 'directions': {pin: 'OUT' for pin in pins}}},
+        {'device': 'LDC161X', 'address': LDC1614_ADDRESS, 'settings': {
+            'timing': {'fclk': 40e6, 'fsensor_min': 1e6, 'fsensor_max': 5e6, 'num_chs': 4, 'sample_rate': 1000},
+            'sequential_channels': 4, 'sleep_mode': False}},
+    )]
+    return lambda: [profile.apply(bus) for profile in compiled]
@@ -0,0 +1,39 @@
+import pytest
+
+from run import load_baseline
+from scenarios import SCENARIOS, compare, make_bus, run_scenario
+
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+baseline = load_baseline()
+
+
+@pytest.mark.parametrize('name', sorted(SCENARIOS))
+def test_transaction_budget(name):
+    result = run_scenario(name)
+    assert name in baseline, f'{name} missing from baseline (python benchmarks/run.py --update-baseline)'
+    assert not compare({name: result}, baseline), f'{name} exceeds budget: {result} vs {baseline[name]}'
+
+
+def test_compare_budget():
+    budget = {'a': {'transactions': 4}}
+    assert not compare({'a': {'transactions': 3}, 'b': {'transactions': 9}}, budget)
+    assert compare({'a': {'transactions': 5}}, budget) == {'a': 'transactions 4 -> 5'}
+
+
+@pytest.mark.skipif(pytest_benchmark is None, reason='wall time is tracked w/ pytest-benchmark')
+@pytest.mark.parametrize('name', sorted(SCENARIOS))
+def test_wall_time(name, request):
+    benchmark = request.getfixturevalue('benchmark')
+    sim = make_bus()
+    with sim.clock.patch_sleep():
+        operation = SCENARIOS[name](sim)
+        benchmark(operation)
+
+
+def test_run_scenario_isolated():
+    result = run_scenario('eeprom.program')
+    assert result['sleeps'] == 16 and result['sleep_time'] == pytest.approx(16 * 0.005)
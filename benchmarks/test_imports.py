@@ -0,0 +1,18 @@
+import pytest
+
+from imports import IMPORT_BUDGETS, measure_import, violations
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS))
+def test_import_budget(module):
+    result = measure_import(module)
+    assert module in result['modules']
+    assert not violations(module, result['modules'])
+
+
+def test_lazy_package_attributes():
+    import pyrpiic.ioexpander  # pylint: disable=import-outside-toplevel
+    assert 'PCA9698' in dir(pyrpiic.ioexpander)
+    assert pyrpiic.ioexpander.PCA9698.NUM_PORTS == 5
+    with pytest.raises(AttributeError):
+        pyrpiic.ioexpander.PCA9999  # pylint: disable=pointless-statement
@@ -0,0 +1,116 @@
+''' Asyncio facade of pyrpiic drivers. '''
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
+from pyrpio.i2c.types import I2CBase
+from .steps import Steps, advance
+
+T = TypeVar('T')
+
+_executors: Dict[object, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def bus_executor(bus: I2CBase) -> ThreadPoolExecutor:
+    ''' Single-thread executor running all I/O of bus (keyed by bus path). '''
+    key = getattr(bus, 'path', None) or id(bus)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            name = f'pyrpiic-{key}'.replace('/', '-') if isinstance(key, str) else f'pyrpiic-{key:x}'
+            executor = _executors[key] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        return executor
+
+
+def shutdown_executors(wait: bool = True):
+    ''' Stop all bus executor threads (new ones are created on demand). '''
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+async def run_steps_async(steps: Steps[T], executor: Optional[ThreadPoolExecutor] = None) -> T:
+    '''
+    Run steps w/ bus I/O on executor and waits as asyncio.sleep, so the executor thread
+    is free to serve other devices on the same bus while this one waits.
+    '''
+    loop = asyncio.get_running_loop()
+    done, value = await loop.run_in_executor(executor, advance, steps)
+    while not done:
+        await asyncio.sleep(value)
+        done, value = await loop.run_in_executor(executor, advance, steps)
+    return value
+
+
+def _driver_bus(driver) -> I2CBase:
+    for name in ('bus', 'i2c'):
+        bus = getattr(driver, name, None)
+        if bus is not None:
+            return bus
+    raise ValueError(f'Unable to determine bus of {type(driver).__name__}, pass bus explicitly')
+
+
+class AsyncDriver:
+    '''
+    Asyncio facade of a driver. Driver methods become coroutines running on the bus executor
+    (one thread per bus). Operations w/ a <name>_steps() variant (EEPROM writes, HDC1080
+    conversions, LMK61E2 NVM programming, ...) await their delays w/ asyncio.sleep so waits of
+    many devices overlap. Properties doing bus I/O are read w/ get().
+
+    Example:
+        sensor = AsyncDriver(HDC1080(bus))
+        eeprom = AsyncDriver(M24C02(bus, 0x50))
+        (t, rh), _ = await asyncio.gather(sensor.read_temperature_humidity(), eeprom.write_string(0, 'SN42'))
+    '''
+
+    def __init__(self, driver, bus: Optional[I2CBase] = None):
+        '''
+        Args:
+            driver: Driver instance to wrap
+            bus (I2CBase, optional): Bus of driver. Defaults to driver.bus (or driver.i2c).
+        '''
+        self.driver = driver
+        self.bus = bus if bus is not None else _driver_bus(driver)
+        self.executor = bus_executor(self.bus)
+
+    @classmethod
+    async def create(cls, driver_cls: Type, bus: I2CBase, *args, **kwargs) -> 'AsyncDriver':
+        ''' Construct driver_cls(bus, *args, **kwargs) on bus executor (constructors may do I/O or wait). '''
+        executor = bus_executor(bus)
+        loop = asyncio.get_running_loop()
+        driver = await loop.run_in_executor(executor, functools.partial(driver_cls, bus, *args, **kwargs))
+        return cls(driver, bus=bus)
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        ''' Run blocking callable on bus executor. '''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def run_steps(self, steps: Steps[T]) -> T:
+        ''' Run steps on bus executor w/ asynchronous waits. '''
+        return await run_steps_async(steps, self.executor)
+
+    async def get(self, name: str) -> Any:
+        ''' Read driver attribute (e.g. property doing bus I/O) on bus executor. '''
+        return await self.run(getattr, self.driver, name)
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not found on facade
+        driver = self.__dict__['driver']
+        if isinstance(getattr(type(driver), name, None), property):
+            raise AttributeError(f'{name} is a property of {type(driver).__name__}, use await get({name!r})')
+        attr = getattr(driver, name)
+        if not callable(attr):
+            return attr
+        steps = getattr(driver, f'{name}_steps', None)
+        if callable(steps):
+            async def method(*args, **kwargs):
+                return await self.run_steps(steps(*args, **kwargs))
+        else:
+            async def method(*args, **kwargs):
+                return await self.run(attr, *args, **kwargs)
+        return functools.wraps(attr)(method)
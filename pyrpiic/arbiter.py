@@ -0,0 +1,191 @@
+''' Thread-safe arbitration of I2C buses shared by several drivers. '''
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from pyrpio.i2c.types import I2CBase, I2CMessage
+from .bus import I2CProxy
+
+
+@dataclass
+class ArbiterStats:
+    ''' Queueing statistics of one physical bus. '''
+    acquisitions: int = 0
+    contentions: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+    max_queue_depth: int = 0
+
+    @property
+    def mean_wait(self) -> float:
+        ''' Mean wait per acquisition (s). '''
+        return self.wait_time / self.acquisitions if self.acquisitions else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        ''' Export stats. '''
+        return {**self.__dict__, 'mean_wait': self.mean_wait}
+
+
+class BusArbiter:
+    '''
+    Lock and queueing statistics of one physical bus. One arbiter exists per bus path
+    (see BusArbiter.for_bus) and is shared by every SharedBus handle of that bus until it is
+    removed (BusArbiter.remove/clear).
+    '''
+    _registry: Dict[object, 'BusArbiter'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, bus: I2CBase):
+        self.bus = bus
+        self.stats = ArbiterStats()
+        self._lock = threading.RLock()
+        self._state_lock = threading.Lock()
+        self._waiting = 0
+        self._owner_depth = threading.local()
+
+    @classmethod
+    def for_bus(cls, bus: I2CBase) -> 'BusArbiter':
+        ''' Arbiter shared by all users of bus (keyed by bus path). '''
+        key = cls._key(bus)
+        with cls._registry_lock:
+            arbiter = cls._registry.get(key)
+            if arbiter is None:
+                arbiter = cls._registry[key] = cls(bus)
+            return arbiter
+
+    @classmethod
+    def arbiters(cls) -> Dict[object, 'BusArbiter']:
+        ''' All registered arbiters by bus path. '''
+        with cls._registry_lock:
+            return dict(cls._registry)
+
+    @classmethod
+    def remove(cls, bus: I2CBase) -> Optional['BusArbiter']:
+        ''' Unregister arbiter of bus (existing SharedBus handles keep using it). Returns removed arbiter. '''
+        with cls._registry_lock:
+            return cls._registry.pop(cls._key(bus), None)
+
+    @classmethod
+    def clear(cls):
+        ''' Unregister all arbiters, so the next for_bus() starts w/ fresh locks and stats. '''
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    @staticmethod
+    def _key(bus: I2CBase) -> object:
+        return getattr(bus, 'path', None) or bus
+
+    @contextmanager
+    def acquire(self):
+        ''' Hold bus exclusively (reentrant) and record queueing stats. '''
+        depth = getattr(self._owner_depth, 'value', 0)
+        if depth:
+            self._owner_depth.value = depth + 1
+            try:
+                yield self
+            finally:
+                self._owner_depth.value = depth
+            return
+        start = time.perf_counter()
+        with self._state_lock:
+            self._waiting += 1
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._waiting)
+        contended = not self._lock.acquire(blocking=False)
+        if contended:
+            self._lock.acquire()
+        waited = time.perf_counter() - start
+        with self._state_lock:
+            self._waiting -= 1
+            self.stats.acquisitions += 1
+            self.stats.contentions += int(contended)
+            self.stats.wait_time += waited
+            self.stats.max_wait = max(self.stats.max_wait, waited)
+        self._owner_depth.value = 1
+        try:
+            yield self
+        finally:
+            self._owner_depth.value = 0
+            self._lock.release()
+
+    def reset_stats(self):
+        ''' Clear stats. '''
+        with self._state_lock:
+            self.stats = ArbiterStats()
+
+
+class SharedBus(I2CProxy):
+    '''
+    I2C bus handle safe to share between threads. set_address only records the calling thread's
+    target device; every read/write/read_write then holds the bus lock, selects that address
+    (the underlying bus skips unchanged addresses) and performs the transfer atomically. Use transaction() to keep
+    the bus across several operations.
+
+    Example:
+        bus = SharedBus(i2c3)
+        eeprom = M24C02(bus, 0x50)      # main thread
+        sensor = HDC1080(bus, 0x40)     # monitor thread
+        print(bus.arbiter.stats)
+    '''
+
+    def __init__(self, bus: I2CBase):
+        super().__init__(bus)
+        self.arbiter = BusArbiter.for_bus(bus)
+        self._local = threading.local()
+
+    @property
+    def address(self) -> Optional[int]:
+        ''' Target address of calling thread. '''
+        return getattr(self._local, 'address', None)
+
+    @property
+    def stats(self) -> ArbiterStats:
+        ''' Queueing stats of underlying physical bus. '''
+        return self.arbiter.stats
+
+    @contextmanager
+    def transaction(self, address: Optional[int] = None):
+        ''' Hold bus across several operations (optionally selecting address first). '''
+        with self.arbiter.acquire():
+            if address is not None:
+                self.set_address(address)
+            yield self
+
+    def open(self):
+        with self.arbiter.acquire():
+            self.bus.open()
+
+    def close(self):
+        with self.arbiter.acquire():
+            self.bus.close()
+
+    def set_address(self, address: int):
+        self._local.address = address & 0x7F
+
+    def _select(self):
+        address = self.address
+        if address is not None:
+            self.bus.set_address(address)
+
+    def read(self, length: int = 1) -> bytes:
+        with self.arbiter.acquire():
+            self._select()
+            return self.bus.read(length)
+
+    def write(self, data: bytes):
+        with self.arbiter.acquire():
+            self._select()
+            self.bus.write(data)
+
+    def read_write(self, data: bytes, length: int = 1) -> bytes:
+        with self.arbiter.acquire():
+            self._select()
+            return self.bus.read_write(data, length)
+
+    def transfer(self, address: int, messages: List[I2CMessage]):
+        with self.arbiter.acquire():
+            self.bus.transfer(address, messages)
+
+    def detect(self, first: int = 0x03, last: int = 0x77, data: Optional[bytes] = None, length: int = 1) -> List[int]:
+        with self.arbiter.acquire():
+            return self.bus.detect(first=first, last=last, data=data, length=length)
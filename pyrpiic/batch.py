@@ -0,0 +1,176 @@
+''' Combined-message batching of register reads and writes. '''
+import struct
+from typing import Collection, List, Optional, Tuple
+from pyrpio.i2c.types import I2CBase, I2CMessage
+
+I2C_RDWR_MAX_MESSAGES = 42  # Linux I2C_RDWR_IOCTL_MAX_MSGS
+FORMAT_SIZE = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+class BatchRead:
+    ''' Future-like result of a queued register read, available once the batch is submitted. '''
+
+    def __init__(self, register: int, length: int, data_size: int):
+        self.register = register
+        self.length = length
+        self.data_size = data_size
+        self.data: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+    def done(self) -> bool:
+        ''' Batch was submitted (successfully or not). '''
+        return self.data is not None or self.error is not None
+
+    def result_bytes(self) -> bytes:
+        ''' Raw register bytes. '''
+        if self.error is not None:
+            raise self.error
+        if self.data is None:
+            raise RuntimeError(f'Read of register 0x{self.register:02X} is pending until batch is submitted')
+        return self.data
+
+    def values(self) -> Tuple[int, ...]:
+        ''' Register values (one per register read). '''
+        return struct.unpack(f'>{self.length}{FORMAT_SIZE[self.data_size]}', self.result_bytes())
+
+    def result(self) -> int:
+        ''' Value of first (or only) register read. '''
+        return self.values()[0]
+
+
+class RegisterBatch:
+    '''
+    Queue register reads and writes of one device and submit them as a single combined I2C
+    transfer (one I2C_RDWR ioctl w/ repeated STARTs) instead of one transaction per register.
+    Mirrors the I2CRegisterDevice API; reads return BatchRead futures.
+
+    Reads cannot depend on writes or reads queued in the same batch being visible to Python,
+    so read-modify-write sequences need one batch for the reads and one for the writes.
+    Buses w/o transfer support (NotImplementedError) fall back to individual transactions.
+
+    Example:
+        with RegisterBatch(bus, 0x55) as batch:
+            res_reg = batch.read_register(135)
+            frz_reg = batch.read_register(137)
+        print(res_reg.result(), frz_reg.result())
+    '''
+
+    def __init__(self, bus: I2CBase, address: int, register_size: int = 1, data_size: int = 1):
+        '''
+        Args:
+            bus (I2CBase): I2C bus of the device
+            address (int): I2C address of the device
+            register_size (int, optional): Register address size in bytes. Defaults to 1.
+            data_size (int, optional): Register size in bytes. Defaults to 1.
+        '''
+        self.bus = bus
+        self.address = address
+        self.register_size = register_size
+        self.data_size = data_size
+        self._ops: List[Tuple[bytes, Optional[BatchRead]]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.submit()
+        else:
+            self._ops.clear()
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def _register_bytes(self, register: int) -> bytes:
+        return register.to_bytes(length=self.register_size, byteorder='big')
+
+    def read_register(self, register: int) -> BatchRead:
+        ''' Queue single register read. '''
+        return self.read_register_sequential(register, 1)
+
+    def read_register_sequential(self, register: int, length: int) -> BatchRead:
+        ''' Queue read of length auto-incremented registers starting at register. '''
+        future = BatchRead(register, length, self.data_size)
+        self._ops.append((self._register_bytes(register), future))
+        return future
+
+    def write_register(self, register: int, data: int):
+        ''' Queue single register write. '''
+        self.write_register_sequential(register, [data])
+
+    def write_register_sequential(self, register: int, data: Collection[int]):
+        ''' Queue write of values to auto-incremented registers starting at register. '''
+        self._ops.append((self.pack_write(register, data), None))
+
+    def write_bytes(self, data: bytes):
+        ''' Queue write of pre-packed register address and data bytes (e.g. from pack_write()). '''
+        self._ops.append((bytes(data), None))
+
+    def pack_write(self, register: int, data: Collection[int]) -> bytes:
+        ''' Register address and data bytes of a (sequential) register write. '''
+        return self._register_bytes(register) + struct.pack(f'>{len(data)}{FORMAT_SIZE[self.data_size]}', *data)
+
+    def messages(self) -> List[I2CMessage]:
+        ''' Combined message list of queued operations. '''
+        return self._messages(self._ops)
+
+    @staticmethod
+    def _messages(ops: List[Tuple[bytes, Optional[BatchRead]]]) -> List[I2CMessage]:
+        messages = []
+        for data, future in ops:
+            messages.append(I2CMessage(data=data, read=False, flags=0))
+            if future is not None:
+                messages.append(I2CMessage(data=bytes(future.length * future.data_size), read=True, flags=0))
+        return messages
+
+    @staticmethod
+    def _chunks(ops: List[Tuple[bytes, Optional[BatchRead]]]) -> List[List[Tuple[bytes, Optional[BatchRead]]]]:
+        ''' Split operations so each transfer stays within I2C_RDWR message limit. '''
+        chunks: List[List[Tuple[bytes, Optional[BatchRead]]]] = [[]]
+        count = 0
+        for op in ops:
+            size = 1 if op[1] is None else 2
+            if count + size > I2C_RDWR_MAX_MESSAGES:
+                chunks.append([])
+                count = 0
+            chunks[-1].append(op)
+            count += size
+        return chunks
+
+    def _submit_individually(self, ops: List[Tuple[bytes, Optional[BatchRead]]]):
+        self.bus.set_address(self.address)
+        for data, future in ops:
+            if future is None:
+                self.bus.write(data)
+            else:
+                future.data = bytes(self.bus.read_write(data, future.length * future.data_size))
+
+    def submit(self) -> int:
+        '''
+        Submit queued operations (in chunks of at most 42 messages) and resolve read futures.
+
+        Returns:
+            int: number of bus transactions used
+        '''
+        ops, self._ops = self._ops, []
+        transactions = 0
+        try:
+            for chunk in self._chunks(ops) if ops else []:
+                messages = self._messages(chunk)
+                try:
+                    self.bus.transfer(self.address, messages)
+                except NotImplementedError:
+                    self._submit_individually(chunk)
+                    transactions += len(chunk)
+                    continue
+                transactions += 1
+                reads = (message for message in messages if message.read)
+                for _, future in chunk:
+                    if future is not None:
+                        future.data = bytes(bytearray(next(reads).data))
+        except BaseException as err:
+            for _, future in ops:
+                if future is not None and future.data is None:
+                    future.error = err
+            raise
+        return transactions
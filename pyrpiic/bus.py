@@ -0,0 +1,47 @@
+''' I2C bus wrappers. '''
+from typing import List, Optional
+from pyrpio.i2c.types import I2CBase, I2CMessage
+
+
+class I2CProxy(I2CBase):
+    '''
+    I2C bus that forwards every operation to an underlying bus. Subclass and override the
+    operations to intercept. Attributes not part of I2CBase are forwarded as well so proxies
+    can wrap fake/simulated buses transparently.
+    '''
+
+    def __init__(self, bus: I2CBase):
+        self.bus = bus
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on proxy
+        return getattr(self.__dict__['bus'], name)
+
+    @property
+    def path(self) -> Optional[str]:
+        ''' Path of underlying bus. '''
+        return getattr(self.bus, 'path', None)
+
+    def open(self):
+        self.bus.open()
+
+    def close(self):
+        self.bus.close()
+
+    def set_address(self, address: int):
+        self.bus.set_address(address)
+
+    def read(self, length: int = 1) -> bytes:
+        return self.bus.read(length)
+
+    def write(self, data: bytes):
+        self.bus.write(data)
+
+    def read_write(self, data: bytes, length: int = 1) -> bytes:
+        return self.bus.read_write(data, length)
+
+    def transfer(self, address: int, messages: List[I2CMessage]):
+        self.bus.transfer(address, messages)
+
+    def detect(self, first: int = 0x03, last: int = 0x77, data: Optional[bytes] = None, length: int = 1) -> List[int]:
+        return self.bus.detect(first=first, last=last, data=data, length=length)
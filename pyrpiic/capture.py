@@ -0,0 +1,433 @@
+'''
+Record-and-replay of I2C traffic.
+
+RecordingI2C logs every bus operation of the drivers using it (operation, address, payloads,
+errors and timing) to a compact binary capture file. ReplayI2C serves a capture back w/o
+hardware, either w/ the recorded timing or time scaled/compressed, so production sequences
+(e.g. a full board bring-up) can be benchmarked and profiled reproducibly.
+'''
+import errno
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from pyrpio.i2c.types import I2CBase, I2CError, I2CMessage
+from .bus import I2CProxy
+
+CAPTURE_MAGIC = b'PRCAP'
+CAPTURE_VERSION = 1
+_HEADER = struct.Struct('>5sBH')  # magic, version, bus path length
+_RECORD = struct.Struct('>BBBII')  # op, flags, address, start delta (us), duration (us)
+_FLAG_ERROR = 0x01
+_FLAG_UNSUPPORTED = 0x02
+_FLAG_NO_DATA = 0x04  # detect() w/o probe data
+
+
+class CaptureOp(IntEnum):
+    SET_ADDRESS = 0
+    READ = 1
+    WRITE = 2
+    READ_WRITE = 3
+    TRANSFER = 4
+    DETECT = 5
+
+
+@dataclass
+class CaptureRecord:
+    '''
+    One recorded bus operation.
+
+    Args:
+        op (CaptureOp): Bus operation
+        address (int): Device address (first address for DETECT)
+        written (bytes): Data written (probe data for DETECT)
+        length (int): Requested read length
+        read (bytes): Data read (responding addresses for DETECT)
+        messages (List[Tuple[bool, bytes]]): TRANSFER messages as (read, data) w/ read data after transfer
+        last (int): Last address of DETECT
+        errno (int, optional): errno of failed operation (e.g. NACK)
+        unsupported (bool): Operation raised NotImplementedError
+        start (float): Start time since capture start (s)
+        duration (float): Duration (s)
+    '''
+    op: CaptureOp
+    address: int = 0
+    written: Optional[bytes] = b''
+    length: int = 0
+    read: bytes = b''
+    messages: List[Tuple[bool, bytes]] = field(default_factory=list)
+    last: int = 0
+    errno: Optional[int] = None
+    unsupported: bool = False
+    start: float = 0.0
+    duration: float = 0.0
+
+    def pack(self, previous_start: float) -> bytes:
+        ''' Binary form (start is stored as delta to previous record). '''
+        flags = ((_FLAG_ERROR if self.errno is not None else 0) | (_FLAG_UNSUPPORTED if self.unsupported else 0)
+                 | (_FLAG_NO_DATA if self.written is None else 0))
+        delta = max(0, round((self.start - previous_start) * 1e6))
+        data = bytearray(_RECORD.pack(self.op, flags, self.address, delta, round(self.duration * 1e6)))
+        if self.op == CaptureOp.TRANSFER:
+            data += struct.pack('>H', len(self.messages))
+            for read, payload in self.messages:
+                data += struct.pack('>BH', read, len(payload)) + bytes(payload)
+        elif self.op != CaptureOp.SET_ADDRESS:
+            written = self.written or b''
+            data += struct.pack('>BH', self.last, len(written)) + written
+            data += struct.pack('>HH', self.length, len(self.read)) + self.read
+        if self.errno is not None:
+            data += struct.pack('>i', self.errno)
+        return bytes(data)
+
+    @classmethod
+    def unpack_from(cls, data: bytes, offset: int, previous_start: float) -> Tuple['CaptureRecord', int]:
+        ''' Record at offset and offset of next record. '''
+        op, flags, address, delta, duration = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        record = cls(CaptureOp(op), address, start=previous_start + delta / 1e6, duration=duration / 1e6,
+                     unsupported=bool(flags & _FLAG_UNSUPPORTED))
+        if record.op == CaptureOp.TRANSFER:
+            count, = struct.unpack_from('>H', data, offset)
+            offset += 2
+            for _ in range(count):
+                read, length = struct.unpack_from('>BH', data, offset)
+                offset += 3
+                record.messages.append((bool(read), bytes(data[offset:offset + length])))
+                offset += length
+        elif record.op != CaptureOp.SET_ADDRESS:
+            record.last, length = struct.unpack_from('>BH', data, offset)
+            offset += 3
+            record.written = None if flags & _FLAG_NO_DATA else bytes(data[offset:offset + length])
+            offset += length
+            record.length, length = struct.unpack_from('>HH', data, offset)
+            offset += 4
+            record.read = bytes(data[offset:offset + length])
+            offset += length
+        if flags & _FLAG_ERROR:
+            record.errno, = struct.unpack_from('>i', data, offset)
+            offset += 4
+        return record, offset
+
+    def raise_error(self):
+        ''' Re-raise recorded failure. '''
+        if self.unsupported:
+            raise NotImplementedError()
+        if self.errno is not None:
+            raise I2CError(self.errno, os.strerror(self.errno))
+
+    @property
+    def shape(self) -> List[Tuple[bool, Union[int, bytes]]]:
+        ''' TRANSFER messages as (read, read length or written data). '''
+        return [(read, len(data) if read else data) for read, data in self.messages]
+
+    @property
+    def layout(self) -> List[Tuple[bool, int]]:
+        ''' TRANSFER messages as (read, length). '''
+        return [(read, len(data)) for read, data in self.messages]
+
+    def describe(self) -> str:
+        ''' Short human readable form. '''
+        if self.op == CaptureOp.TRANSFER:
+            parts = ' '.join(('R' if read else 'W') + (str(len(d)) if read else d.hex()) for read, d in self.messages)
+            return f'TRANSFER 0x{self.address:02X} [{parts}]'
+        if self.op == CaptureOp.SET_ADDRESS:
+            return f'SET_ADDRESS 0x{self.address:02X}'
+        return f'{self.op.name} 0x{self.address:02X} written={(self.written or b"").hex()} length={self.length}'
+
+
+class Capture:
+    ''' Recorded operations of one bus. '''
+
+    def __init__(self, path: Optional[str] = None, records: Optional[List[CaptureRecord]] = None):
+        self.path = path
+        self.records: List[CaptureRecord] = records if records is not None else []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return iter(self.records)
+
+    @property
+    def duration(self) -> float:
+        ''' Time from capture start to end of last operation (s). '''
+        return max((r.start + r.duration for r in self.records), default=0.0)
+
+    def summary(self) -> Dict[int, Dict[str, float]]:
+        ''' Transactions, bytes and bus time per device address (SET_ADDRESS not counted). '''
+        devices: Dict[int, Dict[str, float]] = {}
+        for record in self.records:
+            if record.op in (CaptureOp.SET_ADDRESS, CaptureOp.DETECT):
+                continue
+            stats = devices.setdefault(record.address, {
+                'transactions': 0, 'bytes_read': 0, 'bytes_written': 0, 'errors': 0, 'bus_time': 0.0})
+            stats['transactions'] += 1
+            stats['errors'] += record.errno is not None
+            stats['bus_time'] += record.duration
+            if record.op == CaptureOp.TRANSFER:
+                stats['bytes_read'] += sum(len(d) for read, d in record.messages if read)
+                stats['bytes_written'] += sum(len(d) for read, d in record.messages if not read)
+            else:
+                stats['bytes_read'] += len(record.read)
+                stats['bytes_written'] += len(record.written or b'')
+        return devices
+
+    @staticmethod
+    def header(path: Optional[str]) -> bytes:
+        ''' File header of capture of bus path. '''
+        name = (path or '').encode('utf-8')
+        return _HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, len(name)) + name
+
+    def to_bytes(self) -> bytes:
+        ''' Binary capture file contents. '''
+        data = bytearray(self.header(self.path))
+        previous = 0.0
+        for record in self.records:
+            data += record.pack(previous)
+            previous = record.start
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Capture':
+        ''' Inverse of to_bytes(). A truncated last record (e.g. interrupted recording) is dropped. '''
+        magic, version, name_length = _HEADER.unpack_from(data)
+        if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+            raise ValueError('Not an I2C capture (or unsupported version)')
+        offset = _HEADER.size + name_length
+        capture = cls(data[_HEADER.size:offset].decode('utf-8') or None)
+        previous = 0.0
+        while offset < len(data):
+            try:
+                record, offset = CaptureRecord.unpack_from(data, offset, previous)
+            except (struct.error, ValueError):
+                break
+            capture.records.append(record)
+            previous = record.start
+        return capture
+
+    def save(self, path: str):
+        ''' Write capture file. '''
+        with open(path, 'wb') as fp:
+            fp.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Capture':
+        ''' Read capture file. '''
+        with open(path, 'rb') as fp:
+            return cls.from_bytes(fp.read())
+
+
+class RecordingI2C(I2CProxy):
+    '''
+    I2C bus wrapper that records every operation. Records are kept in capture and, if a file
+    is given, streamed to it as they happen (close() or stop() flushes and closes the file).
+
+    Example:
+        bus = RecordingI2C(I2C('/dev/i2c-3'), 'bring-up.i2ccap')
+        bus.open()
+        ...  # drivers use bus as usual
+        bus.close()
+    '''
+
+    def __init__(self, bus: I2CBase, file: Union[str, BinaryIO, None] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        '''
+        Args:
+            bus (I2CBase): Bus to record
+            file (Union[str, BinaryIO], optional): Capture file path or binary file. Defaults to memory only.
+            clock (Callable[[], float], optional): Time source (s). Defaults to time.perf_counter.
+        '''
+        super().__init__(bus)
+        self.capture = Capture(getattr(bus, 'path', None))
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._address = 0
+        self._start = clock()
+        self._previous = 0.0
+        self._owns_file = isinstance(file, (str, os.PathLike))
+        self._file: Optional[BinaryIO] = file
+        if self._owns_file:
+            self._file = open(file, 'wb')  # pylint: disable=consider-using-with
+        if self._file is not None:
+            self._file.write(Capture.header(self.capture.path))
+
+    def _record(self, record: CaptureRecord, started: float, func: Callable[[], object]):
+        try:
+            return func()
+        except NotImplementedError:
+            record.unsupported = True
+            raise
+        except OSError as error:
+            record.errno = error.errno if error.errno is not None else errno.EIO
+            raise
+        finally:
+            record.start = started - self._start
+            record.duration = self.clock() - started
+            with self._lock:
+                self.capture.records.append(record)
+                if self._file is not None:
+                    self._file.write(record.pack(self._previous))
+                self._previous = record.start
+
+    def stop(self):
+        ''' Stop streaming to capture file (records are still collected in memory). '''
+        if self._file is not None:
+            self._file.flush()
+            if self._owns_file:
+                self._file.close()
+            self._file = None
+
+    def close(self):
+        self.stop()
+        self.bus.close()
+
+    def set_address(self, address: int):
+        self._address = address
+        record = CaptureRecord(CaptureOp.SET_ADDRESS, address)
+        self._record(record, self.clock(), lambda: self.bus.set_address(address))
+
+    def read(self, length: int = 1) -> bytes:
+        record = CaptureRecord(CaptureOp.READ, self._address, length=length)
+
+        def read():
+            record.read = bytes(self.bus.read(length))
+            return record.read
+        return self._record(record, self.clock(), read)
+
+    def write(self, data: bytes):
+        record = CaptureRecord(CaptureOp.WRITE, self._address, written=bytes(data))
+        self._record(record, self.clock(), lambda: self.bus.write(data))
+
+    def read_write(self, data: bytes, length: int = 1) -> bytes:
+        record = CaptureRecord(CaptureOp.READ_WRITE, self._address, written=bytes(data), length=length)
+
+        def read_write():
+            record.read = bytes(self.bus.read_write(data, length))
+            return record.read
+        return self._record(record, self.clock(), read_write)
+
+    def transfer(self, address: int, messages: List[I2CMessage]):
+        record = CaptureRecord(CaptureOp.TRANSFER, address)
+
+        def transfer():
+            try:
+                self.bus.transfer(address, messages)
+            finally:
+                record.messages = [(bool(m.read), bytes(m.data)) for m in messages]
+        self._record(record, self.clock(), transfer)
+
+    def detect(self, first: int = 0x03, last: int = 0x77, data: Optional[bytes] = None, length: int = 1) -> List[int]:
+        record = CaptureRecord(CaptureOp.DETECT, first, last=last, length=length,
+                               written=None if data is None else bytes(data))
+
+        def detect():
+            found = self.bus.detect(first=first, last=last, data=data, length=length)
+            record.read = bytes(found)
+            return found
+        return self._record(record, self.clock(), detect)
+
+
+class ReplayError(RuntimeError):
+    ''' Bus operation does not match the next recorded operation. '''
+
+
+class ReplayI2C(I2CBase):
+    '''
+    I2C bus serving a capture: each operation must match the next recorded one (operation,
+    address, written data and read lengths) and returns the recorded response or error.
+
+    With time_scale=1 operations complete no earlier than recorded (relative to the first
+    operation); time_scale=0.1 replays 10x compressed and time_scale=0 w/o waiting. Waits
+    use clock/sleep, so a SimClock (w/ patch_sleep() for driver sleeps) replays in simulated time.
+    '''
+
+    def __init__(self, capture: Union[str, Capture], time_scale: float = 1.0, strict: bool = True,
+                 clock: Callable[[], float] = time.perf_counter, sleep: Callable[[float], None] = time.sleep):
+        '''
+        Args:
+            capture (Union[str, Capture]): Capture or capture file path
+            time_scale (float, optional): Recorded time multiplier (0 disables waits). Defaults to 1.0.
+            strict (bool, optional): Check written data matches recording. Defaults to True.
+            clock (Callable[[], float], optional): Time source (s). Defaults to time.perf_counter.
+            sleep (Callable[[float], None], optional): Wait function. Defaults to time.sleep.
+        '''
+        self.capture = capture if isinstance(capture, Capture) else Capture.load(capture)
+        self.path = self.capture.path
+        self.time_scale = time_scale
+        self.strict = strict
+        self.clock = clock
+        self.sleep = sleep
+        self.position = 0
+        self._address = 0
+        self._start: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        ''' All recorded operations were replayed. '''
+        return self.position >= len(self.capture)
+
+    def rewind(self):
+        ''' Replay again from first operation. '''
+        self.position = 0
+        self._start = None
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def _next(self, op: CaptureOp, address: int, **expected) -> CaptureRecord:
+        with self._lock:
+            if self.done:
+                raise ReplayError(f'{op.name} 0x{address:02X} after end of capture ({len(self.capture)} operations)')
+            record = self.capture.records[self.position]
+            mismatch = record.op != op or record.address != address or any(
+                getattr(record, name) != value for name, value in expected.items())
+            if mismatch:
+                raise ReplayError(f'operation {self.position}: expected {record.describe()}, got {op.name} '
+                                  f'0x{address:02X} {expected}')
+            self.position += 1
+            if self._start is None:
+                self._start = self.clock() - record.start * self.time_scale
+        if self.time_scale > 0:
+            remaining = self._start + (record.start + record.duration) * self.time_scale - self.clock()
+            if remaining > 0:
+                self.sleep(remaining)
+        record.raise_error()
+        return record
+
+    def set_address(self, address: int):
+        self._address = address
+        self._next(CaptureOp.SET_ADDRESS, address)
+
+    def _written(self, data: Optional[bytes]) -> Dict[str, Optional[bytes]]:
+        return {'written': None if data is None else bytes(data)} if self.strict else {}
+
+    def read(self, length: int = 1) -> bytes:
+        return self._next(CaptureOp.READ, self._address, length=length).read
+
+    def write(self, data: bytes):
+        self._next(CaptureOp.WRITE, self._address, **self._written(data))
+
+    def read_write(self, data: bytes, length: int = 1) -> bytes:
+        return self._next(CaptureOp.READ_WRITE, self._address, length=length, **self._written(data)).read
+
+    def transfer(self, address: int, messages: List[I2CMessage]):
+        if self.strict:
+            expected = {'shape': [(bool(m.read), len(m.data) if m.read else bytes(m.data)) for m in messages]}
+        else:
+            expected = {'layout': [(bool(m.read), len(m.data)) for m in messages]}
+        record = self._next(CaptureOp.TRANSFER, address, **expected)
+        for message, (read, data) in zip(messages, record.messages):
+            if read:
+                message.data = data
+
+    def detect(self, first: int = 0x03, last: int = 0x77, data: Optional[bytes] = None, length: int = 1) -> List[int]:
+        record = self._next(CaptureOp.DETECT, first, last=last, length=length, **self._written(data))
+        return list(record.read)
@@ -0,0 +1,488 @@
+'''
+pyrpiic command-line tool.
+
+Usage:
+    pyrpiic [--bus PATH] eeprom dump|program|verify ...
+    pyrpiic [--bus PATH] clock get|set ...
+    pyrpiic [--bus PATH] gpio get|set|watch ...
+    pyrpiic [--bus PATH] sensor stream ...
+    pyrpiic [--bus PATH] scan [--refresh]
+    pyrpiic [--bus PATH] batch [FILE]   # one command per line ('-' or no FILE reads stdin)
+
+Batch mode runs every command in one process and keeps buses open (and drivers cached)
+across commands, e.g.:
+
+    pyrpiic --bus /dev/i2c-3 batch <<EOF
+    clock set 156.25M --nonvolatile
+    eeprom program board.bin --verify
+    gpio set P00=1 P01=0
+    EOF
+'''
+import argparse
+import importlib
+import os
+import shlex
+import sys
+import time
+from typing import Callable, Dict, IO, List, Optional, Sequence, Tuple
+from pyrpio.i2c.types import I2CBase
+from pyrpiic.eeprom.eeprom import EEPROMException
+
+BusFactory = Callable[[str], I2CBase]
+
+DEFAULT_BUS = os.environ.get('PYRPIIC_BUS', '/dev/i2c-1')
+
+# chip -> (driver class path, default address)
+CLOCKS = {
+    'lmk61e2': ('pyrpiic.clock.lmk61e2.LMK61E2', 0x5A),
+    'si570': ('pyrpiic.clock.si570.SI570', 0x55),
+}
+EXPANDERS = {
+    'tca6416a': ('pyrpiic.ioexpander.tca6416a.TCA6416A', 0x20),
+    'pca9555': ('pyrpiic.ioexpander.pca9555.PCA9555', 0x20),
+    'tca9535': ('pyrpiic.ioexpander.tca9535.TCA9535', 0x20),
+    'pca9698': ('pyrpiic.ioexpander.pca9698.PCA9698', 0x20),
+}
+SENSORS = {
+    'hdc1080': ('pyrpiic.sensor.hdc1080.HDC1080', 0x40),
+    'ldc1612': ('pyrpiic.sensor.ldc161x.LDC161X', 0x2A),
+    'ldc1614': ('pyrpiic.sensor.ldc161x.LDC161X', 0x2A),
+    'ldc1412': ('pyrpiic.sensor.ldc141x.LDC141X', 0x2A),
+    'ldc1414': ('pyrpiic.sensor.ldc141x.LDC141X', 0x2A),
+}
+EEPROM_DRIVER = 'pyrpiic.eeprom.eeprom.EEPROM'
+EEPROM_ADDRESS = 0x50
+FREQUENCY_SUFFIXES = {'k': 1e3, 'm': 1e6, 'g': 1e9}
+
+
+class CLIError(Exception):
+    ''' Command failed (reported w/o traceback). '''
+
+
+# Errors reported as failed command instead of traceback
+COMMAND_ERRORS = (CLIError, EEPROMException, OSError, ValueError)
+
+
+def parse_int(value: str) -> int:
+    ''' Integer w/ base prefix (0x.., 0b..). '''
+    return int(value, 0)
+
+
+def parse_frequency(value: str) -> float:
+    ''' Frequency w/ optional k/M/G suffix and Hz unit, e.g. 156.25M or 100MHz. '''
+    text = value.strip()
+    if text.lower().endswith('hz'):
+        text = text[:-2]
+    scale = FREQUENCY_SUFFIXES.get(text[-1:].lower(), 1.0)
+    if scale != 1.0:
+        text = text[:-1]
+    try:
+        return float(text) * scale
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid frequency: {value}') from None
+
+
+def parse_level(value: str) -> bool:
+    ''' GPIO level: 1/0, high/low, on/off, true/false. '''
+    levels = {'1': True, 'high': True, 'on': True, 'true': True, '0': False, 'low': False, 'off': False, 'false': False}
+    try:
+        return levels[value.lower()]
+    except KeyError:
+        raise CLIError(f'invalid level: {value}') from None
+
+
+def load_class(path: str) -> type:
+    ''' Import driver class by dotted path (drivers are only imported when used). '''
+    module, name = path.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)
+
+
+class Session:
+    '''
+    Buses and drivers shared by all commands of one process. Buses stay open until close()
+    and drivers are created once per (driver, bus, address, options) so shadowed registers
+    and cached IDs carry over between batch commands.
+    '''
+
+    def __init__(self, bus_factory: Optional[BusFactory] = None, out: Optional[IO[str]] = None):
+        self.bus_factory = bus_factory
+        self.out = out or sys.stdout
+        self.buses: Dict[str, I2CBase] = {}
+        self.drivers: Dict[Tuple, object] = {}
+
+    def bus(self, path: str) -> I2CBase:
+        ''' Open bus of path (reused). '''
+        bus = self.buses.get(path)
+        if bus is None:
+            factory = self.bus_factory or load_class('pyrpio.i2c.I2C')
+            bus = factory(path)
+            bus.open()
+            self.buses[path] = bus
+        return bus
+
+    def driver(self, driver: str, path: str, address: int, **kwargs):
+        ''' Driver on bus of path (reused). '''
+        key = (driver, path, address, tuple(sorted(kwargs.items())))
+        instance = self.drivers.get(key)
+        if instance is None:
+            instance = self.drivers[key] = load_class(driver)(self.bus(path), address, **kwargs)
+        return instance
+
+    def print(self, *values, **kwargs):
+        ''' Print to session output. '''
+        print(*values, file=self.out, flush=True, **kwargs)
+
+    def close(self):
+        ''' Close all buses. '''
+        self.drivers.clear()
+        for bus in self.buses.values():
+            bus.close()
+        self.buses.clear()
+
+
+def _chip(args, chips: Dict[str, Tuple[str, int]]) -> Tuple[str, int]:
+    driver, address = chips[args.chip]
+    return driver, address if args.address is None else args.address
+
+
+# EEPROM
+
+def _eeprom(session: Session, args):
+    return session.driver(EEPROM_DRIVER, args.bus, args.address, pages=args.pages, pointer_bytes=args.pointer_bytes,
+                          page_bytes=args.page_bytes, write_time_ms=args.write_time_ms)
+
+
+def _read_image(path: str) -> bytes:
+    if path == '-':
+        return sys.stdin.buffer.read()
+    with open(path, 'rb') as fp:
+        return fp.read()
+
+
+def hexdump(data: bytes, offset: int = 0, width: int = 16) -> List[str]:
+    ''' Hex + ASCII dump lines. '''
+    lines = []
+    for start in range(0, len(data), width):
+        chunk = data[start:start + width]
+        text = ''.join(chr(b) if 0x20 <= b < 0x7F else '.' for b in chunk)
+        hex_bytes = ' '.join(f'{b:02X}' for b in chunk)
+        lines.append(f'{offset + start:04X}: {hex_bytes:<{3 * width - 1}}  |{text}|')
+    return lines
+
+
+def cmd_eeprom_dump(session: Session, args):
+    ''' eeprom dump: hex dump memory or save it to file. '''
+    eeprom = _eeprom(session, args)
+    length = args.length if args.length is not None else args.pages * args.page_bytes - args.offset
+    data = eeprom.read_sequential_bytes(args.offset, length)
+    if args.output:
+        with open(args.output, 'wb') as fp:
+            fp.write(data)
+        session.print(f'{len(data)} bytes written to {args.output}')
+    else:
+        for line in hexdump(data, args.offset):
+            session.print(line)
+
+
+def _verify(session: Session, eeprom, offset: int, image: bytes):
+    data = eeprom.read_sequential_bytes(offset, len(image))
+    mismatches = [offset + i for i, (a, b) in enumerate(zip(data, image)) if a != b]
+    if mismatches:
+        raise CLIError(f'verify failed: {len(mismatches)} byte(s) differ, first at 0x{mismatches[0]:04X}')
+    session.print(f'verified {len(image)} bytes at 0x{offset:04X}')
+
+
+def cmd_eeprom_program(session: Session, args):
+    ''' eeprom program: write image (and verify). '''
+    eeprom = _eeprom(session, args)
+    image = _read_image(args.file)
+    eeprom.write_sequential_bytes(args.offset, image)
+    session.print(f'programmed {len(image)} bytes at 0x{args.offset:04X}')
+    if args.verify:
+        _verify(session, eeprom, args.offset, image)
+
+
+def cmd_eeprom_verify(session: Session, args):
+    ''' eeprom verify: compare memory against image. '''
+    _verify(session, _eeprom(session, args), args.offset, _read_image(args.file))
+
+
+# Clocks
+
+def cmd_clock_get(session: Session, args):
+    ''' clock get: print frequency (Hz). '''
+    driver, address = _chip(args, CLOCKS)
+    clock = session.driver(driver, args.bus, address)
+    freq, _ = clock.get_frequency()
+    session.print(f'{freq:.6f}')
+
+
+def cmd_clock_set(session: Session, args):
+    ''' clock set: program frequency (Hz). '''
+    driver, address = _chip(args, CLOCKS)
+    clock = session.driver(driver, args.bus, address)
+    clock.set_frequency(args.frequency, nonvolatile=args.nonvolatile)
+    session.print(f'{args.frequency:.6f}')
+
+
+# GPIO expanders
+
+def _expander(session: Session, args):
+    driver, address = _chip(args, EXPANDERS)
+    return session.driver(driver, args.bus, address)
+
+
+def cmd_gpio_get(session: Session, args):
+    ''' gpio get: print input levels. '''
+    levels = _expander(session, args).get_gpio_inputs(args.pins)
+    session.print(' '.join(f'{pin}={int(levels[pin])}' for pin in args.pins))
+
+
+def cmd_gpio_set(session: Session, args):
+    ''' gpio set: drive pins as outputs. '''
+    outputs = {}
+    for assignment in args.assignments:
+        pin, sep, level = assignment.partition('=')
+        if not sep:
+            raise CLIError(f'expected PIN=LEVEL: {assignment}')
+        outputs[pin] = parse_level(level)
+    expander = _expander(session, args)
+    expander.set_gpio_outputs(outputs)  # latch levels before enabling outputs (no glitch)
+    expander.set_gpio_directions({pin: 'OUT' for pin in outputs})
+
+
+def cmd_gpio_watch(session: Session, args):
+    ''' gpio watch: print input levels whenever they change. '''
+    expander = _expander(session, args)
+    previous = None
+    sample = 0
+    while not args.count or sample < args.count:
+        levels = expander.get_gpio_inputs(args.pins)
+        if levels != previous:
+            session.print(f'{time.time():.6f} ' + ' '.join(f'{pin}={int(levels[pin])}' for pin in args.pins))
+            previous = levels
+        sample += 1
+        if not args.count or sample < args.count:
+            time.sleep(args.interval)
+
+
+# Sensors
+
+def cmd_sensor_stream(session: Session, args):
+    ''' sensor stream: print readings as CSV. '''
+    driver, address = _chip(args, SENSORS)
+    sensor = session.driver(driver, args.bus, address)
+    if args.chip == 'hdc1080':
+        _stream_hdc1080(session, sensor, args)
+    else:
+        _stream_ldc(session, sensor, args)
+
+
+def _stream_hdc1080(session: Session, sensor, args):
+    sensor.configure()
+    session.print('timestamp,temperature,humidity')
+    sample = 0
+    while not args.count or sample < args.count:
+        temperature, humidity = sensor.read_temperature_humidity()
+        session.print(f'{time.time():.6f},{temperature:.3f},{humidity:.3f}')
+        sample += 1
+        if not args.count or sample < args.count:
+            time.sleep(args.interval)
+
+
+def _stream_ldc(session: Session, ldc, args):
+    ldc_stream = importlib.import_module('pyrpiic.sensor.ldc_stream')
+    channels = list(range(args.channels))
+    if args.fsensor:
+        plan = ldc.plan_timing(args.fclk, args.fsensor[0], args.fsensor[1], num_chs=args.channels,
+                               sample_rate=args.sample_rate)
+        ldc.apply_timing_plan(plan)
+    stream = ldc_stream.LDCStream(ldc, channels=channels, fclk=args.fclk, capacity=max(args.count, 1))
+    stream.configure()
+    ldc.sleep_mode = False
+    session.print('timestamp,' + ','.join(f'ch{ch}' for ch in channels) + ',' + ','.join(f'err{ch}' for ch in channels))
+    sample = 0
+    while not args.count or sample < args.count:
+        record = stream.acquire(1, configure=False)[-1]
+        values = ','.join(str(int(v)) for v in record['value'])
+        errors = ','.join(str(int(e)) for e in record['error'])
+        session.print(f'{record["timestamp"]:.6f},{values},{errors}')
+        sample += 1
+    ldc.sleep_mode = True
+
+
+# Discovery
+
+def cmd_scan(session: Session, args):
+    ''' scan: identify devices (see pyrpiic.discovery). '''
+    discovery = importlib.import_module('pyrpiic.discovery')
+    factory = session.bus_factory or load_class('pyrpio.i2c.I2C')
+    paths = [args.bus] if args.bus_given else None
+    inventory = discovery.discover(paths, bus_factory=factory, refresh=args.refresh)
+    for device in inventory.devices:
+        session.print(f'{device.bus} 0x{device.address:02X} {device.name}')
+    for path, error in inventory.errors.items():
+        session.print(f'{path} error: {error}')
+
+
+# Batch
+
+def cmd_batch(session: Session, args):
+    ''' batch: run script file or stdin in this session. '''
+    if args.file == '-':
+        run_script(session, sys.stdin, args.bus, keep_going=args.keep_going)
+    else:
+        with open(args.file, 'r', encoding='utf-8') as fp:
+            run_script(session, fp, args.bus, keep_going=args.keep_going)
+
+
+def run_script(session: Session, lines, bus: str = DEFAULT_BUS, keep_going: bool = False) -> int:
+    '''
+    Run one command per line (blank lines and # comments ignored) in session.
+
+    Returns:
+        int: number of failed commands (raises on first failure unless keep_going)
+    '''
+    parser = build_parser()
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        try:
+            argv = shlex.split(line, comments=True)
+            if not argv:
+                continue
+            try:
+                # Pre-populated namespace makes the batch bus the default of each line
+                args = parser.parse_args(argv, namespace=argparse.Namespace(bus=bus, bus_given=False))
+            except SystemExit as err:  # -h/--help exits even though _Parser raises on errors
+                raise CLIError('help cannot be used in batch') from err
+            if args.func is cmd_batch:
+                raise CLIError('batch cannot be nested')
+            args.func(session, args)
+        except COMMAND_ERRORS + (argparse.ArgumentError,) as err:
+            failures += 1
+            if not keep_going:
+                raise CLIError(f'line {number}: {line.strip()}: {err}') from err
+            print(f'line {number}: {err}', file=sys.stderr)
+    if failures:
+        raise CLIError(f'{failures} command(s) failed')
+    return failures
+
+
+class _BusAction(argparse.Action):
+    ''' Store bus path and record that it was given explicitly. '''
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, values)
+        namespace.bus_given = True
+
+
+class _Parser(argparse.ArgumentParser):
+    ''' Raise instead of exiting so batch scripts can report the failing line. '''
+
+    def error(self, message):
+        raise argparse.ArgumentError(None, message)
+
+
+def build_parser() -> argparse.ArgumentParser:  # pylint: disable=too-many-statements
+    ''' Argument parser of all commands. '''
+    parser = _Parser(prog='pyrpiic', description='Interface w/ board ICs over I2C')
+    parser.add_argument('--bus', default=DEFAULT_BUS, action=_BusAction,
+                        help=f'I2C bus device (default: $PYRPIIC_BUS or {DEFAULT_BUS})')
+    parser.set_defaults(bus_given=False)
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', parser_class=_Parser)
+    commands.required = True
+
+    eeprom = commands.add_parser('eeprom', help='dump, program or verify EEPROM')
+    eeprom.add_argument('--address', type=parse_int, default=EEPROM_ADDRESS, help='I2C address (default: 0x50)')
+    eeprom.add_argument('--pages', type=int, default=16, help='page count (default: 16)')
+    eeprom.add_argument('--page-bytes', type=int, default=16, help='bytes per page (default: 16)')
+    eeprom.add_argument('--pointer-bytes', type=int, default=1, help='memory address bytes (default: 1)')
+    eeprom.add_argument('--write-time-ms', type=int, default=5, help='page write time (default: 5)')
+    eeprom_commands = eeprom.add_subparsers(dest='action', metavar='ACTION', parser_class=_Parser)
+    eeprom_commands.required = True
+    dump = eeprom_commands.add_parser('dump', help='hex dump (or save) memory')
+    dump.add_argument('--offset', type=parse_int, default=0)
+    dump.add_argument('--length', type=parse_int)
+    dump.add_argument('--output', '-o', help='write raw bytes to file instead of hex dump')
+    dump.set_defaults(func=cmd_eeprom_dump)
+    for name, func, text in (('program', cmd_eeprom_program, 'write image file'),
+                             ('verify', cmd_eeprom_verify, 'compare memory against image file')):
+        action = eeprom_commands.add_parser(name, help=text)
+        action.add_argument('file', help="image file ('-' for stdin)")
+        action.add_argument('--offset', type=parse_int, default=0)
+        if name == 'program':
+            action.add_argument('--verify', action='store_true', help='read back and compare')
+        action.set_defaults(func=func)
+
+    clock = commands.add_parser('clock', help='get or set programmable oscillator frequency')
+    clock.add_argument('--chip', choices=sorted(CLOCKS), default='lmk61e2')
+    clock.add_argument('--address', type=parse_int)
+    clock_commands = clock.add_subparsers(dest='action', metavar='ACTION', parser_class=_Parser)
+    clock_commands.required = True
+    clock_commands.add_parser('get', help='print frequency (Hz)').set_defaults(func=cmd_clock_get)
+    clock_set = clock_commands.add_parser('set', help='set frequency, e.g. 156.25M')
+    clock_set.add_argument('frequency', type=parse_frequency)
+    clock_set.add_argument('--nonvolatile', action='store_true', help='also store in NVM')
+    clock_set.set_defaults(func=cmd_clock_set)
+
+    gpio = commands.add_parser('gpio', help='get, set or watch expander pins')
+    gpio.add_argument('--chip', choices=sorted(EXPANDERS), default='tca6416a')
+    gpio.add_argument('--address', type=parse_int)
+    gpio_commands = gpio.add_subparsers(dest='action', metavar='ACTION', parser_class=_Parser)
+    gpio_commands.required = True
+    gpio_get = gpio_commands.add_parser('get', help='print input levels')
+    gpio_get.add_argument('pins', nargs='+')
+    gpio_get.set_defaults(func=cmd_gpio_get)
+    gpio_set = gpio_commands.add_parser('set', help='drive pins as outputs, e.g. P00=1 P01=0')
+    gpio_set.add_argument('assignments', nargs='+', metavar='PIN=LEVEL')
+    gpio_set.set_defaults(func=cmd_gpio_set)
+    gpio_watch = gpio_commands.add_parser('watch', help='print input levels whenever they change')
+    gpio_watch.add_argument('pins', nargs='+')
+    gpio_watch.add_argument('--interval', type=float, default=0.05, help='poll interval (s) (default: 0.05)')
+    gpio_watch.add_argument('--count', type=int, default=0, help='stop after COUNT polls (default: run forever)')
+    gpio_watch.set_defaults(func=cmd_gpio_watch)
+
+    sensor = commands.add_parser('sensor', help='stream sensor readings as CSV')
+    sensor.add_argument('--chip', choices=sorted(SENSORS), default='hdc1080')
+    sensor.add_argument('--address', type=parse_int)
+    sensor_commands = sensor.add_subparsers(dest='action', metavar='ACTION', parser_class=_Parser)
+    sensor_commands.required = True
+    stream = sensor_commands.add_parser('stream', help='print readings')
+    stream.add_argument('--count', type=int, default=0, help='stop after COUNT readings (default: run forever)')
+    stream.add_argument('--interval', type=float, default=1.0, help='HDC1080 time between readings (s) (default: 1)')
+    stream.add_argument('--channels', type=int, default=1, help='LDC channels 0..N-1 (default: 1)')
+    stream.add_argument('--fclk', type=parse_frequency, default=40e6, help='LDC reference clock (default: 40M)')
+    stream.add_argument('--fsensor', type=parse_frequency, nargs=2, metavar=('MIN', 'MAX'),
+                        help='LDC sensor frequency range used to plan conversion timing')
+    stream.add_argument('--sample-rate', type=float, default=100.0,
+                        help='LDC planned data rate w/ --fsensor (Hz) (default: 100)')
+    stream.set_defaults(func=cmd_sensor_stream)
+
+    scan = commands.add_parser('scan', help='identify devices on --bus (or all buses)')
+    scan.add_argument('--refresh', action='store_true', help='probe even if inventory is cached')
+    scan.set_defaults(func=cmd_scan)
+
+    batch = commands.add_parser('batch', help='run commands from FILE or stdin in one session')
+    batch.add_argument('file', nargs='?', default='-')
+    batch.add_argument('--keep-going', action='store_true', help='continue after failed commands')
+    batch.set_defaults(func=cmd_batch)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, bus_factory: Optional[BusFactory] = None) -> int:
+    ''' Console entry point. Returns exit code. '''
+    session = Session(bus_factory=bus_factory)
+    try:
+        args = build_parser().parse_args(argv)
+        args.func(session, args)
+    except argparse.ArgumentError as err:
+        print(f'pyrpiic: {err}', file=sys.stderr)
+        return 2
+    except COMMAND_ERRORS as err:
+        print(f'pyrpiic: {err}', file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        session.close()
+    return 0
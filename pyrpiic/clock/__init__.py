@@ -1,4 +1,10 @@
-from . import lmk61e2
-from . import si570
+from typing import TYPE_CHECKING
+from pyrpiic.lazy import lazy_attributes
 
 __all__ = ['lmk61e2', 'si570']
+
+# Submodules are imported on first access (bitarray and pyrpio only load w/ a driver)
+__getattr__, __dir__ = lazy_attributes(__name__, {'lmk61e2': '.lmk61e2', 'si570': '.si570'})
+
+if TYPE_CHECKING:
+    from . import lmk61e2, si570
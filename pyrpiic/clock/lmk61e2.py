@@ -1,37 +1,40 @@
 # %%
 import math
-import time
+from typing import Dict, List, Tuple
 from bitarray import bitarray
 from pyrpio.i2c import I2C
 from pyrpio.i2c_register_device import I2CRegisterDevice
+from pyrpiic.batch import RegisterBatch
+from pyrpiic.profiles import RegisterWrite, check_settings, merge_writes
+from pyrpiic.snapshot import RegisterSnapshot, read_blocks, restore_snapshot, take_snapshot
+from pyrpiic.steps import Steps, run_steps
 from .defs import LMK61E2ClockMode, LMK61E2Registers
 from .utils import float2frac
 
 
 class LMK61E2:
+    # Output control and PLL registers R21-R35 (one sequential block)
+    SNAPSHOT_BLOCKS = ((21, 15),)
+    RESTORE_BLOCKS = ((22, 14), (21, 1))  # write order: PLL registers, then output format
 
     def __init__(self, bus: I2C, address: int):
+        self.bus = bus
         self.address = address
         self.i2c_reg = I2CRegisterDevice(bus, address, register_size=1, data_size=1)
 
     def get_registers(self) -> LMK61E2Registers:
         ''' Read registers from device. '''
-        # Read registers
-        data_in = bytearray()
-        for i in range(11):
-            data_in.append(self.i2c_reg.read_register(22 + i))
+        # Read R21-R35 w/ one sequential read
+        values = read_blocks(self.bus, self.address, self.SNAPSHOT_BLOCKS)
+        data_in = bytearray(values[22 + i] for i in range(11))
         # REGISTER 33
-        mash_ctrl_byte = self.i2c_reg.read_register(33)
-        mash_ctrl_bits = bitarray(format(mash_ctrl_byte, '08b'))
+        mash_ctrl_bits = bitarray(format(values[33], '08b'))
         # REGISTER 34
-        pll_ctrl0_byte = self.i2c_reg.read_register(34)
-        pll_ctrl0_bits = bitarray(format(pll_ctrl0_byte, '08b'))
+        pll_ctrl0_bits = bitarray(format(values[34], '08b'))
         # REGISTER 35
-        pll_ctrl1_byte = self.i2c_reg.read_register(35)
-        pll_ctrl1_bits = bitarray(format(pll_ctrl1_byte, '08b'))
+        pll_ctrl1_bits = bitarray(format(values[35], '08b'))
         # REGISTER 21
-        diffctrl_byte = self.i2c_reg.read_register(21)
-        diffctrl_bits = bitarray(format(diffctrl_byte, '08b'))
+        diffctrl_bits = bitarray(format(values[21], '08b'))
         # Extract values from data
         regs = LMK61E2Registers()
         regs.pll_d = int(pll_ctrl0_bits[2])
@@ -48,6 +51,21 @@ class LMK61E2:
         regs.frac_den = int(raw_bits[66:88].to01(), 2)
         return regs
 
+    def snapshot(self) -> RegisterSnapshot:
+        ''' Read output control and PLL registers w/ one sequential read. '''
+        return take_snapshot(self, self.SNAPSHOT_BLOCKS)
+
+    def restore(self, snapshot: RegisterSnapshot) -> Dict[int, int]:
+        '''
+        Write back registers of snapshot that differ from the device (volatile registers only, see
+        set_registers(nonvolatile=True) to also program EEPROM). Like set_registers(), R22-R35 are
+        written before the output format (R21).
+
+        Returns:
+            Dict[int, int]: registers written
+        '''
+        return restore_snapshot(self, snapshot, self.SNAPSHOT_BLOCKS, write_blocks=self.RESTORE_BLOCKS)
+
     def regs2freq(self, regs: LMK61E2Registers) -> float:
         ''' Compute frequency (Hz) from registers. '''
         # Compute target frequency
@@ -102,8 +120,8 @@ class LMK61E2:
             regs.c3 = 1  # 3rd order filter enabled
         return regs
 
-    def set_registers(self, regs: LMK61E2Registers, nonvolatile=False):
-        ''' Writes registers to clock IC '''
+    def encode_registers(self, regs: LMK61E2Registers) -> Dict[int, int]:
+        ''' Register values (R21-R35) of registers dataclass. '''
         # Binarize data
         reg_data = bitarray(
             format(regs.out_div, '016b') +  # (7-bit 0 w/  9-bit OUTDIV)
@@ -115,18 +133,43 @@ class LMK61E2:
         # Turn this into a byte array of bytes to send
         regs_pll_data = [int(reg_data[i:i+8].to01(), 2) for i in range(0, len(reg_data), 8)]
 
-        # Write to main block of registers
-        self.i2c_reg.write_register_sequential(22, regs_pll_data)
-        # Write mash engine data
         mash_ctrl_bits = bitarray(format(regs.dmc, '06b') + format(regs.meo, '02b'))
-        self.i2c_reg.write_register_sequential(33, [int(mash_ctrl_bits[0:8].to01(), 2)])
-        # Write pll_d and cp register data
         pll_ctrl0_bits = bitarray(format(regs.pll_d, '03b') + format(regs.cp, '05b'))
-        self.i2c_reg.write_register_sequential(34, [int(pll_ctrl0_bits[0:8].to01(), 2)])
         pll_ctrl1_bits = bitarray(format(regs.ps, '04b') + '0' + format(regs.c3, '01b') + '11')
-        self.i2c_reg.write_register_sequential(35, [int(pll_ctrl1_bits[0:8].to01(), 2)])
         diffctrl_bits = bitarray(format(regs.odf, '08b'))
-        self.i2c_reg.write_register_sequential(21, [int(diffctrl_bits[0:8].to01(), 2)])
+        values = {21: int(diffctrl_bits[0:8].to01(), 2)}
+        values.update({22 + i: v for i, v in enumerate(regs_pll_data)})
+        values[33] = int(mash_ctrl_bits[0:8].to01(), 2)
+        values[34] = int(pll_ctrl0_bits[0:8].to01(), 2)
+        values[35] = int(pll_ctrl1_bits[0:8].to01(), 2)
+        return values
+
+    @classmethod
+    def compile_profile(cls, settings: Dict[str, object]) -> Tuple[int, List[RegisterWrite]]:
+        '''
+        Register writes of profile settings (see pyrpiic.profiles): frequency (Hz) and optional
+        odf (output format name, e.g. LVDS). Volatile registers only.
+        '''
+        check_settings(settings, ('frequency', 'odf'))
+        clock = cls(None, 0x00)
+        regs = clock.freq2regs(float(settings['frequency']))
+        if 'odf' in settings:
+            regs.odf = LMK61E2ClockMode[str(settings['odf']).upper()].value
+        values = clock.encode_registers(regs)
+        # Same order as set_registers(): R22-R35, then output format (R21)
+        return 1, merge_writes({r: v for r, v in values.items() if r != 21}) + [(21, [values[21]])]
+
+    def set_registers(self, regs: LMK61E2Registers, nonvolatile=False):
+        ''' Writes registers to clock IC '''
+        run_steps(self.set_registers_steps(regs, nonvolatile=nonvolatile))
+
+    def set_registers_steps(self, regs: LMK61E2Registers, nonvolatile=False) -> Steps[None]:
+        ''' set_registers() as steps (see pyrpiic.steps) '''
+        values = self.encode_registers(regs)
+        with RegisterBatch(self.bus, self.address) as batch:
+            # Write PLL dividers, mash engine, pll_d/cp and PS/C3 (R22-R35), then output format (R21)
+            batch.write_register_sequential(22, [values[r] for r in range(22, 36)])
+            batch.write_register(21, values[21])
 
         # Save register data to EEPROM (via SRAM)
         if nonvolatile:
@@ -137,12 +180,12 @@ class LMK61E2:
                 nvmctrlByte = self.i2c_reg.read_register(49)
                 nvmctrlBits = bitarray(format(nvmctrlByte, '08b'))
                 done = int(nvmctrlBits[1]) == 0
-                time.sleep(0.1)
+                yield 0.1
             # Enable EEPROM write
             self.i2c_reg.write_register_sequential(56, [0xBE])
             # Perform EEPROM write
             self.i2c_reg.write_register_sequential(49, [0x11])
-            time.sleep(0.1)
+            yield 0.1
             done = False
             while not done:
                 nvmctrlByte = self.i2c_reg.read_register(49)
@@ -154,8 +197,13 @@ class LMK61E2:
     def set_frequency(self, freq_hz: float, odf: LMK61E2ClockMode = LMK61E2ClockMode.LVDS,
                       nonvolatile: bool = False, **kwargs):
         ''' Set clock IC to target frequency '''
+        run_steps(self.set_frequency_steps(freq_hz, odf=odf, nonvolatile=nonvolatile))
+
+    def set_frequency_steps(self, freq_hz: float, odf: LMK61E2ClockMode = LMK61E2ClockMode.LVDS,
+                            nonvolatile: bool = False, **kwargs) -> Steps[None]:
+        ''' set_frequency() as steps (see pyrpiic.steps) '''
         regs = self.freq2regs(freq_hz, odf=odf)
-        self.set_registers(regs, nonvolatile=nonvolatile)
+        yield from self.set_registers_steps(regs, nonvolatile=nonvolatile)
 
     def get_frequency(self):
         ''' Get frequency from clock IC '''
@@ -1,14 +1,22 @@
 import math
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from bitarray import bitarray
 from pyrpio.i2c import I2C
 from pyrpio.i2c_register_device import I2CRegisterDevice
+from pyrpiic.batch import RegisterBatch
+from pyrpiic.profiles import RegisterWrite, check_settings, merge_writes
+from pyrpiic.snapshot import RegisterSnapshot, changed_runs, check_snapshot, queue_runs, read_blocks, take_snapshot
 from .defs import SI570Registers
 
 
 class SI570:
+    # Frequency registers HS_DIV/N1/RFREQ (7 ppm / 20 ppm devices)
+    SNAPSHOT_BLOCKS = ((7, 6),)
+    # Control bits written by profiles: Freeze DCO (137) and NewFreq (135)
+    PROFILE_MASKS = {137: 0x10, 135: 0x40}
 
     def __init__(self, bus: I2C, address: int):
+        self.bus = bus
         self.address = address
         self.i2c_reg = I2CRegisterDevice(bus, address, register_size=1, data_size=1)
 
@@ -17,11 +25,10 @@ class SI570:
         regs = SI570Registers()
         if reg_addr is not None:
             regs.reg_addr = reg_addr
-        # Read raw bytes from registers
-        data_in = bytearray()
-        for i in range(6):
-            chunk = self.i2c_reg.read_register(reg_addr + i)
-            data_in.append(chunk)
+        # Read raw bytes from registers (one combined transfer)
+        with RegisterBatch(self.bus, self.address) as batch:
+            reads = [batch.read_register(reg_addr + i) for i in range(6)]
+        data_in = bytearray(read.result() for read in reads)
         # Extract values from data
         raw_bits = bitarray(''.join([format(b, '08b') for b in data_in]))
         # First 3 bits hs, Next 7 bits N1, Following 38 bits Frequency
@@ -31,6 +38,29 @@ class SI570:
         regs.f_req = float(fxp_f_req)/(2.**28)
         return regs
 
+    def snapshot(self) -> RegisterSnapshot:
+        ''' Read frequency registers w/ one sequential read. '''
+        return take_snapshot(self, self.SNAPSHOT_BLOCKS)
+
+    def restore(self, snapshot: RegisterSnapshot) -> Dict[int, int]:
+        '''
+        Write back frequency registers of snapshot that differ from the device. Changed registers
+        are written w/ the DCO frozen and applied via NewFreq, all in one combined transfer.
+
+        Returns:
+            Dict[int, int]: registers written
+        '''
+        check_snapshot(self, snapshot, self.SNAPSHOT_BLOCKS)
+        current = read_blocks(self.bus, self.address, self.SNAPSHOT_BLOCKS + ((135, 1), (137, 1)))
+        runs = changed_runs(self.SNAPSHOT_BLOCKS, current, snapshot.registers)
+        if runs:
+            with RegisterBatch(self.bus, self.address) as batch:
+                batch.write_register(137, current[137] | 0x10)  # Freeze DCO
+                queue_runs(batch, runs)
+                batch.write_register(137, current[137] & 0xEF)  # Unfreeze DCO
+                batch.write_register(135, current[135] | 0x40)  # NewFreq
+        return {start + i: v for start, values in runs for i, v in enumerate(values)}
+
     def freq2reg(self, freq_hz: float) -> SI570Registers:
         ''' Convert frequency to register dataclass '''
         regs = SI570Registers()
@@ -73,8 +103,8 @@ class SI570:
         # freq_hz /= 1E6
         return freq_hz
 
-    def set_registers(self, regs: SI570Registers, nonvolatile=False):
-        ''' Writes registers to clock IC '''
+    def encode_registers(self, regs: SI570Registers) -> Dict[int, int]:
+        ''' Register values (HS_DIV, N1, RFREQ) of registers dataclass. '''
         # Binarize data
         #  First 3 bits hs, Next 7 bits N1,
         #  Following 38 bits Frequency (freq is in 10.28 fixed-point format)
@@ -82,18 +112,42 @@ class SI570:
         fxp_freq = int(regs.f_req*2.0**28)
         reg_data = bitarray(format(regs.hs_div-4, '03b') + format(regs.n1-1, '07b') + format(fxp_freq, '038b'))
         regs_data = [int(reg_data[i:i+8].to01(), 2) for i in range(0, len(reg_data), 8)]
+        return {regs.reg_addr + i: v for i, v in enumerate(regs_data)}
+
+    @classmethod
+    def compile_profile(cls, settings: Dict[str, object]) -> Tuple[int, List[RegisterWrite]]:
+        '''
+        Register writes of profile settings (see pyrpiic.profiles): frequency (Hz) and optional
+        reg_addr (first frequency register, defaults to 7). Frequency registers are written
+        w/ the DCO frozen and applied via NewFreq. Only Freeze DCO and NewFreq are owned by the
+        profile (PROFILE_MASKS), other control bits are read-modify-written at apply time.
+        '''
+        check_settings(settings, ('frequency', 'reg_addr'))
+        clock = cls(None, 0x00)
+        regs = clock.freq2reg(float(settings['frequency']))
+        regs.reg_addr = int(settings.get('reg_addr', regs.reg_addr))
+        return 1, [(137, [0x10]), *merge_writes(clock.encode_registers(regs)), (137, [0x00]), (135, [0x40])]
+
+    def set_registers(self, regs: SI570Registers, nonvolatile=False):
+        ''' Writes registers to clock IC '''
+        values = self.encode_registers(regs)
         # Read current registers
-        res_reg = self.i2c_reg.read_register(135)
-        frz_reg = self.i2c_reg.read_register(137)
-        # Freeze DCO
-        self.i2c_reg.write_register(137, frz_reg ^ 0x10)
-        # Write to all registers (No need to chunk since less than 8)
-        for i, v in enumerate(regs_data):
-            self.i2c_reg.write_register(regs.reg_addr+i, v)
-        # Unfreeze DCO
-        self.i2c_reg.write_register(137, frz_reg & 0xEF)
-        # Set NewFreq - New Frequency bit
-        self.i2c_reg.write_register(135, res_reg ^ 0x40)
+        with RegisterBatch(self.bus, self.address) as batch:
+            res_read = batch.read_register(135)
+            frz_read = batch.read_register(137)
+        res_reg = res_read.result()
+        frz_reg = frz_read.result()
+        # Freeze, write, unfreeze and apply as one combined transfer
+        with RegisterBatch(self.bus, self.address) as batch:
+            # Freeze DCO
+            batch.write_register(137, frz_reg ^ 0x10)
+            # Write to all registers (No need to chunk since less than 8)
+            for register, v in values.items():
+                batch.write_register(register, v)
+            # Unfreeze DCO
+            batch.write_register(137, frz_reg & 0xEF)
+            # Set NewFreq - New Frequency bit
+            batch.write_register(135, res_reg ^ 0x40)
 
     def set_frequency(self, freq_hz: float, reg_addr: int = 0x07, nonvolatile=False):
         ''' Set clock IC to target frequency '''
@@ -0,0 +1,264 @@
+''' Parallel I2C bus scanning and identification of supported devices w/ cached inventory. '''
+import glob
+import hashlib
+import importlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from pyrpio.i2c import I2C
+from pyrpio.i2c.types import I2CBase
+
+BusFactory = Callable[[str], I2CBase]
+Probe = Callable[[I2CBase, int], Optional[Dict[str, int]]]
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'pyrpiic', 'inventory.json'
+)
+SI570_FXTAL = 114.285e6
+SI570_FDCO_RANGE = (4.85e9 * 0.99, 5.67e9 * 1.01)  # DCO range w/ crystal tolerance margin
+
+
+@dataclass(frozen=True)
+class DeviceSignature:
+    ''' How to recognize a supported device: candidate addresses and non-destructive probe. '''
+    name: str
+    driver: str
+    addresses: Sequence[int]
+    probe: Probe
+    candidates: Sequence[str] = ()
+
+
+@dataclass
+class DiscoveredDevice:
+    ''' Device found on a bus (name 'unknown' if it ACKed but matched no signature). '''
+    bus: str
+    address: int
+    name: str = 'unknown'
+    driver: Optional[str] = None
+    candidates: List[str] = field(default_factory=list)
+    signature: Dict[str, int] = field(default_factory=dict)
+
+    def driver_class(self) -> type:
+        ''' Driver class of device. '''
+        if self.driver is None:
+            raise LookupError(f'No driver for unidentified device 0x{self.address:02X} on {self.bus}')
+        module, name = self.driver.rsplit('.', 1)
+        return getattr(importlib.import_module(module), name)
+
+    def create(self, bus: I2CBase, **kwargs):
+        ''' Instantiate driver of device on (open) bus. '''
+        return self.driver_class()(bus, self.address, **kwargs)
+
+
+@dataclass
+class Inventory:
+    ''' Devices of all scanned buses. '''
+    topology: str
+    buses: List[str]
+    devices: List[DiscoveredDevice] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    cached: bool = False
+
+    def find(self, name: str, bus: Optional[str] = None) -> List[DiscoveredDevice]:
+        ''' Devices by name (or driver candidate), optionally on given bus. '''
+        return [
+            device for device in self.devices
+            if (device.name == name or name in device.candidates) and bus in (None, device.bus)
+        ]
+
+    def to_dict(self) -> dict:
+        ''' Export as JSON-serializable dict. '''
+        return {'topology': self.topology, 'buses': self.buses, 'devices': [asdict(d) for d in self.devices]}
+
+    @classmethod
+    def from_dict(cls, data: dict, cached: bool = False) -> 'Inventory':
+        ''' Import from dict of to_dict(). '''
+        devices = [DiscoveredDevice(**device) for device in data['devices']]
+        return cls(topology=data['topology'], buses=list(data['buses']), devices=devices, cached=cached)
+
+
+def _read(bus: I2CBase, register: int, length: int) -> Optional[bytes]:
+    try:
+        return bytes(bus.read_write(bytes([register]), length))
+    except OSError:
+        return None
+
+
+def _probe_ti_ids(manufacturer_register: int, device_ids: Iterable[int]) -> Probe:
+    ''' Probe 16-bit manufacturer (TI = 0x5449) and device ID registers. '''
+    def probe(bus: I2CBase, address: int) -> Optional[Dict[str, int]]:
+        bus.set_address(address)
+        manufacturer = _read(bus, manufacturer_register, 2)
+        device = _read(bus, manufacturer_register + 1, 2)
+        if manufacturer is None or device is None:
+            return None
+        ids = {'manufacturer_id': int.from_bytes(manufacturer, 'big'), 'device_id': int.from_bytes(device, 'big')}
+        if ids['manufacturer_id'] != 0x5449 or ids['device_id'] not in device_ids:
+            return None
+        return ids
+    return probe
+
+
+def probe_lmk61e2(bus: I2CBase, address: int) -> Optional[Dict[str, int]]:
+    ''' R0-R1 vendor ID (TI = 0x100B) and R2 product ID (0x33). '''
+    bus.set_address(address)
+    data = _read(bus, 0, 3)
+    if data is None or data[:2] != b'\x10\x0B' or data[2] != 0x33:
+        return None
+    return {'vendor_id': 0x100B, 'product_id': data[2]}
+
+
+def probe_si570(bus: I2CBase, address: int) -> Optional[Dict[str, int]]:
+    ''' Registers 7-12 hold a valid HS_DIV/N1 and an RFREQ w/ DCO in range. '''
+    bus.set_address(address)
+    data = _read(bus, 7, 6)
+    if data is None:
+        return None
+    value = int.from_bytes(data, 'big')
+    hs_div_code, n1 = value >> 45, ((value >> 38) & 0x7F) + 1
+    fdco = SI570_FXTAL * (value & ((1 << 38) - 1)) / 2 ** 28
+    if hs_div_code in (4, 6) or (n1 != 1 and n1 % 2) or not SI570_FDCO_RANGE[0] <= fdco <= SI570_FDCO_RANGE[1]:
+        return None
+    return {'hs_div': hs_div_code + 4, 'n1': n1}
+
+
+def probe_pca9698(bus: I2CBase, address: int) -> Optional[Dict[str, int]]:
+    ''' MODE register (0x2A) w/ reserved bits clear and OCH set (power-on 0x02). '''
+    bus.set_address(address)
+    data = _read(bus, 0x2A, 1)
+    if data is None or data[0] & 0xE4 or not data[0] & 0x02:
+        return None
+    return {'mode': data[0]}
+
+
+def probe_expander16(bus: I2CBase, address: int) -> Optional[Dict[str, int]]:
+    ''' Command pointer toggles within configuration register pair 6/7. '''
+    bus.set_address(address)
+    data = _read(bus, 0x06, 3)
+    if data is None or data[2] != data[0]:
+        return None
+    return {'config': int.from_bytes(data[:2], 'little')}
+
+
+# Probed in order; first match wins. 16-bit expanders share one register map so the
+# probe cannot tell TCA6416A, PCA9555 and TCA9535 apart (listed as candidates).
+SIGNATURES: List[DeviceSignature] = [
+    DeviceSignature('HDC1080', 'pyrpiic.sensor.hdc1080.HDC1080', (0x40,), _probe_ti_ids(0xFE, (0x1050,))),
+    DeviceSignature('LDC161X', 'pyrpiic.sensor.ldc161x.LDC161X', (0x2A, 0x2B), _probe_ti_ids(0x7E, (0x3055,))),
+    DeviceSignature('LDC141X', 'pyrpiic.sensor.ldc141x.LDC141X', (0x2A, 0x2B), _probe_ti_ids(0x7E, (0x3054,))),
+    DeviceSignature('LMK61E2', 'pyrpiic.clock.lmk61e2.LMK61E2', range(0x58, 0x5C), probe_lmk61e2),
+    DeviceSignature('SI570', 'pyrpiic.clock.si570.SI570', (0x55,), probe_si570),
+    DeviceSignature('PCA9698', 'pyrpiic.ioexpander.pca9698.PCA9698', range(0x20, 0x28), probe_pca9698),
+    DeviceSignature('TCA6416A', 'pyrpiic.ioexpander.tca6416a.TCA6416A', range(0x20, 0x28), probe_expander16,
+                    candidates=('TCA6416A', 'PCA9555', 'TCA9535')),
+]
+
+
+def identify(bus: I2CBase, address: int, path: str = '', signatures: Optional[List[DeviceSignature]] = None
+             ) -> DiscoveredDevice:
+    ''' Identify device at address of open bus by probing matching signatures. '''
+    for signature in SIGNATURES if signatures is None else signatures:
+        if address not in signature.addresses:
+            continue
+        ids = signature.probe(bus, address)
+        if ids is not None:
+            return DiscoveredDevice(path, address, signature.name, signature.driver,
+                                    list(signature.candidates or [signature.name]), ids)
+    return DiscoveredDevice(path, address)
+
+
+def scan_bus(bus: I2CBase, path: str = '', signatures: Optional[List[DeviceSignature]] = None
+             ) -> List[DiscoveredDevice]:
+    ''' Detect ACKing addresses of open bus and identify each. '''
+    return [identify(bus, address, path, signatures) for address in bus.detect()]
+
+
+def list_buses(pattern: str = '/dev/i2c-*') -> List[str]:
+    ''' I2C bus device paths sorted by bus number. '''
+    def number(path: str) -> int:
+        match = re.search(r'(\d+)$', path)
+        return int(match.group(1)) if match else -1
+    return sorted(glob.glob(pattern), key=lambda path: (number(path), path))
+
+
+def topology_key(paths: Sequence[str]) -> str:
+    ''' Key of bus topology: bus paths and their adapter names (from sysfs, w/o touching the buses). '''
+    adapters = []
+    for path in paths:
+        name_path = os.path.join('/sys/class/i2c-dev', os.path.basename(path), 'name')
+        try:
+            with open(name_path, 'r', encoding='utf-8') as fp:
+                adapters.append([path, fp.read().strip()])
+        except OSError:
+            adapters.append([path, ''])
+    return hashlib.sha1(json.dumps(adapters).encode('utf-8')).hexdigest()[:16]
+
+
+def load_cache(path: str = DEFAULT_CACHE_PATH) -> Dict[str, dict]:
+    ''' Cached inventories by topology key (empty if missing or corrupt). '''
+    try:
+        with open(path, 'r', encoding='utf-8') as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(inventory: Inventory, path: str = DEFAULT_CACHE_PATH):
+    ''' Store inventory under its topology key (atomic replace). '''
+    cache = load_cache(path)
+    cache[inventory.topology] = inventory.to_dict()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fp:
+        json.dump(cache, fp, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _scan_path(path: str, bus_factory: BusFactory, signatures: Optional[List[DeviceSignature]]
+               ) -> List[DiscoveredDevice]:
+    bus = bus_factory(path)
+    bus.open()
+    try:
+        return scan_bus(bus, path, signatures)
+    finally:
+        bus.close()
+
+
+def discover(paths: Optional[Sequence[str]] = None, bus_factory: BusFactory = I2C,
+             cache_path: Optional[str] = DEFAULT_CACHE_PATH, refresh: bool = False,
+             signatures: Optional[List[DeviceSignature]] = None) -> Inventory:
+    '''
+    Scan buses concurrently (one thread per bus) and identify devices. The inventory is cached
+    by bus topology so later calls w/ the same buses skip probing.
+
+    Args:
+        paths (Sequence[str], optional): Bus paths. Defaults to all /dev/i2c-* buses.
+        bus_factory (Callable[[str], I2CBase], optional): Creates (unopened) bus of path. Defaults to I2C.
+        cache_path (str, optional): Inventory cache file (None disables cache). Defaults to ~/.cache/pyrpiic.
+        refresh (bool, optional): Probe even if topology is cached. Defaults to False.
+        signatures (List[DeviceSignature], optional): Signatures to probe. Defaults to SIGNATURES.
+
+    Returns:
+        Inventory: devices of all buses (cached=True if loaded from cache)
+    '''
+    paths = list_buses() if paths is None else list(paths)
+    topology = topology_key(paths)
+    if cache_path and not refresh:
+        cached = load_cache(cache_path).get(topology)
+        if cached is not None:
+            return Inventory.from_dict(cached, cached=True)
+    inventory = Inventory(topology=topology, buses=paths)
+    if paths:
+        with ThreadPoolExecutor(max_workers=len(paths), thread_name_prefix='pyrpiic-discover') as executor:
+            futures = {path: executor.submit(_scan_path, path, bus_factory, signatures) for path in paths}
+        for path, future in futures.items():
+            try:
+                inventory.devices.extend(future.result())
+            except OSError as err:
+                inventory.errors[path] = str(err)
+    if cache_path and not inventory.errors:
+        save_cache(inventory, cache_path)
+    return inventory
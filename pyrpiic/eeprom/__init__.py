@@ -1,3 +1,10 @@
-from .eeprom import EEPROM
+from typing import TYPE_CHECKING
+from pyrpiic.lazy import lazy_attributes
 
-from .instances import M24C02
+__all__ = ['EEPROM', 'M24C02']
+
+__getattr__, __dir__ = lazy_attributes(__name__, {'EEPROM': '.eeprom', 'M24C02': '.instances'})
+
+if TYPE_CHECKING:
+    from .eeprom import EEPROM
+    from .instances import M24C02
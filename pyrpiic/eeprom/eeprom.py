@@ -1,6 +1,5 @@
-import time
-
 from pyrpio.i2c import I2C
+from pyrpiic.steps import Steps, run_steps
 
 
 class EEPROMException(Exception):
@@ -35,6 +34,11 @@ class EEPROM:
         self.__max_bytes = pages * page_bytes
         self.__write_time = write_time_ms / 1000.0
 
+    @property
+    def bus(self) -> I2C:
+        ''' I2C bus of the eeprom '''
+        return self.__bus
+
     def read_byte(self, address: int) -> bytes:
         '''
         Read byte at memory address
@@ -58,6 +62,10 @@ class EEPROM:
             address (int): memory address to write
             value (int): byte to write
         '''
+        run_steps(self.write_byte_steps(address, value))
+
+    def write_byte_steps(self, address: int, value: bytes) -> Steps[None]:
+        ''' write_byte() as steps (see pyrpiic.steps) '''
         if address > self.__max_bytes:
             raise EEPROMException(f'Overflows memory max is {self.__max_bytes} Bytes')
         self.__bus.set_address(self.__i2c_address)
@@ -65,7 +73,7 @@ class EEPROM:
             address.to_bytes(length=self.__pointer_bytes, byteorder='big') +
             value
         )
-        time.sleep(self.__write_time)
+        yield self.__write_time
 
     def read_sequential_bytes(self, start_address: int, num_bytes: int) -> bytes:
         '''
@@ -91,19 +99,23 @@ class EEPROM:
             start_address (int): start address to write
             data (bytes): data to write
         '''
+        run_steps(self.write_sequential_bytes_steps(start_address, data))
 
+    def write_sequential_bytes_steps(self, start_address: int, data: bytes) -> Steps[None]:
+        ''' write_sequential_bytes() as steps (see pyrpiic.steps) '''
         if start_address + len(data) > self.__max_bytes:
             raise EEPROMException(f'Overflows memory max is {self.__max_bytes} Bytes')
-        self.__bus.set_address(self.__i2c_address)
         sent_data = 0
 
         while sent_data < len(data):
+            # (Re)select device as bus may be used by others during write cycle
+            self.__bus.set_address(self.__i2c_address)
             current_start_address = start_address + sent_data
             next_page_aligned_address = (current_start_address + self.__page_bytes) & (~(self.__page_bytes - 1))
             data_to_send = min(next_page_aligned_address - current_start_address, len(data) - sent_data)
             self.__bus.write(current_start_address.to_bytes(
                 length=self.__pointer_bytes, byteorder='big') + data[sent_data: sent_data + data_to_send])
-            time.sleep(self.__write_time)
+            yield self.__write_time
             sent_data += data_to_send
 
     def write_string(self, start_address: int, value: str, encoding: str = 'ascii'):
@@ -115,10 +127,14 @@ class EEPROM:
             value (str): string with no null character to encode and write
             encoding (str, optional): What encoding to use for the string. Defaults to 'ascii'.
         '''
+        run_steps(self.write_string_steps(start_address, value, encoding))
+
+    def write_string_steps(self, start_address: int, value: str, encoding: str = 'ascii') -> Steps[None]:
+        ''' write_string() as steps (see pyrpiic.steps) '''
         if '\0' in value:
             index = value.index('\0')
             raise ValueError(f'Value contains null character at index: {index}')
-        self.write_sequential_bytes(start_address, (value + '\0').encode(encoding))
+        yield from self.write_sequential_bytes_steps(start_address, (value + '\0').encode(encoding))
 
     def read_string(self, start_address: int, encoding: str = 'ascii'):
         '''
@@ -158,4 +174,8 @@ class EEPROM:
         '''
         Erase (set bytes to 0x00) all data on the eeprom
         '''
-        self.write_sequential_bytes(start_address=0x0, data=bytes(self.__max_bytes))
+        run_steps(self.erase_all_steps())
+
+    def erase_all_steps(self) -> Steps[None]:
+        ''' erase_all() as steps (see pyrpiic.steps) '''
+        yield from self.write_sequential_bytes_steps(start_address=0x0, data=bytes(self.__max_bytes))
@@ -1 +1,23 @@
-from .tca6416a import TCA6416A
+from typing import TYPE_CHECKING
+from pyrpiic.lazy import lazy_attributes
+
+__all__ = ['ExpanderRegister', 'ExpanderRegisterMap', 'GPIODir', 'IOExpander', 'PCA9555', 'PCA9698', 'TCA6416A',
+           'TCA9535']
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'ExpanderRegister': '.expander',
+    'ExpanderRegisterMap': '.expander',
+    'GPIODir': '.expander',
+    'IOExpander': '.expander',
+    'PCA9555': '.pca9555',
+    'PCA9698': '.pca9698',
+    'TCA6416A': '.tca6416a',
+    'TCA9535': '.tca9535',
+})
+
+if TYPE_CHECKING:
+    from .expander import ExpanderRegister, ExpanderRegisterMap, GPIODir, IOExpander
+    from .pca9555 import PCA9555
+    from .pca9698 import PCA9698
+    from .tca6416a import TCA6416A
+    from .tca9535 import TCA9535
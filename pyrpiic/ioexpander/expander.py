@@ -0,0 +1,320 @@
+''' Register-map engine shared by I2C-GPIO expander drivers. '''
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from pyrpio.i2c_register_device import I2CRegisterDevice
+from pyrpio.i2c import I2C
+from pyrpiic.profiles import RegisterWrite, check_settings, merge_writes
+from pyrpiic.snapshot import RegisterBlock, RegisterSnapshot, restore_snapshot, take_snapshot
+
+
+class GPIODir(str, Enum):
+    IN = 'IN'
+    OUT = 'OUT'
+
+
+class ExpanderRegister(str, Enum):
+    INPUT = 'INPUT'
+    OUTPUT = 'OUTPUT'
+    POLARITY = 'POLARITY'
+    CONFIG = 'CONFIG'
+
+
+@dataclass(frozen=True)
+class ExpanderRegisterMap:
+    '''
+    Declarative register layout of an 8-bit per port GPIO expander.
+
+    Args:
+        num_ports (int): Number of 8-bit ports
+        input_base (int): Port 0 input register
+        output_base (int): Port 0 output register
+        polarity_base (int): Port 0 polarity inversion register
+        config_base (int): Port 0 configuration (direction) register
+        auto_increment (int, optional): Bits OR'ed into command byte to enable auto-increment
+            for sequential access. Defaults to 0x00 (device always auto-increments).
+        pin_names (Tuple[Tuple[str, ...], ...], optional): Pin names of each port
+    '''
+    num_ports: int
+    input_base: int
+    output_base: int
+    polarity_base: int
+    config_base: int
+    auto_increment: int = 0x00
+    pin_names: Tuple[Tuple[str, ...], ...] = field(default_factory=tuple)
+
+    def base(self, kind: ExpanderRegister) -> int:
+        ''' Get port 0 register of given kind. '''
+        return {
+            ExpanderRegister.INPUT: self.input_base,
+            ExpanderRegister.OUTPUT: self.output_base,
+            ExpanderRegister.POLARITY: self.polarity_base,
+            ExpanderRegister.CONFIG: self.config_base,
+        }[ExpanderRegister(kind)]
+
+    def pins(self) -> Dict[Union[str, int], Tuple[int, int]]:
+        ''' Build lookup of gpio name and index to (port index, bit position). '''
+        lookup: Dict[Union[str, int], Tuple[int, int]] = {}
+        for port, names in enumerate(self.pin_names):
+            for bit, name in enumerate(names):
+                lookup[name] = (port, bit)
+        for index in range(8 * self.num_ports):
+            lookup[index] = (index // 8, index % 8)
+        return lookup
+
+
+class IOExpander:
+    '''
+    I2C-GPIO expander driven by an ExpanderRegisterMap. Subclasses only declare REGISTER_MAP;
+    pin lookups are generated once per class.
+
+    When shadow is enabled, output, polarity and configuration registers are cached after
+    the first access so bit updates issue a single write instead of a read-modify-write.
+    Input registers are never shadowed.
+    '''
+    REGISTER_MAP: ExpanderRegisterMap
+    NUM_PORTS: int
+    # Writable registers outside the port banks captured by snapshot() (first register, count)
+    SNAPSHOT_EXTRA_BLOCKS: Tuple[RegisterBlock, ...] = ()
+    _PINS: Dict[Union[str, int], Tuple[int, int]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'REGISTER_MAP' in cls.__dict__:
+            cls.NUM_PORTS = cls.REGISTER_MAP.num_ports
+            cls._PINS = cls.REGISTER_MAP.pins()
+
+    def __init__(self, bus: I2C, address=0x20, shadow: bool = False):
+        self.bus = bus
+        self.address = address
+        self.i2c_reg = I2CRegisterDevice(bus, address, register_size=1, data_size=1)
+        regmap = self.REGISTER_MAP
+        self._input_registers = range(regmap.input_base, regmap.input_base + regmap.num_ports)
+        self._shadow: Optional[Dict[int, int]] = {} if shadow else None
+
+    def close(self):
+        ''' Close up access. '''
+        return 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def shadow_enabled(self) -> bool:
+        ''' Output, polarity and config registers are cached. '''
+        return self._shadow is not None
+
+    def invalidate_shadow(self):
+        ''' Drop cached register values so they are re-read on next access. '''
+        if self._shadow is not None:
+            self._shadow.clear()
+
+    def _is_shadowed(self, register: int) -> bool:
+        return self._shadow is not None and register not in self._input_registers
+
+    @classmethod
+    def compile_profile(cls, settings: Mapping[str, Mapping[str, object]]) -> Tuple[int, List[RegisterWrite]]:
+        '''
+        Register writes of profile settings (see pyrpiic.profiles): outputs (gpio -> level),
+        polarity (gpio -> flipped) and directions (gpio -> IN/OUT). Only listed banks are written;
+        unlisted pins of a bank take power-on values (output high, not flipped, input).
+        Outputs are written before directions so pins switched to output drive the new level.
+        '''
+        check_settings(settings, ('outputs', 'polarity', 'directions'))
+        regmap = cls.REGISTER_MAP
+        values: Dict[int, int] = {}
+        blocks = []
+        for name, base, default in (('outputs', regmap.output_base, 0xFF), ('polarity', regmap.polarity_base, 0x00),
+                                    ('directions', regmap.config_base, 0xFF)):
+            if name not in settings:
+                continue
+            ports = [default] * regmap.num_ports
+            for gpio, value in settings[name].items():
+                try:
+                    port, bit = cls._PINS[int(gpio) if str(gpio).isdigit() else gpio]
+                except KeyError:
+                    raise ValueError(f'GPIO {gpio} is not a valid value') from None
+                on = GPIODir(value) == GPIODir.IN if name == 'directions' else bool(value)
+                ports[port] = (ports[port] | (1 << bit)) if on else (ports[port] & ~(1 << bit))
+            values.update(zip(range(base, base + regmap.num_ports), ports))
+            blocks.append((base, regmap.num_ports))
+        return 1, merge_writes(values, command=regmap.auto_increment, blocks=blocks)
+
+    def snapshot_blocks(self) -> Tuple[RegisterBlock, ...]:
+        ''' Writable register blocks (output, polarity, config banks and extras) of snapshots. '''
+        regmap = self.REGISTER_MAP
+        banks = (regmap.output_base, regmap.polarity_base, regmap.config_base)
+        return tuple((base, regmap.num_ports) for base in banks) + self.SNAPSHOT_EXTRA_BLOCKS
+
+    def snapshot(self) -> RegisterSnapshot:
+        ''' Read all writable registers w/ one sequential read per bank in a single combined transfer. '''
+        snapshot = take_snapshot(self, self.snapshot_blocks(), command=self.REGISTER_MAP.auto_increment)
+        if self._shadow is not None:
+            self._shadow.update(snapshot.registers)
+        return snapshot
+
+    def restore(self, snapshot: RegisterSnapshot) -> Dict[int, int]:
+        '''
+        Write back registers of snapshot that differ from the device.
+
+        Returns:
+            Dict[int, int]: registers written
+        '''
+        written = restore_snapshot(self, snapshot, self.snapshot_blocks(), command=self.REGISTER_MAP.auto_increment)
+        if self._shadow is not None:
+            self._shadow.update(snapshot.registers)
+        return written
+
+    def get_register(self, register: int, mask: Optional[int] = None) -> int:
+        ''' Get single byte register. '''
+        if self._is_shadowed(register):
+            value = self._shadow.get(register)
+            if value is None:
+                value = self._shadow[register] = self.i2c_reg.read_register(register)
+        else:
+            value = self.i2c_reg.read_register(register)
+        if mask is not None:
+            value = value & mask
+        return value
+
+    def set_register(self, register, value: int, mask: Optional[int] = None):
+        ''' Set single byte register. '''
+        if mask is not None:
+            pvalue = self.get_register(register, ~mask)  # pylint: disable=invalid-unary-operand-type
+            value = pvalue | (value & mask)
+        self.i2c_reg.write_register(register, value)
+        if self._is_shadowed(register):
+            self._shadow[register] = value
+
+    def get_register_bit(self, register: int, bit: int):
+        ''' Get single bit from register. '''
+        mask = 1 << bit
+        value = self.get_register(register, mask)
+        return bool(value >> bit)
+
+    def set_register_bit(self, register: int, bit: int, on: bool):
+        ''' Set single bit of a register. '''
+        mask = 1 << bit
+        pvalue = self.get_register(register, ~mask)
+        self.set_register(register, pvalue | (int(on) << bit))
+
+    def _sequential_register(self, register: int) -> int:
+        ''' Command byte for sequential access starting at register. '''
+        return self.REGISTER_MAP.auto_increment | register
+
+    def read_ports(self, kind: ExpanderRegister) -> List[int]:
+        ''' Read all port registers of given kind in a single sequential read. '''
+        base = self.REGISTER_MAP.base(kind)
+        registers = range(base, base + self.NUM_PORTS)
+        if self._is_shadowed(base) and all(r in self._shadow for r in registers):
+            return [self._shadow[r] for r in registers]
+        values = list(self.i2c_reg.read_register_sequential(self._sequential_register(base), self.NUM_PORTS))
+        if self._is_shadowed(base):
+            self._shadow.update(zip(registers, values))
+        return values
+
+    def write_ports(self, kind: ExpanderRegister, values: Sequence[int], start_port: int = 0):
+        ''' Write consecutive port registers of given kind in a single sequential write. '''
+        if start_port < 0 or start_port + len(values) > self.NUM_PORTS:
+            raise ValueError(f'Ports {start_port}-{start_port + len(values) - 1} are not valid')
+        register = self.REGISTER_MAP.base(kind) + start_port
+        if len(values) == 1:
+            self.i2c_reg.write_register(register, values[0])
+        else:
+            self.i2c_reg.write_register_sequential(self._sequential_register(register), values)
+        if self._is_shadowed(register):
+            self._shadow.update(zip(range(register, register + len(values)), values))
+
+    def get_output_ports(self) -> List[int]:
+        ''' Get all output port registers in a single sequential read. '''
+        return self.read_ports(ExpanderRegister.OUTPUT)
+
+    def set_output_ports(self, values: Sequence[int], start_port: int = 0):
+        ''' Set consecutive output port registers in a single sequential write. '''
+        self.write_ports(ExpanderRegister.OUTPUT, values, start_port=start_port)
+
+    def _update_pins(self, kind: ExpanderRegister, states: Mapping[Union[str, int], Union[bool, int]]):
+        ''' Update several pins of given kind w/ one read and one write spanning touched ports. '''
+        if not states:
+            return
+        ports = self.read_ports(kind)
+        touched = []
+        for gpio, on in states.items():
+            port, bit = self._lookup(gpio)
+            ports[port] = (ports[port] | (1 << bit)) if on else (ports[port] & ~(1 << bit))
+            touched.append(port)
+        start, stop = min(touched), max(touched)
+        self.write_ports(kind, ports[start:stop + 1], start_port=start)
+
+    def _lookup(self, gpio: Union[str, int]) -> Tuple[int, int]:
+        try:
+            return self._PINS[gpio]
+        except (KeyError, TypeError):
+            raise ValueError(f'GPIO {gpio} is not a valid value') from None
+
+    def get_port_index(self, gpio: Union[str, int]) -> int:
+        ''' Get port index for given gpio. '''
+        return self._lookup(gpio)[0]
+
+    def get_gpio_bit_position(self, gpio: Union[str, int]) -> int:
+        ''' Get register bit position for given gpio. '''
+        return self._lookup(gpio)[1]
+
+    def get_gpio_direction(self, gpio: Union[str, int]) -> GPIODir:
+        ''' Get GPIO direction as either in or out. '''
+        port_index, gpio_bit = self._lookup(gpio)
+        value = self.get_register_bit(self.REGISTER_MAP.config_base + port_index, gpio_bit)
+        return GPIODir.IN if value else GPIODir.OUT
+
+    def set_gpio_direction(self, gpio: Union[str, int], gpio_dir: GPIODir):
+        ''' Set GPIO direction as either in or out. '''
+        port_index, gpio_bit = self._lookup(gpio)
+        value = gpio_dir == GPIODir.IN
+        self.set_register_bit(self.REGISTER_MAP.config_base + port_index, gpio_bit, value)
+
+    def set_gpio_directions(self, directions: Mapping[Union[str, int], GPIODir]):
+        ''' Set direction of several GPIOs w/ a single read and write. '''
+        self._update_pins(ExpanderRegister.CONFIG, {k: v == GPIODir.IN for k, v in directions.items()})
+
+    def get_gpio_input(self, gpio: Union[str, int]) -> bool:
+        ''' Read GPIO input value.'''
+        port_index, gpio_bit = self._lookup(gpio)
+        return self.get_register_bit(self.REGISTER_MAP.input_base + port_index, gpio_bit)
+
+    def get_gpio_inputs(self, gpios: Optional[Sequence[Union[str, int]]] = None) -> Dict[Union[str, int], bool]:
+        ''' Read several GPIO input values w/ a single sequential read. Defaults to all named pins. '''
+        ports = self.read_ports(ExpanderRegister.INPUT)
+        if gpios is None:
+            gpios = [name for names in self.REGISTER_MAP.pin_names for name in names]
+        values = {}
+        for gpio in gpios:
+            port, bit = self._lookup(gpio)
+            values[gpio] = bool((ports[port] >> bit) & 1)
+        return values
+
+    def get_gpio_output(self, gpio: Union[str, int]) -> bool:
+        ''' Get currently set GPIO output value.'''
+        port_index, gpio_bit = self._lookup(gpio)
+        return self.get_register_bit(self.REGISTER_MAP.output_base + port_index, gpio_bit)
+
+    def set_gpio_output(self, gpio: Union[str, int], high: Union[bool, int]):
+        ''' Pull GPIO output either active high or low.'''
+        port_index, gpio_bit = self._lookup(gpio)
+        self.set_register_bit(self.REGISTER_MAP.output_base + port_index, gpio_bit, bool(high))
+
+    def set_gpio_outputs(self, outputs: Mapping[Union[str, int], Union[bool, int]]):
+        ''' Pull several GPIO outputs high or low w/ a single read and write. '''
+        self._update_pins(ExpanderRegister.OUTPUT, outputs)
+
+    def get_gpio_polarity(self, gpio: Union[str, int]):
+        ''' Get GPIO polarity setting. '''
+        port_index, gpio_bit = self._lookup(gpio)
+        return self.get_register_bit(self.REGISTER_MAP.polarity_base + port_index, gpio_bit)
+
+    def set_gpio_polarity(self, gpio: Union[str, int], flipped: bool):
+        ''' Set GPIO polarity setting as either normal or flipped. '''
+        port_index, gpio_bit = self._lookup(gpio)
+        self.set_register_bit(self.REGISTER_MAP.polarity_base + port_index, gpio_bit, flipped)
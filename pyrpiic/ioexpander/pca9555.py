@@ -0,0 +1,24 @@
+from pyrpio.i2c import I2C
+from .expander import ExpanderRegisterMap, GPIODir, IOExpander
+
+__all__ = ['GPIODir', 'PCA9555']
+
+
+class PCA9555(IOExpander):
+    PORT0 = ['IO0_0', 'IO0_1', 'IO0_2', 'IO0_3', 'IO0_4', 'IO0_5', 'IO0_6', 'IO0_7']
+    PORT1 = ['IO1_0', 'IO1_1', 'IO1_2', 'IO1_3', 'IO1_4', 'IO1_5', 'IO1_6', 'IO1_7']
+    PCA9555_BASE_INPUT = 0x00
+    PCA9555_BASE_OUTPUT = 0x02
+    PCA9555_BASE_POLARITY = 0x04
+    PCA9555_BASE_CONFIG = 0x06
+    REGISTER_MAP = ExpanderRegisterMap(
+        num_ports=2,
+        input_base=PCA9555_BASE_INPUT,
+        output_base=PCA9555_BASE_OUTPUT,
+        polarity_base=PCA9555_BASE_POLARITY,
+        config_base=PCA9555_BASE_CONFIG,
+        pin_names=(tuple(PORT0), tuple(PORT1))
+    )
+
+    def __init__(self, bus: I2C, address=0x20, shadow: bool = False):
+        super().__init__(bus, address=address, shadow=shadow)
@@ -0,0 +1,152 @@
+''' Precompiled GPIO waveform playback for I2C-GPIO expanders. '''
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+GPIOStates = Dict[Union[str, int], Union[bool, int]]
+
+
+@dataclass
+class GPIOStep:
+    ''' Single compiled waveform step. '''
+    offset: float
+    ports: bytes
+    start_port: int = 0
+    data: bytes = b''
+
+
+@dataclass
+class GPIOStepTiming:
+    ''' Measured timing of a played step (perf_counter seconds). '''
+    scheduled: float
+    started: float
+    finished: float
+
+    @property
+    def jitter(self) -> float:
+        ''' Delay between scheduled deadline and start of the bus write. '''
+        return self.started - self.scheduled
+
+
+@dataclass
+class GPIOSequence:
+    ''' Compiled waveform: port byte vector and minimal write span per step. '''
+    initial: bytes
+    steps: List[GPIOStep] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        ''' Offset of the final step in seconds. '''
+        return self.steps[-1].offset if self.steps else 0.0
+
+    @property
+    def num_writes(self) -> int:
+        ''' Number of bus writes needed to play the sequence. '''
+        return sum(1 for step in self.steps if step.data)
+
+
+class GPIOSequencer:
+    '''
+    Compile (time offset, pin states) steps into output port byte vectors and play them back
+    against the expander with one sequential write per step and drift-free deadlines.
+
+    Works w/ any IOExpander (TCA6416A, PCA9698, PCA9555, TCA9535).
+    '''
+
+    def __init__(self, expander, spin_time: float = 0.0005):
+        '''
+        Args:
+            expander: I2C-GPIO expander driver
+            spin_time (float, optional): Busy-wait this long before each deadline instead
+                of sleeping to reduce wake-up jitter. Defaults to 0.5 ms.
+        '''
+        self.expander = expander
+        self.spin_time = spin_time
+
+    def compile(self, steps: Iterable[Tuple[float, GPIOStates]],
+                initial: Optional[Sequence[int]] = None) -> GPIOSequence:
+        '''
+        Compile waveform steps into precomputed port writes.
+
+        Args:
+            steps (Iterable[Tuple[float, GPIOStates]]): (offset seconds, {gpio: high}) pairs.
+                Offsets are relative to start of playback and must not decrease.
+            initial (Sequence[int], optional): Output port values prior to the first step.
+                Defaults to reading the expander output registers once.
+
+        Returns:
+            GPIOSequence: compiled sequence
+        '''
+        num_ports = self.expander.NUM_PORTS
+        ports = bytearray(initial if initial is not None else self.expander.get_output_ports())
+        if len(ports) != num_ports:
+            raise ValueError(f'Initial state must have {num_ports} port values')
+        sequence = GPIOSequence(initial=bytes(ports))
+        # Resolve pin names to (port, mask) only once
+        pin_map: Dict[Union[str, int], Tuple[int, int]] = {}
+        prev_offset = 0.0
+        for index, (offset, states) in enumerate(steps):
+            if offset < prev_offset:
+                raise ValueError(f'Step {index} offset {offset} is earlier than previous step')
+            prev_offset = offset
+            prev_ports = bytes(ports)
+            for gpio, high in states.items():
+                if gpio not in pin_map:
+                    port = self.expander.get_port_index(gpio)
+                    pin_map[gpio] = (port, 1 << self.expander.get_gpio_bit_position(gpio))
+                port, mask = pin_map[gpio]
+                ports[port] = (ports[port] | mask) if high else (ports[port] & ~mask)
+            if index == 0:
+                # First step writes every touched port so playback starts from a known state
+                changed = sorted({port for port, _ in pin_map.values()})
+            else:
+                changed = [i for i in range(num_ports) if ports[i] != prev_ports[i]]
+            step = GPIOStep(offset=float(offset), ports=bytes(ports))
+            if changed:
+                step.start_port = changed[0]
+                step.data = bytes(ports[changed[0]:changed[-1] + 1])
+            sequence.steps.append(step)
+        return sequence
+
+    def play(self, sequence: GPIOSequence) -> List[GPIOStepTiming]:
+        '''
+        Play compiled sequence. Each step is scheduled against an absolute deadline
+        (start + offset) so late steps do not accumulate drift.
+
+        Args:
+            sequence (GPIOSequence): compiled sequence
+
+        Returns:
+            List[GPIOStepTiming]: timing of each step
+        '''
+        timings: List[GPIOStepTiming] = []
+        set_output_ports = self.expander.set_output_ports
+        start = time.perf_counter()
+        for step in sequence.steps:
+            deadline = start + step.offset
+            self._wait_until(deadline)
+            started = time.perf_counter()
+            if step.data:
+                set_output_ports(step.data, start_port=step.start_port)
+            timings.append(GPIOStepTiming(scheduled=deadline, started=started, finished=time.perf_counter()))
+        return timings
+
+    def run(self, steps: Iterable[Tuple[float, GPIOStates]]) -> List[GPIOStepTiming]:
+        ''' Compile and play steps. '''
+        return self.play(self.compile(steps))
+
+    def _wait_until(self, deadline: float):
+        ''' Sleep until shortly before deadline and spin the remainder. '''
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin_time:
+            time.sleep(remaining - self.spin_time)
+        while time.perf_counter() < deadline:
+            pass
+
+    @staticmethod
+    def jitter_stats(timings: Sequence[GPIOStepTiming]) -> Dict[str, float]:
+        ''' Summarize step start jitter (seconds). '''
+        if not timings:
+            return {'min': 0.0, 'max': 0.0, 'mean': 0.0}
+        jitters = [t.jitter for t in timings]
+        return {'min': min(jitters), 'max': max(jitters), 'mean': sum(jitters) / len(jitters)}
@@ -0,0 +1,24 @@
+from pyrpio.i2c import I2C
+from .expander import ExpanderRegisterMap, GPIODir, IOExpander
+
+__all__ = ['GPIODir', 'TCA9535']
+
+
+class TCA9535(IOExpander):
+    PORT0 = ['P00', 'P01', 'P02', 'P03', 'P04', 'P05', 'P06', 'P07']
+    PORT1 = ['P10', 'P11', 'P12', 'P13', 'P14', 'P15', 'P16', 'P17']
+    TCA9535_BASE_INPUT = 0x00
+    TCA9535_BASE_OUTPUT = 0x02
+    TCA9535_BASE_POLARITY = 0x04
+    TCA9535_BASE_CONFIG = 0x06
+    REGISTER_MAP = ExpanderRegisterMap(
+        num_ports=2,
+        input_base=TCA9535_BASE_INPUT,
+        output_base=TCA9535_BASE_OUTPUT,
+        polarity_base=TCA9535_BASE_POLARITY,
+        config_base=TCA9535_BASE_CONFIG,
+        pin_names=(tuple(PORT0), tuple(PORT1))
+    )
+
+    def __init__(self, bus: I2C, address=0x20, shadow: bool = False):
+        super().__init__(bus, address=address, shadow=shadow)
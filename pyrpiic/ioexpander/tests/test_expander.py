@@ -0,0 +1,50 @@
+import pytest
+
+from pyrpiic.ioexpander import GPIODir, PCA9555, PCA9698, TCA6416A
+from pyrpiic.sim import SimI2C, SimPCA9555, SimPCA9698, SimTCA6416A
+
+bus = SimI2C('/dev/i2c-3')
+bus.open()
+bus.attach(0x20, SimTCA6416A())
+bus.attach(0x21, SimPCA9698())
+bus.attach(0x22, SimPCA9555())
+
+
+def test_expander_pin_lookup():
+    expander = TCA6416A(bus, 0x20)
+    assert expander.get_port_index('P13') == 1
+    assert expander.get_gpio_bit_position('P13') == 3
+    assert expander.get_port_index(12) == 1
+    with pytest.raises(ValueError):
+        expander.get_port_index('IO0_0')
+
+
+def test_expander_gpio_roundtrip():
+    expander = PCA9555(bus, 0x22)
+    expander.set_gpio_direction('IO1_2', GPIODir.OUT)
+    expander.set_gpio_output('IO1_2', False)
+    assert expander.get_gpio_direction('IO1_2') == GPIODir.OUT
+    assert not expander.get_gpio_output('IO1_2')
+    assert bus.devices[0x22].registers[PCA9555.PCA9555_BASE_OUTPUT + 1] == 0xFB
+    assert bus.devices[0x22].registers[PCA9555.PCA9555_BASE_CONFIG + 1] == 0xFB
+
+
+def test_expander_shadow_single_write():
+    expander = PCA9698(bus, 0x21, shadow=True)
+    expander.set_gpio_output('IO3_1', True)
+    transactions = bus.transactions
+    expander.set_gpio_output('IO3_2', False)
+    expander.set_gpio_output('IO3_1', False)
+    assert bus.transactions == transactions + 2  # one write each, no reads
+    assert bus.devices[0x21].registers[PCA9698.PCA9698_PORT3_OUTPUT] == 0xF9
+
+
+def test_expander_bulk_outputs():
+    expander = PCA9698(bus, 0x21)
+    expander.set_output_ports([0, 0, 0, 0, 0])
+    transactions, written = bus.transactions, bus.bytes_written
+    expander.set_gpio_outputs({'IO1_0': True, 'IO3_7': True})
+    assert bus.transactions == transactions + 2  # read ports, write changed ports
+    assert [bus.devices[0x21].registers[0x08 + port] for port in range(5)] == [0x00, 0x01, 0x00, 0x80, 0x00]
+    assert bus.bytes_written - written == 1 + 1 + 3  # read command, write command + ports 1-3
+    assert expander.get_output_ports() == [0x00, 0x01, 0x00, 0x80, 0x00]
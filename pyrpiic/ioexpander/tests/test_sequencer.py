@@ -0,0 +1,42 @@
+import pytest
+
+from pyrpiic.ioexpander.pca9698 import PCA9698
+from pyrpiic.ioexpander.sequencer import GPIOSequencer
+from pyrpiic.sim import SimI2C, SimPCA9698
+
+bus = SimI2C('/dev/i2c-3')
+bus.open()
+bus.attach(0x20, SimPCA9698())
+expander = PCA9698(bus, 0x20)
+
+
+def test_sequencer_compile_minimal_writes():
+    sequencer = GPIOSequencer(expander)
+    sequence = sequencer.compile([
+        (0.0, {'IO0_0': True, 'IO2_7': True}),
+        (0.001, {'IO0_0': False}),
+        (0.002, {'IO0_0': False}),
+        (0.003, {'IO1_1': True, 'IO3_0': True}),
+    ], initial=[0, 0, 0, 0, 0])
+    assert [(s.start_port, s.data) for s in sequence.steps] == [
+        (0, bytes([0x01, 0x00, 0x80])),
+        (0, bytes([0x00])),
+        (0, b''),
+        (1, bytes([0x02, 0x80, 0x01])),
+    ]
+    assert sequence.num_writes == 3
+
+
+def test_sequencer_play():
+    transactions = bus.transactions
+    sequencer = GPIOSequencer(expander)
+    timings = sequencer.run([(0.0, {'IO4_3': True}), (0.002, {'IO4_3': False, 'IO4_4': True})])
+    assert [t.scheduled - timings[0].scheduled for t in timings] == pytest.approx([0.0, 0.002])
+    assert all(t.jitter >= 0 for t in timings)
+    assert bus.transactions == transactions + 3  # read initial outputs, one write per step
+    assert bus.devices[0x20].registers[PCA9698.PCA9698_PORT4_OUTPUT] == 0xF7
+
+
+def test_sequencer_rejects_decreasing_offsets():
+    with pytest.raises(ValueError):
+        GPIOSequencer(expander).compile([(0.002, {'IO0_0': True}), (0.001, {'IO0_0': False})], initial=[0] * 5)
@@ -0,0 +1,32 @@
+''' Lazy (PEP 562) loading of package attributes so importing one driver only loads its dependencies. '''
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_attributes(package: str, attributes: Dict[str, str]
+                    ) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    '''
+    Module __getattr__ and __dir__ importing attributes from submodules on first access.
+
+    Args:
+        package (str): __name__ of package
+        attributes (Dict[str, str]): attribute name -> relative submodule defining it. An attribute
+            named like its submodule is the submodule itself.
+
+    Example:
+        __getattr__, __dir__ = lazy_attributes(__name__, {'PCA9698': '.pca9698'})
+    '''
+    def __getattr__(name: str):
+        submodule = attributes.get(name)
+        if submodule is None:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+        module = importlib.import_module(submodule, package)
+        value = module if submodule.rsplit('.', 1)[-1] == name else getattr(module, name)
+        setattr(sys.modules[package], name, value)  # later lookups bypass __getattr__
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,317 @@
+''' Opt-in I2C transaction profiling of pyrpiic drivers. '''
+import functools
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from pyrpio.i2c.types import I2CBase, I2CMessage
+from .bus import I2CProxy
+
+
+@dataclass
+class ProfileStats:
+    ''' Accumulated bus cost. '''
+    calls: int = 0
+    transactions: int = 0
+    reads: int = 0
+    writes: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    bus_time: float = 0.0
+    sleeps: int = 0
+    sleep_time: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, float]:
+        ''' Export stats w/o raw latency samples. '''
+        values = {k: v for k, v in self.__dict__.items() if k != 'latencies'}
+        values['wall_time'] = sum(self.latencies)
+        return values
+
+
+class ProfiledI2C(I2CProxy):
+    ''' I2C bus wrapper that reports every transaction to a profiler. '''
+
+    def __init__(self, bus: I2CBase, profiler: 'I2CProfiler'):
+        super().__init__(bus)
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def _device(self, address: Optional[int] = None) -> Tuple[Optional[str], int]:
+        if address is None:
+            address = getattr(self._local, 'address', 0)
+        device = (self.path, address)
+        self.profiler.current_device = device
+        return device
+
+    def set_address(self, address: int):
+        self._local.address = address
+        self._device(address)
+        self.bus.set_address(address)
+
+    def read(self, length: int = 1) -> bytes:
+        start = time.perf_counter()
+        data = self.bus.read(length)
+        self.profiler.record(self._device(), time.perf_counter() - start, reads=1, bytes_read=len(data))
+        return data
+
+    def write(self, data: bytes):
+        start = time.perf_counter()
+        self.bus.write(data)
+        self.profiler.record(self._device(), time.perf_counter() - start, writes=1, bytes_written=len(data))
+
+    def read_write(self, data: bytes, length: int = 1) -> bytes:
+        start = time.perf_counter()
+        response = self.bus.read_write(data, length)
+        self.profiler.record(self._device(), time.perf_counter() - start, reads=1, writes=1,
+                             bytes_read=len(response), bytes_written=len(data))
+        return response
+
+    def transfer(self, address: int, messages: List[I2CMessage]):
+        start = time.perf_counter()
+        self.bus.transfer(address, messages)
+        reads = [m for m in messages if m.read]
+        writes = [m for m in messages if not m.read]
+        self.profiler.record(self._device(address), time.perf_counter() - start,
+                             reads=len(reads), writes=len(writes),
+                             bytes_read=sum(len(m.data) for m in reads),
+                             bytes_written=sum(len(m.data) for m in writes))
+
+
+_time_sleep = time.sleep
+
+
+class _SleepHook:
+    '''
+    Single time.sleep replacement shared by all active profilers. It is installed when the first
+    profiler starts and the original restored when the last one stops, in whatever order they stop.
+    '''
+    lock = threading.Lock()
+    active: List['I2CProfiler'] = []
+    original: Optional[Callable[[float], None]] = None
+
+    @classmethod
+    def add(cls, profiler: 'I2CProfiler'):
+        ''' Record sleeps to profiler. '''
+        with cls.lock:
+            if profiler in cls.active:
+                return
+            if not cls.active:
+                cls.original = time.sleep
+                time.sleep = cls.sleep
+            cls.active.append(profiler)
+
+    @classmethod
+    def remove(cls, profiler: 'I2CProfiler'):
+        ''' Stop recording sleeps to profiler. '''
+        with cls.lock:
+            if profiler not in cls.active:
+                return
+            cls.active.remove(profiler)
+            if not cls.active:
+                time.sleep = cls.original
+                cls.original = None
+
+    @classmethod
+    def sleep(cls, seconds: float):
+        ''' Record sleep to active profilers and sleep once (w/ sleep of latest profiler that has one). '''
+        with cls.lock:
+            active, original = list(cls.active), cls.original
+        for profiler in active:
+            profiler.record_sleep(seconds)
+        sleep = next((p.sleep for p in reversed(active) if p.sleep is not None), original or _time_sleep)
+        sleep(seconds)
+
+
+class I2CProfiler:
+    '''
+    Count transactions, bytes, bus time and sleep time per device (bus path, address) and per
+    instrumented driver method (e.g. LMK61E2.get_frequency). Method stats are inclusive: a
+    transaction counts toward every instrumented method on the call stack.
+
+    Example:
+        profiler = I2CProfiler()
+        bus = profiler.wrap_bus(i2c3)
+        clock = profiler.instrument(LMK61E2(bus, 0x5A))
+        with profiler:  # records time.sleep calls while active
+            clock.get_frequency()
+        print(profiler.summary())
+    '''
+
+    def __init__(self, sleep: Optional[Callable[[float], None]] = None):
+        '''
+        Args:
+            sleep (Callable[[float], None], optional): Function performing sleeps while profiling
+                (e.g. a simulated clock). Defaults to time.sleep.
+        '''
+        self.devices: Dict[Tuple[Optional[str], int], ProfileStats] = {}
+        self.methods: Dict[str, ProfileStats] = {}
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        ''' Start recording time.sleep calls (profilers may overlap and stop in any order). '''
+        _SleepHook.add(self)
+
+    def stop(self):
+        ''' Stop recording time.sleep calls. '''
+        _SleepHook.remove(self)
+
+    def reset(self):
+        ''' Clear all stats. '''
+        with self._lock:
+            self.devices.clear()
+            self.methods.clear()
+
+    @property
+    def current_device(self) -> Optional[Tuple[Optional[str], int]]:
+        ''' Device last accessed by the calling thread. '''
+        return getattr(self._local, 'device', None)
+
+    @current_device.setter
+    def current_device(self, device: Tuple[Optional[str], int]):
+        self._local.device = device
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _targets(self, device: Optional[Tuple[Optional[str], int]]) -> List[ProfileStats]:
+        targets = [self.methods.setdefault(label, ProfileStats()) for label in set(self._stack())]
+        if device is not None:
+            targets.append(self.devices.setdefault(device, ProfileStats()))
+        return targets
+
+    def record(self, device: Tuple[Optional[str], int], elapsed: float, reads: int = 0, writes: int = 0,
+               bytes_read: int = 0, bytes_written: int = 0):
+        ''' Record one bus transaction. '''
+        with self._lock:
+            for stats in self._targets(device):
+                stats.transactions += 1
+                stats.reads += reads
+                stats.writes += writes
+                stats.bytes_read += bytes_read
+                stats.bytes_written += bytes_written
+                stats.bus_time += elapsed
+
+    def record_sleep(self, seconds: float):
+        ''' Attribute sleep to current device and method. '''
+        with self._lock:
+            for stats in self._targets(self.current_device):
+                stats.sleeps += 1
+                stats.sleep_time += seconds
+
+    def wrap_bus(self, bus: I2CBase) -> ProfiledI2C:
+        ''' Wrap bus so drivers created on it are profiled. '''
+        return ProfiledI2C(bus, self)
+
+    def instrument(self, driver, methods: Optional[Iterable[str]] = None, prefix: Optional[str] = None):
+        '''
+        Attribute bus cost of public driver methods to "<Class>.<method>" labels.
+
+        Args:
+            driver: Driver instance (its bus should be wrapped w/ wrap_bus)
+            methods (Iterable[str], optional): Method names. Defaults to all public methods.
+            prefix (str, optional): Label prefix. Defaults to driver class name.
+
+        Returns:
+            driver
+        '''
+        prefix = prefix or type(driver).__name__
+        if methods is None:
+            methods = [
+                name for name in dir(type(driver))
+                if not name.startswith('_') and callable(getattr(type(driver), name, None))
+                and not isinstance(getattr(type(driver), name), type)
+            ]
+        for name in methods:
+            method = getattr(driver, name)
+            setattr(driver, name, self._wrap(f'{prefix}.{name}', method))
+        return driver
+
+    def _wrap(self, label: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            stack = self._stack()
+            stack.append(label)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                with self._lock:
+                    stats = self.methods.setdefault(label, ProfileStats())
+                    stats.calls += 1
+                    stats.latencies.append(elapsed)
+        profiled.__wrapped_by_profiler__ = True
+        return profiled
+
+    @staticmethod
+    def uninstrument(driver):
+        ''' Remove method instrumentation from driver. '''
+        for name, value in list(vars(driver).items()):
+            if getattr(value, '__wrapped_by_profiler__', False):
+                delattr(driver, name)
+        return driver
+
+    def histogram(self, label: str) -> List[Tuple[float, int]]:
+        '''
+        Latency histogram of an instrumented method w/ power of two buckets.
+
+        Returns:
+            List[Tuple[float, int]]: (bucket upper bound in µs, count)
+        '''
+        latencies = self.methods[label].latencies if label in self.methods else []
+        counts: Dict[int, int] = {}
+        for latency in latencies:
+            bucket = max(0, math.ceil(math.log2(max(latency * 1e6, 1.0))))
+            counts[bucket] = counts.get(bucket, 0) + 1
+        if not counts:
+            return []
+        return [(float(2 ** b), counts.get(b, 0)) for b in range(min(counts), max(counts) + 1)]
+
+    def format_histogram(self, label: str, width: int = 40) -> str:
+        ''' Render latency histogram as text. '''
+        buckets = self.histogram(label)
+        peak = max((count for _, count in buckets), default=0)
+        lines = [label]
+        for bound, count in buckets:
+            bars = '#' * (round(width * count / peak) if peak else 0)
+            lines.append(f'  <= {bound:>10.0f} us | {count:>6} {bars}')
+        return '\n'.join(lines)
+
+    def as_dict(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        ''' Export stats (e.g. to JSON for CI comparisons). '''
+        return {
+            'devices': {f'{path}@0x{address:02X}': s.as_dict() for (path, address), s in self.devices.items()},
+            'methods': {label: s.as_dict() for label, s in self.methods.items()},
+        }
+
+    def summary(self) -> str:
+        ''' Render per device and per method stats as a text table. '''
+        header = (f'{"name":<40} {"calls":>6} {"txns":>6} {"reads":>6} {"writes":>6} {"rd B":>7} {"wr B":>7} '
+                  f'{"bus ms":>9} {"sleep ms":>9} {"p50 ms":>8} {"max ms":>8}')
+        rows = [header, '-' * len(header)]
+        entries = [(f'{path}@0x{address:02X}', s) for (path, address), s in sorted(
+            self.devices.items(), key=lambda item: (str(item[0][0]), item[0][1]))]
+        entries += sorted(self.methods.items())
+        for name, s in entries:
+            latencies = sorted(s.latencies)
+            p50 = latencies[len(latencies) // 2] * 1e3 if latencies else 0.0
+            peak = latencies[-1] * 1e3 if latencies else 0.0
+            rows.append(f'{name:<40} {s.calls:>6} {s.transactions:>6} {s.reads:>6} {s.writes:>6} '
+                        f'{s.bytes_read:>7} {s.bytes_written:>7} {s.bus_time * 1e3:>9.3f} '
+                        f'{s.sleep_time * 1e3:>9.3f} {p50:>8.3f} {peak:>8.3f}')
+        return '\n'.join(rows)
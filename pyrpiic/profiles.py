@@ -0,0 +1,249 @@
+'''
+Declarative device configuration profiles compiled into precomputed register writes.
+
+A profile names a driver and its target settings, e.g.:
+
+    {"device": "LMK61E2", "address": 90, "settings": {"frequency": 100e6}}
+
+Compiling runs the driver's compile_profile() once and yields the ordered register writes
+(consecutive registers merged into sequential writes). Compiled profiles are cached on disk by
+profile content, package version and driver sources, and applied w/ one combined transfer w/o
+Python-side computation. Drivers may declare PROFILE_MASKS (register -> bits owned by the profile)
+for shared control registers; those are read in one extra combined transfer at apply time and only
+the masked bits are changed.
+'''
+import functools
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+from pyrpio.i2c.types import I2CBase
+from pyrpiic import __version__
+from pyrpiic.batch import RegisterBatch
+from pyrpiic.registers import contiguous_runs
+from pyrpiic.snapshot import changed_runs
+
+PROFILE_FORMAT_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'pyrpiic', 'profiles'
+)
+
+# Drivers accepted as profile device -> dotted path (imported on first compile)
+PROFILE_DRIVERS: Dict[str, str] = {
+    'LDC141X': 'pyrpiic.sensor.ldc141x.LDC141X',
+    'LDC161X': 'pyrpiic.sensor.ldc161x.LDC161X',
+    'LMK61E2': 'pyrpiic.clock.lmk61e2.LMK61E2',
+    'SI570': 'pyrpiic.clock.si570.SI570',
+    'PCA9555': 'pyrpiic.ioexpander.pca9555.PCA9555',
+    'PCA9698': 'pyrpiic.ioexpander.pca9698.PCA9698',
+    'TCA6416A': 'pyrpiic.ioexpander.tca6416a.TCA6416A',
+    'TCA9535': 'pyrpiic.ioexpander.tca9535.TCA9535',
+}
+
+# (register or command byte, values) of one single or sequential write
+RegisterWrite = Tuple[int, List[int]]
+
+
+@dataclass
+class CompiledProfile:
+    '''
+    Ordered register writes of a profile.
+
+    Args:
+        device (str): Driver class name
+        address (int, optional): Default I2C address (from profile)
+        data_size (int): Register size in bytes
+        writes (List[RegisterWrite]): (register, values) in apply order. Registers include
+            command bits (e.g. auto-increment) of sequential writes.
+        key (str): Profile content hash the plan was compiled from
+        masks (Dict[int, int], optional): register -> bits written by the profile. Other bits of
+            single register writes to these registers are kept (read-modify-write at apply time).
+    '''
+    device: str
+    address: Optional[int]
+    data_size: int
+    writes: List[RegisterWrite]
+    key: str = ''
+    masks: Dict[int, int] = field(default_factory=dict)
+    _payloads: Optional[List[bytes]] = field(default=None, init=False, repr=False, compare=False)
+
+    def payloads(self) -> List[bytes]:
+        ''' Packed write payloads (computed once). '''
+        if self._payloads is None:
+            packer = RegisterBatch(None, 0, data_size=self.data_size)
+            self._payloads = [packer.pack_write(register, values) for register, values in self.writes]
+        return self._payloads
+
+    def apply(self, bus: I2CBase, address: Optional[int] = None) -> int:
+        '''
+        Write profile to device w/ one combined transfer (plus one combined read of masked registers).
+
+        Args:
+            bus (I2CBase): I2C bus of device
+            address (int, optional): I2C address. Defaults to address of profile.
+
+        Returns:
+            int: number of bus transactions used
+        '''
+        address = self.address if address is None else address
+        if address is None:
+            raise ValueError(f'No address given for {self.device} profile')
+        transactions = 0
+        current: Dict[int, int] = {}
+        if self.masks:
+            batch = RegisterBatch(bus, address, data_size=self.data_size)
+            reads = {register: batch.read_register(register) for register in sorted(self.masks)}
+            transactions += batch.submit()
+            current = {register: read.result() for register, read in reads.items()}
+        batch = RegisterBatch(bus, address, data_size=self.data_size)
+        for (register, values), payload in zip(self.writes, self.payloads()):
+            if register in current and len(values) == 1:
+                mask = self.masks[register]
+                payload = batch.pack_write(register, [(current[register] & ~mask) | (values[0] & mask)])
+            batch.write_bytes(payload)
+        return transactions + batch.submit()
+
+    def to_dict(self) -> Dict[str, object]:
+        ''' JSON-serializable form. '''
+        return {
+            'version': PROFILE_FORMAT_VERSION, 'device': self.device, 'address': self.address,
+            'data_size': self.data_size, 'writes': [[r, list(v)] for r, v in self.writes], 'key': self.key,
+            'masks': [[r, m] for r, m in sorted(self.masks.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> 'CompiledProfile':
+        ''' Inverse of to_dict(). '''
+        if data.get('version') != PROFILE_FORMAT_VERSION:
+            raise ValueError('Unsupported compiled profile version')
+        return cls(
+            device=data['device'], address=data['address'], data_size=data['data_size'],
+            writes=[(r, list(v)) for r, v in data['writes']], key=data.get('key', ''),
+            masks={r: m for r, m in data.get('masks', [])},
+        )
+
+
+def load_profile(path: str) -> Dict[str, object]:
+    ''' Read profile from JSON file. '''
+    with open(path, 'r', encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def profile_key(profile: Dict[str, object]) -> str:
+    '''
+    Hash of profile content, compiled format and package version and the driver sources, so
+    cached plans are recompiled when an upgrade (or local edit) changes how drivers encode settings.
+    '''
+    text = json.dumps([PROFILE_FORMAT_VERSION, __version__, driver_digest(profile['device']), profile], sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def driver_digest(device: str) -> str:
+    ''' Hash of the sources of the driver package of profile device name (w/o importing it). '''
+    try:
+        module = PROFILE_DRIVERS[device].rsplit('.', 1)[0]
+    except KeyError:
+        raise ValueError(f'Profiles are not supported for device {device!r}') from None
+    directory = os.path.dirname(importlib.util.find_spec(module).origin)
+    digest = hashlib.sha1()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py'):
+            with open(os.path.join(directory, name), 'rb') as fp:
+                digest.update(fp.read())
+    return digest.hexdigest()
+
+
+def profile_driver(device: str) -> type:
+    ''' Driver class of profile device name. '''
+    try:
+        module, name = PROFILE_DRIVERS[device].rsplit('.', 1)
+    except KeyError:
+        raise ValueError(f'Profiles are not supported for device {device!r}') from None
+    return getattr(importlib.import_module(module), name)
+
+
+def _cache_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, f'{key}.json')
+
+
+def load_compiled(key: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[CompiledProfile]:
+    ''' Cached compiled profile of key (None if missing or corrupt). '''
+    try:
+        with open(_cache_path(cache_dir, key), 'r', encoding='utf-8') as fp:
+            compiled = CompiledProfile.from_dict(json.load(fp))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return compiled if compiled.key == key else None
+
+
+def save_compiled(compiled: CompiledProfile, cache_dir: str = DEFAULT_CACHE_DIR):
+    ''' Store compiled profile under its key (atomic replace). '''
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_dir, compiled.key)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fp:
+        json.dump(compiled.to_dict(), fp)
+    os.replace(tmp_path, path)
+
+
+def compile_profile(profile: Union[str, Dict[str, object]],
+                    cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> CompiledProfile:
+    '''
+    Compile profile into ordered register writes.
+
+    Args:
+        profile (Union[str, Dict[str, object]]): Profile dict or path of JSON profile w/ keys
+            device (driver class name, see PROFILE_DRIVERS), settings and optional address
+        cache_dir (str, optional): Compiled profile cache (None disables cache). Defaults to ~/.cache/pyrpiic/profiles.
+
+    Returns:
+        CompiledProfile: ordered register writes
+    '''
+    if isinstance(profile, (str, os.PathLike)):
+        profile = load_profile(profile)
+    key = profile_key(profile)
+    if cache_dir is not None:
+        compiled = load_compiled(key, cache_dir)
+        if compiled is not None:
+            return compiled
+    driver = profile_driver(profile['device'])
+    data_size, writes = driver.compile_profile(profile.get('settings', {}))
+    masks = dict(getattr(driver, 'PROFILE_MASKS', {}))
+    compiled = CompiledProfile(profile['device'], profile.get('address'), data_size, writes, key=key, masks=masks)
+    if cache_dir is not None:
+        save_compiled(compiled, cache_dir)
+    return compiled
+
+
+def apply_profile(bus: I2CBase, profile: Union[str, Dict[str, object], CompiledProfile],
+                  address: Optional[int] = None, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> int:
+    ''' Compile (or load cached) profile and write it to device. Returns number of bus transactions used. '''
+    if not isinstance(profile, CompiledProfile):
+        profile = compile_profile(profile, cache_dir=cache_dir)
+    return profile.apply(bus, address=address)
+
+
+def merge_writes(values: Dict[int, int], command: int = 0x00,
+                 blocks: Optional[List[Tuple[int, int]]] = None) -> List[RegisterWrite]:
+    '''
+    Merge register values into writes of consecutive registers.
+
+    Args:
+        values (Dict[int, int]): register -> value
+        command (int, optional): Bits OR'ed into register of sequential writes. Defaults to 0x00.
+        blocks (List[Tuple[int, int]], optional): (first register, count) ranges sequential writes
+            must not cross. Defaults to no limit.
+    '''
+    runs = contiguous_runs(values) if blocks is None else changed_runs(blocks, {}, values)
+    return [(start | command if len(run) > 1 else start, run) for start, run in runs]
+
+
+def check_settings(settings: Dict[str, object], allowed: Tuple[str, ...]):
+    ''' Raise ValueError for settings not in allowed. '''
+    unknown = sorted(set(settings) - set(allowed))
+    if unknown:
+        raise ValueError(f'Unknown profile settings: {", ".join(unknown)} (expected {", ".join(allowed)})')
@@ -0,0 +1,74 @@
+''' Register shadowing and grouping helpers shared by drivers. '''
+from typing import Callable, Dict, List, Mapping, Tuple
+
+
+def contiguous_runs(values: Mapping[int, int]) -> List[Tuple[int, List[int]]]:
+    '''
+    Group register values into runs of consecutive register addresses.
+
+    Args:
+        values (Mapping[int, int]): register address to value
+
+    Returns:
+        List[Tuple[int, List[int]]]: (start register, values) per run in ascending order
+    '''
+    runs: List[Tuple[int, List[int]]] = []
+    for register in sorted(values):
+        if runs and runs[-1][0] + len(runs[-1][1]) == register:
+            runs[-1][1].append(values[register])
+        else:
+            runs.append((register, [values[register]]))
+    return runs
+
+
+class RegisterShadow:
+    '''
+    Cache of device register values that records writes instead of issuing them.
+    Registers are read from the device at most once; changes() yields the registers whose
+    value differs from the device so the owner can write them back (e.g. in one combined transfer).
+    '''
+
+    def __init__(self, read: Callable[[int], int]):
+        '''
+        Args:
+            read (Callable[[int], int]): reads a single register from device
+        '''
+        self._read = read
+        self._values: Dict[int, int] = {}
+        self._device: Dict[int, int] = {}
+        self._dirty: Dict[int, int] = {}
+
+    def preload(self, values: Mapping[int, int]):
+        ''' Seed cache with values already read from device (e.g. via sequential read). '''
+        for register, value in values.items():
+            self._device.setdefault(register, value)
+            self._values.setdefault(register, value)
+
+    def get(self, register: int) -> int:
+        ''' Get shadowed register value. '''
+        value = self._values.get(register)
+        if value is None:
+            value = self._values[register] = self._device[register] = self._read(register)
+        return value
+
+    def set(self, register: int, value: int):
+        ''' Record register write. Writes of unchanged values are dropped from changes(). '''
+        self._values[register] = value
+        self._dirty[register] = value
+
+    def device_value(self, register: int) -> int:
+        ''' Register value on the device (read once if not known yet). '''
+        value = self._device.get(register)
+        if value is None:
+            value = self._device[register] = self._read(register)
+            self._values.setdefault(register, value)
+        return value
+
+    @property
+    def dirty(self) -> Dict[int, int]:
+        ''' Registers written. '''
+        return dict(self._dirty)
+
+    def changes(self) -> Dict[int, int]:
+        ''' Registers written whose value differs from the device. '''
+        return {r: v for r, v in self._dirty.items() if self._device.get(r) != v}
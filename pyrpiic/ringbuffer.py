@@ -0,0 +1,80 @@
+''' Preallocated ring buffer for timestamped sensor samples. '''
+import threading
+from typing import Dict, Optional
+import numpy as np
+
+
+class RingBuffer:
+    '''
+    Single-writer ring buffer of numpy records. Every record is stored twice (at i and i + capacity)
+    so the latest N records are always one contiguous slice and can be returned as a view
+    without copying.
+
+    NOTE: Views alias the live buffer. A view of N records stays valid until the writer
+    appends another capacity - N records; copy it if it must be kept longer.
+    '''
+
+    def __init__(self, capacity: int, dtype):
+        '''
+        Args:
+            capacity (int): Number of records retained
+            dtype: numpy dtype of a record (e.g. [('timestamp', 'f8'), ('value', 'u4', (4,))])
+        '''
+        if capacity <= 0:
+            raise ValueError('Capacity must be > 0')
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(2 * capacity, dtype=self.dtype)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def count(self) -> int:
+        ''' Total number of records appended. '''
+        return self._count
+
+    def append(self, record):
+        ''' Append record given as tuple of field values (or numpy void). '''
+        index = self._count % self.capacity
+        self._data[index] = record
+        self._data[index + self.capacity] = record
+        with self._lock:
+            self._count += 1
+
+    def clear(self):
+        ''' Drop all records. '''
+        with self._lock:
+            self._count = 0
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        '''
+        Get view of latest records (oldest first).
+
+        Args:
+            n (int, optional): Number of records. Defaults to all retained records.
+
+        Returns:
+            np.ndarray: view of at most n records
+        '''
+        with self._lock:
+            count = self._count
+        available = min(count, self.capacity)
+        n = available if n is None else max(0, min(n, available))
+        end = count % self.capacity + self.capacity
+        return self._data[end - n:end]
+
+    def statistics(self, field: str, n: Optional[int] = None) -> Dict[str, float]:
+        ''' Rolling mean, std, min and max of a field over latest n records. '''
+        values = self.latest(n)[field]
+        if values.size == 0:
+            return {'count': 0, 'mean': float('nan'), 'std': float('nan'), 'min': float('nan'), 'max': float('nan')}
+        return {
+            'count': int(values.shape[0]),
+            'mean': float(np.mean(values)),
+            'std': float(np.std(values)),
+            'min': float(np.min(values)),
+            'max': float(np.max(values)),
+        }
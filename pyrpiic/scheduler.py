@@ -0,0 +1,138 @@
+''' Cooperative deadline scheduler overlapping device waits on a bus. '''
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+from .steps import Steps, advance
+
+T = TypeVar('T')
+
+
+@dataclass
+class SchedulerStats:
+    ''' Bus time accounting of one StepScheduler.run(). '''
+    tasks: int = 0
+    steps: int = 0
+    busy_time: float = 0.0
+    idle_time: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        ''' Fraction of elapsed time spent running steps (bus I/O). '''
+        return self.busy_time / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        ''' Export stats. '''
+        return {**self.__dict__, 'utilization': self.utilization}
+
+
+class ScheduledTask(Generic[T]):
+    ''' Future-like handle of steps submitted to a StepScheduler. '''
+
+    def __init__(self, steps: Steps[T], name: str):
+        self.steps = steps
+        self.name = name
+        self.deadline = 0.0
+        self.value: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.finished = False
+
+    def done(self) -> bool:
+        ''' Steps ran to completion (successfully or not). '''
+        return self.finished
+
+    def result(self) -> T:
+        ''' Return value of steps (raises their exception). '''
+        if self.error is not None:
+            raise self.error
+        if not self.finished:
+            raise RuntimeError(f'Task {self.name} is pending until scheduler is run')
+        return self.value
+
+    def __repr__(self):
+        return f'ScheduledTask({self.name!r}, done={self.finished})'
+
+
+class StepScheduler:
+    '''
+    Runs driver steps (see pyrpiic.steps) of many devices on one bus from a single thread.
+    A step yielding a delay is resumed not before now + delay; meanwhile steps of other
+    devices whose deadlines passed are run, so conversions, page writes and NVM programming
+    of all devices overlap instead of serializing. Steps are run in deadline order (FIFO on
+    ties). Use one scheduler (and thread) per bus to drive several buses.
+
+    Example:
+        scheduler = StepScheduler()
+        writes = [scheduler.submit(eeprom.write_sequential_bytes_steps(0, image)) for eeprom in eeproms]
+        reading = scheduler.submit(sensor.read_temperature_humidity_steps())
+        stats = scheduler.run()
+        print(reading.result(), stats.utilization)
+    '''
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, sleep: Optional[Callable[[float], None]] = None):
+        '''
+        Args:
+            clock (Callable[[], float], optional): Time source (s). Defaults to time.monotonic.
+            sleep (Callable[[float], None], optional): Idle wait. Defaults to time.sleep (looked up when idle).
+        '''
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = SchedulerStats()
+        self._queue: List[Tuple[float, int, ScheduledTask]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, steps: Steps[T], name: Optional[str] = None, delay: float = 0.0) -> ScheduledTask[T]:
+        ''' Queue steps to start not before now + delay. '''
+        task = ScheduledTask(steps, name or getattr(steps, '__qualname__', 'task'))
+        self._push(task, self.clock() + delay)
+        return task
+
+    def _push(self, task: ScheduledTask, deadline: float):
+        task.deadline = deadline
+        heapq.heappush(self._queue, (deadline, next(self._counter), task))
+
+    def _idle(self, seconds: float):
+        (self.sleep or time.sleep)(seconds)
+
+    def run_once(self) -> Optional[ScheduledTask]:
+        ''' Wait for earliest deadline and run that task's next step. Returns task (None if queue empty). '''
+        if not self._queue:
+            return None
+        deadline, _, task = heapq.heappop(self._queue)
+        now = self.clock()
+        if deadline > now:
+            self._idle(deadline - now)
+            self.stats.idle_time += self.clock() - now
+            now = self.clock()
+        try:
+            done, value = advance(task.steps)
+        except Exception as err:  # pylint: disable=broad-except
+            done, value, task.error = True, None, err
+        end = self.clock()
+        self.stats.busy_time += end - now
+        self.stats.steps += 1
+        if done:
+            task.value, task.finished = value, True
+            self.stats.tasks += 1
+        else:
+            self._push(task, end + value)
+        return task
+
+    def run(self) -> SchedulerStats:
+        ''' Run queued tasks (and tasks they submit) to completion. Returns accumulated stats. '''
+        start = self.clock()
+        try:
+            while self._queue:
+                self.run_once()
+        finally:
+            self.stats.elapsed += self.clock() - start
+        return self.stats
+
+    def reset_stats(self):
+        ''' Clear stats. '''
+        self.stats = SchedulerStats()
@@ -1,8 +1,11 @@
 import array
 import time
 from enum import Enum
+from typing import Dict, Optional, Tuple
 from pyrpio.i2c_register_device import I2CRegisterDevice
 from pyrpio.i2c import I2C
+from pyrpiic.snapshot import RegisterSnapshot, check_snapshot
+from pyrpiic.steps import Steps, run_steps
 
 
 # I2C Address
@@ -34,6 +37,13 @@ HDC1080_CONFIG_HUMIDITY_RESOLUTION_14BIT = (0x0000)
 HDC1080_CONFIG_HUMIDITY_RESOLUTION_11BIT = (0x0100)
 HDC1080_CONFIG_HUMIDITY_RESOLUTION_8BIT = (0x0200)
 
+# Conversion times (seconds)
+HDC1080_TEMPERATURE_CONVERSION_14BIT = 6.35e-3
+HDC1080_TEMPERATURE_CONVERSION_11BIT = 3.65e-3
+HDC1080_HUMIDITY_CONVERSION_14BIT = 6.5e-3
+HDC1080_HUMIDITY_CONVERSION_11BIT = 3.85e-3
+HDC1080_HUMIDITY_CONVERSION_8BIT = 2.5e-3
+
 
 class HDC1080:
     class TempResolution(Enum):
@@ -44,111 +54,206 @@ class HDC1080:
         fourteen = 0
         eleven = 1
         eight = 2
+    TEMPERATURE_CONFIG = {
+        TempResolution.fourteen: HDC1080_CONFIG_TEMPERATURE_RESOLUTION_14BIT,
+        TempResolution.eleven: HDC1080_CONFIG_TEMPERATURE_RESOLUTION_11BIT,
+    }
+    HUMIDITY_CONFIG = {
+        HumidityResolution.fourteen: HDC1080_CONFIG_HUMIDITY_RESOLUTION_14BIT,
+        HumidityResolution.eleven: HDC1080_CONFIG_HUMIDITY_RESOLUTION_11BIT,
+        HumidityResolution.eight: HDC1080_CONFIG_HUMIDITY_RESOLUTION_8BIT,
+    }
+    TEMPERATURE_CONVERSION_TIME = {
+        TempResolution.fourteen: HDC1080_TEMPERATURE_CONVERSION_14BIT,
+        TempResolution.eleven: HDC1080_TEMPERATURE_CONVERSION_11BIT,
+    }
+    HUMIDITY_CONVERSION_TIME = {
+        HumidityResolution.fourteen: HDC1080_HUMIDITY_CONVERSION_14BIT,
+        HumidityResolution.eleven: HDC1080_HUMIDITY_CONVERSION_11BIT,
+        HumidityResolution.eight: HDC1080_HUMIDITY_CONVERSION_8BIT,
+    }
     i2c: I2C
     i2c_reg: I2CRegisterDevice
     address: int
-
-    def __init__(self, bus: I2C, address=HDC1080_ADDRESS):
+    temperature_resolution: TempResolution
+    humidity_resolution: HumidityResolution
+    acquisition_mode: bool
+
+    def __init__(self, bus: I2C, address=HDC1080_ADDRESS, poll_ready: bool = False,
+                 conversion_margin: float = 0.001, poll_interval: float = 0.0005):
+        '''
+        Args:
+            bus (I2C): I2C bus of the sensor
+            address (int, optional): I2C address of the sensor. Defaults to 0x40.
+            poll_ready (bool, optional): Poll until conversion read is ACKed instead of
+                sleeping for the conversion time. Defaults to False.
+            conversion_margin (float, optional): Extra wait added to datasheet conversion
+                time (s). Defaults to 1 ms.
+            poll_interval (float, optional): Delay between NACKed reads when polling (s).
+                Defaults to 0.5 ms.
+        '''
         self.address = address
         self.i2c = bus
         self.i2c_reg = I2CRegisterDevice(
             bus, address, register_size=1, data_size=2)
+        self.poll_ready = poll_ready
+        self.conversion_margin = conversion_margin
+        self.poll_interval = poll_interval
+        # Power-on default configuration
+        self.temperature_resolution = HDC1080.TempResolution.fourteen
+        self.humidity_resolution = HDC1080.HumidityResolution.fourteen
+        self.acquisition_mode = True
+        self._config: Optional[int] = None
+        self._manufacturer_id: Optional[int] = None
+        self._device_id: Optional[int] = None
+        self._serial_number: Optional[int] = None
         time.sleep(0.015)  # 15ms startup time
 
     def configure(self):
         """ configure for acquisition mode """
+        return run_steps(self.configure_steps())
+
+    def configure_steps(self) -> Steps[None]:
+        ''' configure() as steps (see pyrpiic.steps) '''
         config = HDC1080_CONFIG_ACQUISITION_MODE
         self.i2c.set_address(self.address)
         self.i2c_reg.write_register_bytes(HDC1080_CONFIGURATION_REGISTER,
                                           bytes(bytearray([config >> 8, 0x00])))
-        time.sleep(0.015)
+        self._config = config
+        self.temperature_resolution = HDC1080.TempResolution.fourteen
+        self.humidity_resolution = HDC1080.HumidityResolution.fourteen
+        self.acquisition_mode = True
+        yield 0.015
+
+    def temperature_conversion_time(self) -> float:
+        ''' temperature conversion time (s) at configured resolution '''
+        return self.TEMPERATURE_CONVERSION_TIME[self.temperature_resolution]
+
+    def humidity_conversion_time(self) -> float:
+        ''' humidity conversion time (s) at configured resolution '''
+        return self.HUMIDITY_CONVERSION_TIME[self.humidity_resolution]
+
+    def _read_conversion(self, length: int, conversion_time: float) -> Steps[bytes]:
+        ''' wait for triggered conversion then read result bytes '''
+        if not self.poll_ready:
+            yield conversion_time + self.conversion_margin
+            self.i2c.set_address(self.address)  # bus may be used by others while waiting
+            return self.i2c.read(length)
+        # Device NACKs reads until conversion completes
+        deadline = time.monotonic() + 2 * conversion_time + self.conversion_margin
+        while True:
+            try:
+                self.i2c.set_address(self.address)
+                return self.i2c.read(length)
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                yield self.poll_interval
 
     def read_temperature(self) -> float:
         ''' read temperature and return a float '''
+        return run_steps(self.read_temperature_steps())
+
+    def read_temperature_steps(self) -> Steps[float]:
+        ''' read_temperature() as steps (see pyrpiic.steps) '''
         s = bytes(bytearray([HDC1080_TEMPERATURE_REGISTER]))
         self.i2c.set_address(self.address)
         self.i2c.write(s)
-        time.sleep(0.0625)              # Required delay
+        conversion_time = self.temperature_conversion_time()
+        if self.acquisition_mode:
+            conversion_time += self.humidity_conversion_time()  # both are converted in acquisition mode
 
-        self.i2c.set_address(self.address)
-        data = self.i2c.read(2)  # read 2 byte temperature data
+        data = yield from self._read_conversion(2, conversion_time)  # read 2 byte temperature data
         buf = array.array('B', data)
         #print ( "Temp: %f 0x%X %X" % (  ((((buf[0]<<8) + (buf[1]))/65536.0)*165.0 ) - 40.0   ,buf[0],buf[1] )  )
 
         # Convert the data
-        temp = (buf[0] * 256) + buf[1]
-        cTemp = (temp / 65536.0) * 165.0 - 40
-        return cTemp
+        return self.raw2temperature((buf[0] * 256) + buf[1])
 
     def read_humidity(self) -> float:
         ''' read humidity and return a float '''
-        time.sleep(0.015)               # Required delay
+        return run_steps(self.read_humidity_steps())
+
+    def read_humidity_steps(self) -> Steps[float]:
+        ''' read_humidity() as steps (see pyrpiic.steps) '''
         s = bytes(bytearray([HDC1080_HUMIDITY_REGISTER]))
         self.i2c.set_address(self.address)
         self.i2c.write(s)
-        time.sleep(0.0625)              # Required delay
 
-        data = self.i2c.read(2)  # read 2 byte humidity data
+        data = yield from self._read_conversion(2, self.humidity_conversion_time())  # read 2 byte humidity data
         buf = array.array('B', data)
         #print ( "Humidity: %f 0x%X %X " % (  ((((buf[0]<<8) + (buf[1]))/65536.0)*100.0 ),  buf[0], buf[1] ) )
-        humidity = (buf[0] * 256) + buf[1]
-        humidity = (humidity / 65536.0) * 100.0
-        return humidity
+        return self.raw2humidity((buf[0] * 256) + buf[1])
 
-    def read_config_register(self) -> int:
-        ''' read configuration register and return integer value '''
-        s = bytes(bytearray([HDC1080_CONFIGURATION_REGISTER]))
-        self.i2c.set_address(self.address)
-        self.i2c.write(s)
-        time.sleep(0.0625)              # Required delay
+    def read_temperature_humidity(self) -> Tuple[float, float]:
+        ''' read temperature and humidity from a single acquisition and return floats (requires configure()) '''
+        return run_steps(self.read_temperature_humidity_steps())
 
-        data = self.i2c.read(2)  # read 2 byte config data
+    def read_temperature_humidity_steps(self) -> Steps[Tuple[float, float]]:
+        ''' read_temperature_humidity() as steps (see pyrpiic.steps) '''
+        s = bytes(bytearray([HDC1080_TEMPERATURE_REGISTER]))
+        self.i2c.set_address(self.address)
+        self.i2c.write(s)  # triggers temperature followed by humidity conversion
+        conversion_time = self.temperature_conversion_time() + self.humidity_conversion_time()
 
+        data = yield from self._read_conversion(4, conversion_time)  # read 2 byte temperature then 2 byte humidity data
         buf = array.array('B', data)
+        return self.raw2temperature((buf[0] * 256) + buf[1]), self.raw2humidity((buf[2] * 256) + buf[3])
 
-        # print("register={} {}".format(buf[0], buf[1]))
-        return buf[0]*256+buf[1]
+    @staticmethod
+    def raw2temperature(raw: int) -> float:
+        ''' convert raw temperature register value to degrees Celsius '''
+        return (raw / 65536.0) * 165.0 - 40
 
-    def turn_heater_on(self):
-        ''' turn heater on '''
-        config = self.read_config_register()
-        config = config | HDC1080_CONFIG_HEATER_ENABLE
+    @staticmethod
+    def raw2humidity(raw: int) -> float:
+        ''' convert raw humidity register value to %RH '''
+        return (raw / 65536.0) * 100.0
+
+    def read_register(self, register: int) -> int:
+        ''' read non-measurement register (no conversion delay needed) and return integer value '''
+        self.i2c.set_address(self.address)
+        data = self.i2c.read_write(bytes(bytearray([register])), 2)  # read 2 byte register data
+        buf = array.array('B', data)
+        return buf[0] * 256 + buf[1]
+
+    def read_config_register(self) -> int:
+        ''' read configuration register and return integer value (refreshes shadowed config) '''
+        config = self.read_register(HDC1080_CONFIGURATION_REGISTER)
+        self._config = config & ~(HDC1080_CONFIG_RESET_BIT | HDC1080_CONFIG_BATTERY_STATUS)
+        return config
+
+    def _get_config(self) -> int:
+        ''' shadowed configuration register (read from device only once) '''
+        if self._config is None:
+            self.read_config_register()
+        return self._config
+
+    def _write_config(self, config: int):
+        ''' write configuration register and update shadow '''
         s = [HDC1080_CONFIGURATION_REGISTER, config >> 8, 0x00]
         s2 = bytes(bytearray(s))
         self.i2c.set_address(self.address)
         self.i2c.write(s2)  # sending config register bytes
-        time.sleep(0.015)               # Required delay
+        self._config = config & ~(HDC1080_CONFIG_RESET_BIT | HDC1080_CONFIG_BATTERY_STATUS) & 0xFF00
+
+    def turn_heater_on(self):
+        ''' turn heater on '''
+        self._write_config(self._get_config() | HDC1080_CONFIG_HEATER_ENABLE)
 
     def turn_heater_off(self):
         ''' turn heater off '''
-        config = self.read_config_register()
-        config = config & ~HDC1080_CONFIG_HEATER_ENABLE
-        s = [HDC1080_CONFIGURATION_REGISTER, config >> 8, 0x00]
-        s2 = bytes(bytearray(s))
-        self.i2c.set_address(self.address)
-        self.i2c.write(s2)  # sending config register bytes
-        time.sleep(0.015)               # Required delay
+        self._write_config(self._get_config() & ~HDC1080_CONFIG_HEATER_ENABLE)
 
     def set_humidity_resolution(self, resolution: HumidityResolution):
         ''' set humidity resolution [0 - 14bit, 1 - 11bit, 2 - 8bit ] '''
-        config = self.read_config_register()
-        config = (config & ~0x0300) | resolution.value
-        s = [HDC1080_CONFIGURATION_REGISTER, config >> 8, 0x00]
-        s2 = bytes(bytearray(s))
-        self.i2c.set_address(self.address)
-        self.i2c.write(s2)  # sending config register bytes
-        time.sleep(0.015)               # Required delay
+        self._write_config((self._get_config() & ~0x0300) | self.HUMIDITY_CONFIG[resolution])
+        self.humidity_resolution = resolution
 
     def set_temperature_resolution(self, resolution: TempResolution):
         ''' set temperature resolution [0 - 14bit, 1 - 11bit ] '''
-        config = self.read_config_register()
-        config = (config & ~0x0400) | resolution.value
-
-        s = [HDC1080_CONFIGURATION_REGISTER, config >> 8, 0x00]
-        s2 = bytes(bytearray(s))
-        self.i2c.set_address(self.address)
-        self.i2c.write(s2)  # sending config register bytes
-        time.sleep(0.015)               # Required delay
+        self._write_config((self._get_config() & ~0x0400) | self.TEMPERATURE_CONFIG[resolution])
+        self.temperature_resolution = resolution
 
     def read_battery_status(self) -> bool:
         ''' get battery status (bool) '''
@@ -158,58 +263,51 @@ class HDC1080:
         return bool(config == 0)
 
     def read_manufacturer_id(self) -> int:
-        ''' get manufacturuer id (int) '''
-        s = [HDC1080_MANUFACTURERID_REGISTER]  # temp
-        s2 = bytes(bytearray(s))
-        self.i2c.set_address(self.address)
-        self.i2c.write(s2)
-        time.sleep(0.0625)              # Required delay
-
-        data = self.i2c.read(2)  # read 2 byte config data
-
-        buf = array.array('B', data)
-        return buf[0] * 256 + buf[1]
+        ''' get manufacturuer id (int), cached after first read '''
+        if self._manufacturer_id is None:
+            self._manufacturer_id = self.read_register(HDC1080_MANUFACTURERID_REGISTER)
+        return self._manufacturer_id
 
     def read_device_id(self) -> int:
-        ''' get device id (int) '''
-        s = [HDC1080_DEVICEID_REGISTER]  # temp
-        s2 = bytes(bytearray(s))
-        self.i2c.set_address(self.address)
-        self.i2c.write(s2)
-        time.sleep(0.0625)              # Required delay
-
-        data = self.i2c.read(2)  # read 2 byte config data
-
-        buf = array.array('B', data)
-        return buf[0] * 256 + buf[1]
+        ''' get device id (int), cached after first read '''
+        if self._device_id is None:
+            self._device_id = self.read_register(HDC1080_DEVICEID_REGISTER)
+        return self._device_id
 
     def read_serial_number(self) -> int:
-        ''' get device serial number (int) '''
-        serialNumber = 0
-
-        s = [HDC1080_SERIALIDHIGH_REGISTER]  # temp
-        s2 = bytes(bytearray(s))
-        self.i2c.set_address(self.address)
-        self.i2c.write(s2)
-        time.sleep(0.0625)              # Required delay
-        data = self.i2c.read(2)  # read 2 byte config data
-        buf = array.array('B', data)
-        serialNumber = buf[0]*256 + buf[1]
-
-        s = [HDC1080_SERIALIDMID_REGISTER]  # temp
-        s2 = bytes(bytearray(s))
-        self.i2c.write(s2)
-        time.sleep(0.0625)              # Required delay
-        data = self.i2c.read(2)  # read 2 byte config data)
-        buf = array.array('B', data)
-        serialNumber = serialNumber*256 + buf[0]*256 + buf[1]
-
-        s = [HDC1080_SERIALIDBOTTOM_REGISTER]  # temp
-        s2 = bytes(bytearray(s))
-        self.i2c.write(s2)
-        time.sleep(0.0625)              # Required delay
-        data = self.i2c.read(2)  # read 2 byte config data
-        buf = array.array('B', data)
-        serialNumber = serialNumber*256 + buf[0]*256 + buf[1]
-
-        return serialNumber
+        ''' get 41-bit device serial number (int), cached after first read '''
+        if self._serial_number is None:
+            high = self.read_register(HDC1080_SERIALIDHIGH_REGISTER)  # SERIAL_ID[40:25]
+            mid = self.read_register(HDC1080_SERIALIDMID_REGISTER)  # SERIAL_ID[24:9]
+            bottom = self.read_register(HDC1080_SERIALIDBOTTOM_REGISTER)  # SERIAL_ID[8:0] in bits [15:7]
+            self._serial_number = (high << 25) | (mid << 9) | (bottom >> 7)
+        return self._serial_number
+
+    def snapshot(self) -> RegisterSnapshot:
+        ''' Read configuration register (the only writable register) w/o reset and battery status bits. '''
+        self.read_config_register()
+        return RegisterSnapshot(type(self).__name__, self.address, 2, {HDC1080_CONFIGURATION_REGISTER: self._config})
+
+    def restore(self, snapshot: RegisterSnapshot) -> Dict[int, int]:
+        '''
+        Write back configuration register of snapshot if it differs from the device.
+
+        Returns:
+            Dict[int, int]: registers written
+        '''
+        check_snapshot(self, snapshot, ((HDC1080_CONFIGURATION_REGISTER, 1),))
+        config = snapshot.registers.get(HDC1080_CONFIGURATION_REGISTER)
+        if config is None:
+            return {}
+        config &= ~(HDC1080_CONFIG_RESET_BIT | HDC1080_CONFIG_BATTERY_STATUS)
+        self.read_config_register()
+        temperature_bits = config & HDC1080_CONFIG_TEMPERATURE_RESOLUTION
+        humidity_bits = config & (HDC1080_CONFIG_HUMIDITY_RESOLUTION_HBIT | HDC1080_CONFIG_HUMIDITY_RESOLUTION_LBIT)
+        self.temperature_resolution = {b: r for r, b in self.TEMPERATURE_CONFIG.items()}[temperature_bits]
+        self.humidity_resolution = {b: r for r, b in self.HUMIDITY_CONFIG.items()}.get(
+            humidity_bits, self.humidity_resolution)
+        self.acquisition_mode = bool(config & HDC1080_CONFIG_ACQUISITION_MODE)
+        if config == self._config:
+            return {}
+        self._write_config(config)
+        return {HDC1080_CONFIGURATION_REGISTER: config}
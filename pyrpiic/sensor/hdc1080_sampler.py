@@ -0,0 +1,98 @@
+''' Background continuous acquisition for HDC1080. '''
+import threading
+import time
+from typing import Dict, Optional
+import numpy as np
+from pyrpiic.ringbuffer import RingBuffer
+from .hdc1080 import HDC1080
+
+HDC1080_SAMPLE_DTYPE = np.dtype([('timestamp', 'f8'), ('temperature', 'f8'), ('humidity', 'f8')])
+
+
+class HDC1080Sampler:
+    '''
+    Continuously sample an HDC1080 from a worker thread into a preallocated ring buffer so
+    readers never block on conversions.
+
+    Example:
+        with HDC1080Sampler(sensor, rate=10.0) as sampler:
+            ...
+            samples = sampler.latest(50)  # zero-copy view w/ timestamp, temperature, humidity
+            stats = sampler.statistics(50)
+    '''
+
+    def __init__(self, sensor: HDC1080, rate: float = 10.0, capacity: int = 1024):
+        '''
+        Args:
+            sensor (HDC1080): Sensor (configure() is called on start)
+            rate (float, optional): Sample rate (Hz). Defaults to 10.
+            capacity (int, optional): Number of samples retained. Defaults to 1024.
+        '''
+        if rate <= 0:
+            raise ValueError('Sample rate must be > 0')
+        self.sensor = sensor
+        self.rate = rate
+        self.buffer = RingBuffer(capacity, HDC1080_SAMPLE_DTYPE)
+        self.errors = 0
+        self.overruns = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        ''' Worker thread is sampling. '''
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        ''' Configure acquisition mode and start worker thread. '''
+        if self.running:
+            return
+        self.sensor.configure()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f'HDC1080Sampler-0x{self.sensor.address:02X}',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        ''' Stop worker thread. '''
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        period = 1.0 / self.rate
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            timestamp = time.time()
+            try:
+                temperature, humidity = self.sensor.read_temperature_humidity()
+                self.buffer.append((timestamp, temperature, humidity))
+            except OSError:
+                self.errors += 1
+            deadline += period
+            remaining = deadline - time.monotonic()
+            if remaining < 0:
+                # Skip missed slots instead of bursting to catch up
+                self.overruns += 1
+                deadline = time.monotonic()
+                continue
+            self._stop.wait(remaining)
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        ''' Zero-copy view of latest n samples (oldest first). '''
+        return self.buffer.latest(n)
+
+    def statistics(self, n: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        ''' Rolling statistics of temperature and humidity over latest n samples. '''
+        return {
+            'temperature': self.buffer.statistics('temperature', n),
+            'humidity': self.buffer.statistics('humidity', n),
+        }
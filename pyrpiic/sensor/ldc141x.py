@@ -5,6 +5,12 @@ from pyrpiic.sensor.ldc1x1y import LDC1X1Y
 class LDC141X(LDC1X1Y):
     ''' TI 14-bit LDC1412/LDC1414 inductive sensor API. '''
 
+    # Snapshots also cover OUTPUT_GAIN (RESET_DEV bits 10:9); the reset bit is never written
+    SNAPSHOT_BLOCKS = (
+        (LDC1X1Y.LDC1X1Y_REF_COUNT_BASE, 16), (LDC1X1Y.LDC1X1Y_ERROR_CONFIG, 4), (LDC1X1Y.LDC1X1Y_DRIVE_CURRENT_BASE, 4)
+    )
+    SNAPSHOT_MASKS = {LDC1X1Y.LDC1X1Y_RESET_DEV: 0x0600}
+
     def __init__(self, bus, address=0x2A):
         # Manufacturing ID: 0x5449
         # Device ID: 0x3054
@@ -21,10 +27,20 @@ class LDC141X(LDC1X1Y):
                     0x1: Amplitude error bit
         '''
         ch_msb = self.get_register(self.LDC1X1Y_DATA_BASE + 2*ch)
-        value = 0x0FFF & ch_msb
-        err_code = (ch_msb & 0xF000) >> 12
+        return self.decode_channel_data(ch_msb, 0)
+
+    def decode_channel_data(self, msb: int, lsb: int) -> Tuple[int, int]:
+        ''' Decode channel DATA register (LSB register unused) into data and error flags. '''
+        value = 0x0FFF & msb
+        err_code = (msb & 0xF000) >> 12
         return value, err_code
 
+    def get_data_bits(self) -> int:
+        ''' Channel data is 12-bit shifted by output gain:
+            ƒSENSOR = ƒIN_DIV × ƒREF × (DATA ÷ 2^(12 + SHIFT) + OFFSET ÷ 2^16)
+        '''
+        return 12 + {0b00: 0, 0b01: 2, 0b10: 3, 0b11: 4}[self.get_output_gain()]
+
     def get_output_gain(self):
         ''' Get output gain control.
             ---------------------------------------
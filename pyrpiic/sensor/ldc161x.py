@@ -22,6 +22,14 @@ class LDC161X(LDC1X1Y):
         '''
         ch_msb = self.get_register(self.LDC1X1Y_DATA_BASE + 2*ch)
         ch_lsb = self.get_register(self.LDC1X1Y_DATA_BASE + 2*ch + 1)
-        value = ((0x0FFF & ch_msb) << 16) & ch_lsb
-        err_code = (ch_msb & 0xF000) >> 12
+        return self.decode_channel_data(ch_msb, ch_lsb)
+
+    def decode_channel_data(self, msb: int, lsb: int) -> Tuple[int, int]:
+        ''' Decode channel DATA_MSB/DATA_LSB registers into 28-bit data and error flags. '''
+        value = ((0x0FFF & msb) << 16) | lsb
+        err_code = (msb & 0xF000) >> 12
         return value, err_code
+
+    def get_data_bits(self) -> int:
+        ''' Channel data is 28-bit: ƒSENSOR = ƒIN_DIV × ƒREF × (DATA ÷ 2^28 + OFFSET ÷ 2^16) '''
+        return 28
@@ -1,6 +1,12 @@
-from typing import Tuple, Optional
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Optional
 from pyrpio.i2c_register_device import I2CRegisterDevice
 from pyrpio.i2c import I2C
+from pyrpiic.batch import RegisterBatch
+from pyrpiic.profiles import RegisterWrite, check_settings, merge_writes
+from pyrpiic.registers import RegisterShadow, contiguous_runs
+from pyrpiic.snapshot import RegisterSnapshot, changed_runs, check_snapshot, queue_runs, read_blocks, take_snapshot
+from .ldc_timing import LDCChannelConfig, LDCTimingPlan, plan_timing
 
 
 class LDC1X1Y:
@@ -56,9 +62,44 @@ class LDC1X1Y:
     LDC1X1Y_MANUFACTURER_ID = 0x7E
     LDC1X1Y_DEVICE_ID = 0x7F
 
+    # Registers changed by the device or w/ side effects are never shadowed
+    LDC1X1Y_VOLATILE_REGISTERS = frozenset([
+        *range(LDC1X1Y_DATA_BASE, LDC1X1Y_DATA_BASE + 8), LDC1X1Y_STATUS, LDC1X1Y_RESET_DEV,
+        LDC1X1Y_MANUFACTURER_ID, LDC1X1Y_DEVICE_ID
+    ])
+
+    # Writable configuration registers (one sequential read each): RCOUNT..CLOCK_DIVIDERS,
+    # ERROR_CONFIG..MUX_CONFIG and DRIVE_CURRENT
+    SNAPSHOT_BLOCKS = (
+        (LDC1X1Y_REF_COUNT_BASE, 16), (LDC1X1Y_ERROR_CONFIG, 3), (LDC1X1Y_DRIVE_CURRENT_BASE, 4)
+    )
+    # Writable bits of snapshot registers that also hold command bits (snapshots keep these bits only)
+    SNAPSHOT_MASKS: Dict[int, int] = {}
+    LDC1X1Y_CONFIG_SLEEP_MODE = 0x2000
+
+    # Power-on values of configuration registers (profiles start from these)
+    LDC1X1Y_RESET_VALUES = {
+        **dict.fromkeys(range(LDC1X1Y_REF_COUNT_BASE, LDC1X1Y_REF_COUNT_BASE + 4), 0x0080),
+        **dict.fromkeys(range(LDC1X1Y_OFFSET_BASE, LDC1X1Y_OFFSET_BASE + 4), 0x0000),
+        **dict.fromkeys(range(LDC1X1Y_SETTLE_COUNT_BASE, LDC1X1Y_SETTLE_COUNT_BASE + 4), 0x0000),
+        **dict.fromkeys(range(LDC1X1Y_CLOCK_DIVIDERS_BASE, LDC1X1Y_CLOCK_DIVIDERS_BASE + 4), 0x0000),
+        LDC1X1Y_ERROR_CONFIG: 0x0000, LDC1X1Y_CONFIG: 0x2801, LDC1X1Y_MUX_CONFIG: 0x020F,
+        **dict.fromkeys(range(LDC1X1Y_DRIVE_CURRENT_BASE, LDC1X1Y_DRIVE_CURRENT_BASE + 4), 0x0000),
+    }
+    LDC1X1Y_PROFILE_PROPERTIES = (
+        'high_current_drive', 'status_update_interrupt_enable', 'reference_clock_external',
+        'automatic_amplitude_correction', 'low_power_activation_mode', 'current_override_enable', 'sleep_mode'
+    )
+    LDC1X1Y_PROFILE_CHANNEL_SETTINGS = (
+        'reference_count', 'reference_offset', 'reference_settling_count', 'clock_dividers', 'drive_current'
+    )
+
     def __init__(self, bus: I2C, address=0x2A):
+        self.bus = bus
         self.address = address
         self.i2c_reg = I2CRegisterDevice(bus, address, register_size=1, data_size=2)
+        self._channel_configs: Dict[Tuple[int, float], LDCChannelConfig] = {}
+        self._shadow: Optional[RegisterShadow] = None
 
     def close(self):
         ''' Close up access. '''
@@ -70,9 +111,15 @@ class LDC1X1Y:
     def __exit__(self, *exc_info):
         self.close()
 
+    def _is_shadowed(self, register: int) -> bool:
+        return self._shadow is not None and register not in self.LDC1X1Y_VOLATILE_REGISTERS
+
     def get_register(self, register: int, mask: Optional[int] = None) -> int:
         ''' Get single word length register. '''
-        value = self.i2c_reg.read_register(register)
+        if self._is_shadowed(register):
+            value = self._shadow.get(register)
+        else:
+            value = self.i2c_reg.read_register(register)
         if mask is not None:
             value = value & mask
         return value
@@ -82,7 +129,131 @@ class LDC1X1Y:
         if mask is not None:
             pvalue = self.get_register(register, ~mask)  # pylint: disable=invalid-unary-operand-type
             value = pvalue | (value & mask)
-        self.i2c_reg.write_register(register, value)
+        if self._is_shadowed(register):
+            self._shadow.set(register, value)
+        else:
+            self.i2c_reg.write_register(register, value)
+
+    @contextmanager
+    def configuration(self, preload: bool = True):
+        ''' Batch configuration changes.
+            Within the context, all setters (properties, channel and MUX/ERROR config) update a
+            register shadow instead of the device. On exit, each changed register is written once
+            and consecutive registers are grouped into sequential writes submitted as one
+            combined transfer. Like restore(), channel and MUX registers are written in sleep mode
+            and CONFIG last. Nothing is written if the context exits with an exception.
+            Nested contexts join the outer one.
+            Args:
+                preload (bool): Read configuration registers (see SNAPSHOT_BLOCKS) w/ one combined
+                    transfer up front instead of reading each register on first access.
+            Example:
+                with ldc.configuration():
+                    ldc.sleep_mode = True
+                    ldc.set_channel_reference_count(0, 0xFFFF)
+                    ldc.configure_sequential_channels(4)
+                    ldc.sleep_mode = False
+        '''
+        if self._shadow is not None:
+            yield self
+            return
+        shadow = RegisterShadow(self.i2c_reg.read_register)
+        if preload:
+            # Snapshot blocks skip STATUS (reading it clears DRDY, error flags and INTB)
+            shadow.preload(read_blocks(self.bus, self.address, self.SNAPSHOT_BLOCKS, data_size=2))
+        self._shadow = shadow
+        try:
+            yield self
+        finally:
+            self._shadow = None
+        changes = shadow.changes()
+        changes.pop(self.LDC1X1Y_CONFIG, None)
+        if not changes and self.LDC1X1Y_CONFIG not in shadow.dirty:
+            return
+        current = shadow.device_value(self.LDC1X1Y_CONFIG)
+        config = shadow.get(self.LDC1X1Y_CONFIG)
+        awake = not current & self.LDC1X1Y_CONFIG_SLEEP_MODE
+        with RegisterBatch(self.bus, self.address, data_size=2) as batch:
+            if changes and awake:
+                batch.write_register(self.LDC1X1Y_CONFIG, current | self.LDC1X1Y_CONFIG_SLEEP_MODE)
+            queue_runs(batch, contiguous_runs(changes))
+            if config != current or (changes and awake):
+                batch.write_register(self.LDC1X1Y_CONFIG, config)
+
+    @classmethod
+    def compile_profile(cls, settings: Dict[str, object]) -> Tuple[int, List[RegisterWrite]]:
+        ''' Register writes of profile settings (see pyrpiic.profiles). Settings are applied w/ the
+            driver's setters to power-on register values, so unlisted fields keep power-on values.
+            Channel and MUX registers are written in sleep mode and CONFIG last.
+            Settings:
+                timing (dict): plan_timing() arguments, written w/ apply_timing_plan()
+                channels (dict): channel -> {reference_count, reference_offset, reference_settling_count,
+                    clock_dividers ([fin_div, fref_div]), drive_current}
+                deglitch_frequency (float): see set_deglitch_filter_frequency()
+                active_channel (int) or sequential_channels (int): channel selection
+                high_current_drive, ..., sleep_mode (bool): CONFIG properties
+        '''
+        check_settings(settings, ('timing', 'channels', 'deglitch_frequency', 'active_channel',
+                                  'sequential_channels', *cls.LDC1X1Y_PROFILE_PROPERTIES))
+        ldc = cls(None, 0x00)
+        ldc._shadow = shadow = RegisterShadow(cls.LDC1X1Y_RESET_VALUES.__getitem__)
+        if 'timing' in settings:
+            ldc.apply_timing_plan(ldc.plan_timing(**settings['timing']))
+        for ch, channel in settings.get('channels', {}).items():
+            check_settings(channel, cls.LDC1X1Y_PROFILE_CHANNEL_SETTINGS)
+            for name, value in channel.items():
+                args = value if isinstance(value, (list, tuple)) else [value]
+                getattr(ldc, f'set_channel_{name}')(int(ch), *args)
+        if 'deglitch_frequency' in settings:
+            ldc.set_deglitch_filter_frequency(settings['deglitch_frequency'])
+        if 'active_channel' in settings:
+            ldc.configure_single_active_channel(settings['active_channel'])
+        if 'sequential_channels' in settings:
+            ldc.configure_sequential_channels(settings['sequential_channels'])
+        for name in cls.LDC1X1Y_PROFILE_PROPERTIES:
+            if name in settings:
+                setattr(ldc, name, bool(settings[name]))
+        values = shadow.dirty
+        config = values.pop(cls.LDC1X1Y_CONFIG, None)
+        writes = merge_writes(values, blocks=cls.SNAPSHOT_BLOCKS)
+        if config is not None:
+            if writes and not config & cls.LDC1X1Y_CONFIG_SLEEP_MODE:
+                writes.insert(0, (cls.LDC1X1Y_CONFIG, [config | cls.LDC1X1Y_CONFIG_SLEEP_MODE]))
+            writes.append((cls.LDC1X1Y_CONFIG, [config]))
+        return 2, writes
+
+    def snapshot(self) -> RegisterSnapshot:
+        ''' Read all writable configuration registers w/ three sequential reads in one combined transfer. '''
+        snapshot = take_snapshot(self, self.SNAPSHOT_BLOCKS, data_size=2)
+        snapshot.registers = self._snapshot_values(snapshot.registers)
+        return snapshot
+
+    def _snapshot_values(self, registers: Dict[int, int]) -> Dict[int, int]:
+        return {r: v & self.SNAPSHOT_MASKS.get(r, 0xFFFF) for r, v in registers.items()}
+
+    def restore(self, snapshot: RegisterSnapshot) -> Dict[int, int]:
+        '''
+        Write back registers of snapshot that differ from the device in one combined transfer.
+        Channel and MUX registers are written in sleep mode and CONFIG last, so conversions
+        restart w/ the restored configuration.
+
+        Returns:
+            Dict[int, int]: registers written
+        '''
+        check_snapshot(self, snapshot, self.SNAPSHOT_BLOCKS)
+        current = self._snapshot_values(read_blocks(self.bus, self.address, self.SNAPSHOT_BLOCKS, data_size=2))
+        target = self._snapshot_values(snapshot.registers)
+        config = target.pop(self.LDC1X1Y_CONFIG, current[self.LDC1X1Y_CONFIG])
+        runs = changed_runs(self.SNAPSHOT_BLOCKS, current, target)
+        awake = not current[self.LDC1X1Y_CONFIG] & self.LDC1X1Y_CONFIG_SLEEP_MODE
+        written = {start + i: v for start, values in runs for i, v in enumerate(values)}
+        with RegisterBatch(self.bus, self.address, data_size=2) as batch:
+            if runs and awake:
+                batch.write_register(self.LDC1X1Y_CONFIG, current[self.LDC1X1Y_CONFIG] | self.LDC1X1Y_CONFIG_SLEEP_MODE)
+            queue_runs(batch, runs)
+            if config != current[self.LDC1X1Y_CONFIG] or (runs and awake):
+                batch.write_register(self.LDC1X1Y_CONFIG, config)
+                written[self.LDC1X1Y_CONFIG] = config
+        return written
 
     def get_register_bit(self, register: int, bit: int):
         ''' Get single bit from register. '''
@@ -108,6 +279,46 @@ class LDC1X1Y:
         ''' Get channel data and error flags. '''
         raise NotImplementedError()
 
+    def decode_channel_data(self, msb: int, lsb: int) -> Tuple[int, int]:
+        ''' Decode channel DATA_MSB/DATA_LSB register values into data and error flags. '''
+        raise NotImplementedError()
+
+    def read_all_channels(self, num_chs: int = 4) -> List[Tuple[int, int]]:
+        ''' Get data and error flags of channels 0 to num_chs-1 from the same conversion cycle.
+            DATA_MSB_CH0 through DATA_LSB_CH(num_chs-1) are burst read in one sequential transaction.
+            Args:
+                num_chs (int): Number of channels (2 for LDC1X12, 4 for LDC1X14)
+            Returns:
+                List[Tuple[int, int]]: Channel computed conversion value and error code per channel
+        '''
+        if not 1 <= num_chs <= 4:
+            raise ValueError('Number of channels must be in range [1, 4]')
+        words = self.i2c_reg.read_register_sequential(self.LDC1X1Y_DATA_BASE, 2*num_chs)
+        return [self.decode_channel_data(words[2*ch], words[2*ch + 1]) for ch in range(num_chs)]
+
+    def get_data_bits(self) -> int:
+        ''' Number of fractional bits of channel data (ƒSENSOR ∝ DATA ÷ 2^bits). '''
+        raise NotImplementedError()
+
+    def get_channel_config(self, ch: int, fclk: float, refresh: bool = False) -> LDCChannelConfig:
+        ''' Get channel settings used to convert raw data (see ldc_convert).
+            Settings are read from device once and cached until refresh is requested.
+            Args:
+                ch (int): Channel
+                fclk (float): Reference clock frequency (Hz)
+                refresh (bool): Re-read settings from device
+        '''
+        key = (ch, fclk)
+        if refresh or key not in self._channel_configs:
+            fin_div, fref_div = self.get_channel_clock_dividers(ch)
+            self._channel_configs[key] = LDCChannelConfig(
+                fref=fclk / max(fref_div, 1),
+                fin_div=max(fin_div, 1),
+                offset=self.get_channel_reference_offset(ch),
+                data_bits=self.get_data_bits()
+            )
+        return self._channel_configs[key]
+
     def get_channel_drive_current(self, ch: int) -> Tuple[int, int]:
         ''' Get channel L-C sensor drive current and computed sensor drive current
             Returns:
@@ -243,6 +454,15 @@ class LDC1X1Y:
         ''' Enable/disable status updates triggering interrupt pin. '''
         self.set_register_bit(self.LDC1X1Y_CONFIG, 7, enable)
 
+    @property
+    def data_ready_interrupt(self):
+        ''' Data ready (DRDY) asserts INTB (ERROR_CONFIG.DRDY_2INT). Reading STATUS releases INTB. '''
+        return self.get_register_bit(self.LDC1X1Y_ERROR_CONFIG, 0)
+
+    @data_ready_interrupt.setter
+    def data_ready_interrupt(self, enable: bool):
+        self.set_register_bit(self.LDC1X1Y_ERROR_CONFIG, 0, enable)
+
     @property
     def reference_clock_external(self):
         ''' Enable external reference clock instead of internal oscillator. '''
@@ -325,7 +545,7 @@ class LDC1X1Y:
         '''
         seq_ch_map = {2: 0b100, 3: 0b101, 4: 0b110}
         seq_val = seq_ch_map[num_chs]
-        self.set_register(self.LDC1X1Y_MUX_CONFIG, seq_val, 0xE000)
+        self.set_register(self.LDC1X1Y_MUX_CONFIG, seq_val << 13, 0xE000)
 
     def get_deglitch_filter_value(self) -> int:
         ''' Input Deglitch Filter Bandwidth
@@ -377,3 +597,27 @@ class LDC1X1Y:
                 bwid_freq = mf
         print(f'Using closest frequency: {bwid_freq}')
         self.set_deglitch_filter_value(bwid_val)
+
+    def plan_timing(self, fclk: float, fsensor_min: float, fsensor_max: float, num_chs: int,
+                    sample_rate: float, q_factor: float = 10.0) -> LDCTimingPlan:
+        ''' Compute RCOUNT, SETTLECOUNT, ƒIN_DIV/ƒREF_DIV and deglitch settings that maximize
+            resolution within the output data rate budget (see ldc_timing.plan_timing).
+            Args:
+                fclk (float): Reference clock (Hz)
+                fsensor_min (float): Lowest expected sensor frequency (Hz)
+                fsensor_max (float): Highest expected sensor frequency (Hz)
+                num_chs (int): Number of active channels
+                sample_rate (float): Desired output data rate of a full channel sequence (Hz)
+                q_factor (float): Sensor Q used to size settle time
+        '''
+        return plan_timing(fclk, fsensor_min, fsensor_max, num_chs, sample_rate, q_factor=q_factor)
+
+    def apply_timing_plan(self, plan: LDCTimingPlan):
+        ''' Write timing plan to channels 0 to num_chs-1 in one batched configuration. '''
+        with self.configuration():
+            for ch in range(plan.num_chs):
+                self.set_channel_reference_count(ch, plan.rcount)
+                self.set_channel_reference_settling_count(ch, plan.settle_count)
+                self.set_channel_clock_dividers(ch, plan.fin_div, plan.fref_div)
+            self.set_deglitch_filter_value(plan.deglitch)
+        self._channel_configs.clear()
@@ -0,0 +1,219 @@
+''' Time-aligned scanning of many LDC1X1Y sensors across I2C buses. '''
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from pyrpiic.ringbuffer import RingBuffer
+from .ldc1x1y import LDC1X1Y
+
+LDC_ARRAY_BUS_ERROR = 0xFF
+
+
+class LDCArray:
+    '''
+    Scan an array of LDC1X1Y sensors frame by frame. Sensors are grouped by I2C bus and each bus
+    gets its own worker thread, so sensors on different buses are read in parallel while reads on
+    a shared bus stay serialized. The read order on each bus rotates every frame so no sensor is
+    always read last.
+
+    Each frame burst reads all channels of every sensor and is stored in a ring buffer:
+        timestamp: frame start time
+        device_time (device,): time each sensor was read
+        value (device, channel): channel data
+        error (device, channel): channel error codes (0xFF if the bus transfer failed)
+
+    Example:
+        with LDCArray(sensors, num_chs=4) as array:
+            frames = array.acquire(100)
+            values = frames['value']  # shape (100, device, channel)
+    '''
+
+    def __init__(self, devices: Sequence[LDC1X1Y], num_chs: int = 4, rate: Optional[float] = None,
+                 capacity: int = 1024):
+        '''
+        Args:
+            devices (Sequence[LDC1X1Y]): Sensors (device index in frames follows this order)
+            num_chs (int, optional): Channels read per sensor. Defaults to 4.
+            rate (float, optional): Frame rate (Hz). Defaults to as fast as buses allow.
+            capacity (int, optional): Number of frames retained. Defaults to 1024.
+        '''
+        if not devices:
+            raise ValueError('Array requires at least one device')
+        self.devices = list(devices)
+        self.num_chs = num_chs
+        self.rate = rate
+        shape = (len(self.devices), num_chs)
+        self.buffer = RingBuffer(capacity, [
+            ('timestamp', 'f8'), ('device_time', 'f8', (len(self.devices),)),
+            ('value', 'u4', shape), ('error', 'u1', shape)
+        ])
+        self.bus_errors = 0
+        self._errors_lock = threading.Lock()
+        # Device indices grouped per physical bus
+        groups: Dict[int, List[int]] = {}
+        for index, device in enumerate(self.devices):
+            groups.setdefault(id(device.bus), []).append(index)
+        self.bus_groups = list(groups.values())
+        self._device_time = np.zeros(len(self.devices), dtype='f8')
+        self._value = np.zeros(shape, dtype='u4')
+        self._error = np.zeros(shape, dtype='u1')
+        self._frame = 0
+        self._failure: Optional[Tuple[int, Exception]] = None
+        self._barrier: Optional[threading.Barrier] = None
+        self._workers: List[threading.Thread] = []
+        self._scan_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        ''' Bus workers are running. '''
+        return self._barrier is not None
+
+    def open(self):
+        ''' Start one worker thread per bus. '''
+        if self.is_open:
+            return
+        self._stop.clear()
+        self._barrier = threading.Barrier(len(self.bus_groups) + 1)
+        self._workers = [
+            threading.Thread(target=self._work, args=(group,), name=f'LDCArray-bus{i}', daemon=True)
+            for i, group in enumerate(self.bus_groups)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def close(self):
+        ''' Stop background scanning and bus workers. '''
+        self.stop()
+        if self._barrier is not None:
+            self._barrier.abort()
+            for worker in self._workers:
+                worker.join()
+            self._barrier = None
+            self._workers = []
+
+    def _work(self, group: List[int]):
+        barrier = self._barrier
+        while True:
+            try:
+                barrier.wait()  # frame start
+            except threading.BrokenBarrierError:
+                return
+            rotation = self._frame % len(group)
+            for index in group[rotation:] + group[:rotation]:
+                self._read_device(index)
+            try:
+                barrier.wait()  # frame done
+            except threading.BrokenBarrierError:
+                return
+
+    def _read_device(self, index: int):
+        device = self.devices[index]
+        self._device_time[index] = time.time()
+        try:
+            for ch, (value, err) in enumerate(device.read_all_channels(self.num_chs)):
+                self._value[index, ch] = value
+                self._error[index, ch] = err
+        except OSError:
+            with self._errors_lock:  # bus workers run concurrently
+                self.bus_errors += 1
+            self._value[index, :] = 0
+            self._error[index, :] = LDC_ARRAY_BUS_ERROR
+        except Exception as exc:  # pylint: disable=broad-except
+            # Keep worker alive (scan() would wait forever) and raise in scan() instead
+            self._failure = self._failure or (index, exc)
+            self._value[index, :] = 0
+            self._error[index, :] = LDC_ARRAY_BUS_ERROR
+
+    def scan(self) -> np.void:
+        '''
+        Read one time-aligned frame from all sensors and append it to the buffer.
+        Bus errors (OSError) are recorded in the frame; other failures of a device raise
+        RuntimeError after the frame completes (the frame is dropped). Concurrent scans are
+        serialized so frame start/done pairing of the bus workers is kept.
+        '''
+        with self._scan_lock:
+            if not self.is_open:
+                raise RuntimeError('Array is not open')
+            timestamp = time.time()
+            self._barrier.wait()
+            self._barrier.wait()
+            self._frame += 1
+            if self._failure is not None:
+                (index, exc), self._failure = self._failure, None
+                raise RuntimeError(f'Reading device {index} of array failed: {exc!r}') from exc
+            self.buffer.append((timestamp, self._device_time, self._value, self._error))
+            return self.buffer.latest(1)[0]
+
+    def acquire(self, count: int) -> np.ndarray:
+        '''
+        Scan count frames in the calling thread paced at the configured rate.
+
+        Returns:
+            np.ndarray: view of acquired frames
+
+        Raises:
+            RuntimeError: array is scanning in the background (see start())
+        '''
+        if self.running:
+            raise RuntimeError('Array is scanning in the background (call stop() first)')
+        self._stop.clear()
+        return self._acquire(count)
+
+    def _acquire(self, count: int) -> np.ndarray:
+        if not self.is_open:
+            self.open()
+        period = 1.0 / self.rate if self.rate else 0.0
+        deadline = time.monotonic()
+        acquired = 0
+        while acquired < count and not self._stop.is_set():
+            self.scan()
+            acquired += 1
+            if period:
+                deadline += period
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._stop.wait(remaining)
+                else:
+                    deadline = time.monotonic()
+        return self.buffer.latest(acquired)
+
+    @property
+    def running(self) -> bool:
+        ''' Background thread is scanning. '''
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        ''' Scan continuously from a background thread until stopped. '''
+        if self._thread is not None:
+            return
+        self.open()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._acquire, args=(float('inf'),), name='LDCArray', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        ''' Stop background scanning. '''
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        ''' Zero-copy view of latest n frames (oldest first). '''
+        return self.buffer.latest(n)
+
+    def frame_rate(self, n: Optional[int] = None) -> float:
+        ''' Measured frame rate over latest n frames (Hz). '''
+        timestamps = self.buffer.latest(n)['timestamp']
+        if timestamps.size < 2 or timestamps[-1] == timestamps[0]:
+            return 0.0
+        return float((timestamps.size - 1) / (timestamps[-1] - timestamps[0]))
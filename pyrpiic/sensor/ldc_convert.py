@@ -0,0 +1,84 @@
+''' Vectorized conversion of LDC1X1Y raw conversion data. '''
+import math
+from typing import Dict, Optional, Tuple
+import numpy as np
+from .ldc_timing import LDCChannelConfig  # numpy-free so drivers can import it cheaply
+
+LDC_ERROR_FLAGS = {
+    'under_range': 0x8,
+    'over_range': 0x4,
+    'watchdog': 0x2,
+    'amplitude': 0x1,
+}
+
+
+def decode_data(msb, lsb=None, data_bits: int = 28) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Split DATA_MSB (and DATA_LSB for 28-bit parts) register arrays into raw data and error codes.
+
+    Args:
+        msb (array_like): DATA_MSB register values
+        lsb (array_like, optional): DATA_LSB register values (LDC161X only)
+        data_bits (int, optional): 28 for LDC161X, 12 for LDC141X. Defaults to 28.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: raw data (uint32) and error codes (uint8)
+    '''
+    msb = np.asarray(msb, dtype=np.uint32)
+    raw = msb & 0x0FFF
+    if data_bits > 12 and lsb is not None:
+        raw = (raw << 16) | np.asarray(lsb, dtype=np.uint32)
+    err = (msb >> 12).astype(np.uint8)
+    return raw, err
+
+
+def raw_to_frequency(raw, config: LDCChannelConfig) -> np.ndarray:
+    '''
+    Convert raw data codes to sensor frequency (Hz).
+
+    Args:
+        raw (array_like): raw data codes
+        config (LDCChannelConfig): channel settings
+
+    Returns:
+        np.ndarray: sensor frequency (Hz)
+    '''
+    return np.asarray(raw, dtype=np.float64) * config.frequency_scale + config.frequency_offset
+
+
+def frequency_to_inductance(freq, capacitance: float) -> np.ndarray:
+    '''
+    Convert sensor frequency to inductance of L-C tank: L = 1 ÷ ((2π × ƒSENSOR)² × C)
+
+    Args:
+        freq (array_like): sensor frequency (Hz)
+        capacitance (float): tank capacitance (F)
+
+    Returns:
+        np.ndarray: inductance (H), inf where frequency is 0
+    '''
+    freq = np.asarray(freq, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        return 1.0 / ((2*math.pi*freq)**2 * capacitance)
+
+
+def raw_to_inductance(raw, config: LDCChannelConfig, capacitance: float) -> np.ndarray:
+    ''' Convert raw data codes to inductance (H). '''
+    return frequency_to_inductance(raw_to_frequency(raw, config), capacitance)
+
+
+def error_flags(err, flags: Optional[Dict[str, int]] = None) -> Dict[str, np.ndarray]:
+    '''
+    Expand error code array into boolean masks.
+
+    Args:
+        err (array_like): 4-bit error codes
+        flags (Dict[str, int], optional): flag name to bit mask. Defaults to LDC_ERROR_FLAGS.
+
+    Returns:
+        Dict[str, np.ndarray]: mask per flag plus 'any'
+    '''
+    err = np.asarray(err)
+    masks = {name: (err & bit) != 0 for name, bit in (flags or LDC_ERROR_FLAGS).items()}
+    masks['any'] = err != 0
+    return masks
@@ -0,0 +1,174 @@
+''' Data-ready driven streaming acquisition for LDC1X1Y inductive sensors. '''
+import threading
+import time
+from typing import Optional, Sequence
+import numpy as np
+from pyrpiic.batch import RegisterBatch
+from pyrpiic.ringbuffer import RingBuffer
+from .ldc1x1y import LDC1X1Y
+
+
+class LDCStream:
+    '''
+    Stream conversions of an LDC1X1Y into a preallocated ring buffer. Each conversion is burst
+    read once data is ready and stored w/ its timestamp and per-channel error codes.
+
+    Data ready is detected either from the INTB pin through an edge source or by polling
+    the STATUS register. Polling is paced by the configured conversion interval so the bus
+    is only queried once a conversion is due.
+
+    The edge source is any object with poll(timeout) -> bool (e.g. pyrpio GPIO configured for
+    falling edges on INTB). If it also provides read_event(), the event is consumed after each poll.
+    configure() routes data ready to INTB and STATUS is read w/ each burst to release INTB.
+    '''
+
+    def __init__(self, ldc: LDC1X1Y, channels: Sequence[int] = (0,), fclk: float = 40e6,
+                 capacity: int = 4096, edge_source=None, timeout: float = 1.0):
+        '''
+        Args:
+            ldc (LDC1X1Y): Sensor
+            channels (Sequence[int], optional): Single channel or sequential channels starting at 0.
+                Defaults to channel 0.
+            fclk (float, optional): Reference clock frequency (Hz). Defaults to 40 MHz.
+            capacity (int, optional): Number of conversions retained. Defaults to 4096.
+            edge_source (optional): INTB edge source. Defaults to polling STATUS.
+            timeout (float, optional): Max wait for a single conversion (s). Defaults to 1 s.
+        '''
+        channels = list(channels)
+        if len(channels) > 1 and channels != list(range(len(channels))):
+            raise ValueError('Sequential channels must start at channel 0 and be contiguous')
+        if len(channels) not in (1, 2, 3, 4):
+            raise ValueError('Stream supports 1 to 4 channels')
+        self.ldc = ldc
+        self.channels = channels
+        self.fclk = fclk
+        self.edge_source = edge_source
+        self.timeout = timeout
+        n = len(channels)
+        self.buffer = RingBuffer(capacity, [('timestamp', 'f8'), ('value', 'u4', (n,)), ('error', 'u1', (n,))])
+        self.interval = 0.0
+        self.timeouts = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def configure(self):
+        ''' Configure active channels and derive conversion interval used for pacing. '''
+        if len(self.channels) == 1:
+            self.ldc.configure_single_active_channel(self.channels[0])
+        else:
+            self.ldc.configure_sequential_channels(len(self.channels))
+        if self.edge_source is not None:
+            self.ldc.data_ready_interrupt = True
+        self.interval = self.conversion_interval()
+
+    def conversion_interval(self) -> float:
+        ''' Time to convert all active channels once (settle + conversion per channel). '''
+        interval = 0.0
+        for ch in self.channels:
+            _, fref_div = self.ldc.get_channel_clock_dividers(ch)
+            fref = self.fclk / max(fref_div, 1)
+            settle_count = self.ldc.get_channel_reference_settling_count(ch)
+            interval += self.ldc.get_channel_conversion_interval_time(ch, fref)
+            interval += max(16*settle_count, 32) / fref
+        return interval
+
+    def _wait_ready(self, due: float) -> bool:
+        ''' Wait until conversion is ready. '''
+        if self.edge_source is not None:
+            ready = self.edge_source.poll(self.timeout)
+            if ready and hasattr(self.edge_source, 'read_event'):
+                self.edge_source.read_event()
+            return bool(ready)
+        deadline = due + self.timeout
+        poll_interval = max(self.interval / 8, 0.0001)
+        now = time.monotonic()
+        if due > now:
+            time.sleep(due - now)
+        while True:
+            if self.ldc.data_ready:
+                return True
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(poll_interval)
+
+    def _read(self):
+        ''' Burst read active channels and append record. '''
+        timestamp = time.time()
+        if self.edge_source is not None:
+            # STATUS read clears DRDY so INTB is released for the next conversion
+            first = self.channels[0] if len(self.channels) == 1 else 0
+            with RegisterBatch(self.ldc.bus, self.ldc.address, data_size=2) as batch:
+                batch.read_register(self.ldc.LDC1X1Y_STATUS)
+                data = batch.read_register_sequential(self.ldc.LDC1X1Y_DATA_BASE + 2*first, 2*len(self.channels))
+            words = data.values()
+            results = [self.ldc.decode_channel_data(words[2*i], words[2*i + 1]) for i in range(len(self.channels))]
+        elif len(self.channels) == 1:
+            ch = self.channels[0]
+            msb, lsb = self.ldc.i2c_reg.read_register_sequential(self.ldc.LDC1X1Y_DATA_BASE + 2*ch, 2)
+            results = [self.ldc.decode_channel_data(msb, lsb)]
+        else:
+            results = self.ldc.read_all_channels(len(self.channels))
+        self.buffer.append((timestamp, [v for v, _ in results], [e for _, e in results]))
+
+    def acquire(self, count: int, configure: bool = True) -> np.ndarray:
+        '''
+        Acquire count conversions in the calling thread.
+
+        Args:
+            count (int): Number of conversions
+            configure (bool, optional): Configure channels first. Defaults to True.
+
+        Returns:
+            np.ndarray: view of acquired records (timestamp, value[ch], error[ch])
+        '''
+        self._stop.clear()
+        return self._acquire(count, configure)
+
+    def _acquire(self, count: int, configure: bool) -> np.ndarray:
+        if configure:
+            self.configure()
+        acquired = 0
+        due = time.monotonic()
+        while acquired < count and not self._stop.is_set():
+            if not self._wait_ready(due):
+                self.timeouts += 1
+                due = time.monotonic()
+                continue
+            ready = time.monotonic()
+            self._read()
+            acquired += 1
+            due = ready + self.interval
+        return self.buffer.latest(acquired)
+
+    @property
+    def running(self) -> bool:
+        ''' Worker thread is streaming. '''
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        ''' Configure channels and stream from a worker thread until stopped. '''
+        if self.running:
+            return
+        self.configure()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._acquire, args=(float('inf'), False),
+                                        name=f'LDCStream-0x{self.ldc.address:02X}', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        ''' Stop worker thread. '''
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        ''' Zero-copy view of latest n conversions (oldest first). '''
+        return self.buffer.latest(n)
@@ -0,0 +1,117 @@
+''' Conversion timing planner for LDC1X1Y inductive sensors. '''
+import math
+from dataclasses import dataclass
+
+LDC_FSENSOR_FIN_DIV2 = 8.75e6  # ƒIN_DIV must be ≥ 2 at or above this sensor frequency
+LDC_FREF_MAX_SINGLE = 55e6
+LDC_FREF_MAX_MULTI = 35e6
+LDC_DEGLITCH_OPTIONS = ((1.0e6, 0b001), (3.3e6, 0b100), (10e6, 0b101), (33e6, 0b111))
+
+
+@dataclass(frozen=True)
+class LDCChannelConfig:
+    ''' Channel settings needed to convert raw data.
+        ƒSENSOR = ƒIN_DIV × ƒREF × (DATA ÷ 2^data_bits + OFFSET ÷ 2^16)
+    '''
+    fref: float
+    fin_div: int = 1
+    offset: int = 0
+    data_bits: int = 28
+
+    @property
+    def frequency_scale(self) -> float:
+        ''' Hz per raw code. '''
+        return self.fin_div * self.fref / 2.0**self.data_bits
+
+    @property
+    def frequency_offset(self) -> float:
+        ''' Hz added by channel reference offset. '''
+        return self.fin_div * self.fref * self.offset / 2.0**16
+
+
+@dataclass(frozen=True)
+class LDCTimingPlan:
+    ''' Register settings and resulting timing shared by all active channels. '''
+    num_chs: int
+    fref_div: int
+    fin_div: int
+    rcount: int
+    settle_count: int
+    deglitch: int
+    fref: float
+    conversion_time: float
+    settle_time: float
+    switch_time: float
+
+    @property
+    def channel_time(self) -> float:
+        ''' Time spent on one channel (settle + conversion + switch) (s). '''
+        return self.settle_time + self.conversion_time + self.switch_time
+
+    @property
+    def sample_rate(self) -> float:
+        ''' Achieved output data rate of a full channel sequence (Hz). '''
+        return 1.0 / (self.num_chs * self.channel_time)
+
+    @property
+    def effective_bits(self) -> float:
+        ''' Approximate resolution limit of reference counter: log2(RCOUNT × 16). '''
+        return math.log2(self.rcount * 16)
+
+
+def plan_timing(fclk: float, fsensor_min: float, fsensor_max: float, num_chs: int, sample_rate: float,
+                q_factor: float = 10.0) -> LDCTimingPlan:
+    '''
+    Compute RCOUNT, SETTLECOUNT, ƒIN_DIV/ƒREF_DIV and deglitch setting that maximize resolution
+    (longest reference count at the highest allowed ƒREF) within the sample rate budget.
+
+    Args:
+        fclk (float): Reference clock (Hz)
+        fsensor_min (float): Lowest expected sensor frequency (Hz)
+        fsensor_max (float): Highest expected sensor frequency (Hz)
+        num_chs (int): Number of active channels (1 for single channel mode)
+        sample_rate (float): Desired output data rate of a full channel sequence (Hz)
+        q_factor (float, optional): Sensor Q used to size settle time. Defaults to 10.
+
+    Raises:
+        ValueError: budget or frequencies are not achievable
+
+    Returns:
+        LDCTimingPlan: computed plan
+    '''
+    if not 0 < fsensor_min <= fsensor_max:
+        raise ValueError('Sensor frequency range is not valid')
+    if not 1 <= num_chs <= 4:
+        raise ValueError('Number of channels must be in range [1, 4]')
+    fref_max = LDC_FREF_MAX_SINGLE if num_chs == 1 else LDC_FREF_MAX_MULTI
+    fref_div = max(1, math.ceil(fclk / fref_max))
+    fref = fclk / fref_div
+    # Smallest input divider keeping ƒIN below ƒREF/4
+    fin_div = 2 if fsensor_max >= LDC_FSENSOR_FIN_DIV2 else 1
+    while fsensor_max / fin_div >= fref / 4:
+        fin_div += 1
+    if fin_div > 0xF:
+        raise ValueError('Sensor frequency too high for reference clock')
+    deglitch = next((value for bw, value in LDC_DEGLITCH_OPTIONS if bw > fsensor_max), None)
+    if deglitch is None:
+        raise ValueError('Sensor frequency exceeds highest deglitch filter bandwidth')
+    # Settle for Q sensor periods at the lowest frequency
+    settle_count = min(max(math.ceil(q_factor * fref / (16 * fsensor_min)), 2), 0xFFFF)
+    settle_time = 16 * settle_count / fref
+    switch_time = 692e-9 + 5 / fref if num_chs > 1 else 0.0
+    budget = 1.0 / (sample_rate * num_chs) - settle_time - switch_time
+    rcount = min(math.floor(budget * fref / 16), 0xFFFF)
+    if rcount <= 4:
+        raise ValueError(f'Sample rate {sample_rate} Hz not achievable w/ {num_chs} channels')
+    return LDCTimingPlan(
+        num_chs=num_chs,
+        fref_div=fref_div,
+        fin_div=fin_div,
+        rcount=rcount,
+        settle_count=settle_count,
+        deglitch=deglitch,
+        fref=fref,
+        conversion_time=16 * rcount / fref,
+        settle_time=settle_time,
+        switch_time=switch_time,
+    )
@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+import pytest
+
+from pyrpiic import steps
+from pyrpiic.sensor import hdc1080
+from pyrpiic.sensor.hdc1080 import HDC1080
+from pyrpiic.sensor.hdc1080_sampler import HDC1080Sampler
+from pyrpiic.sim import SimHDC1080, SimI2C
+
+bus = SimI2C('/dev/i2c-3')
+bus.open()
+device = bus.attach(0x40, SimHDC1080(temperature=0x6000 / 65536.0 * 165.0 - 40, humidity=50.0))
+
+
+class RecordedTime:
+    ''' time module whose sleep() records the wait and advances the simulated bus clock instead of blocking. '''
+
+    def __init__(self, sleeps):
+        self.sleeps = sleeps
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        bus.clock.sleep(seconds)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@pytest.fixture(name='sleeps')
+def fixture_sleeps(monkeypatch):
+    # Replace the time module of the driver modules only; patching time.sleep would affect the whole process
+    sleeps = []
+    monkeypatch.setattr(hdc1080, 'time', RecordedTime(sleeps))
+    monkeypatch.setattr(steps, 'time', RecordedTime(sleeps))
+    return sleeps
+
+
+def test_hdc1080_read_temperature_humidity(sleeps):
+    sensor = HDC1080(bus, 0x40)
+    sensor.configure()
+    conversions = device.conversions
+    temperature, humidity = sensor.read_temperature_humidity()
+    assert temperature == pytest.approx(0x6000 / 65536.0 * 165.0 - 40)
+    assert humidity == pytest.approx(50.0)
+    assert device.conversions == conversions + 1
+
+
+def test_hdc1080_resolution_conversion_time(sleeps):
+    sensor = HDC1080(bus, 0x40)
+    sensor.set_temperature_resolution(HDC1080.TempResolution.eleven)
+    sensor.set_humidity_resolution(HDC1080.HumidityResolution.eight)
+    assert device.registers[0x02] & 0x0700 == 0x0600
+    sleeps.clear()
+    sensor.read_temperature_humidity()
+    assert sleeps == [pytest.approx(3.65e-3 + 2.5e-3 + sensor.conversion_margin)]
+
+
+def test_hdc1080_poll_ready(sleeps):
+    sensor = HDC1080(bus, 0x40, poll_ready=True)
+    sensor.configure()
+    sleeps.clear()
+    start = bus.clock.now()
+    temperature, _ = sensor.read_temperature_humidity()
+    assert temperature == pytest.approx(0x6000 / 65536.0 * 165.0 - 40)
+    # Reads are NACKed until the conversion completes, polled every poll_interval
+    assert sleeps and set(sleeps) == {sensor.poll_interval}
+    assert bus.clock.now() - start >= device.conversion_time(0x00)
+    assert sum(sleeps) < device.conversion_time(0x00) + sensor.poll_interval
+
+
+def test_hdc1080_cached_identity(sleeps):
+    sensor = HDC1080(bus, 0x40)
+    sleeps.clear()
+    assert sensor.read_manufacturer_id() == 0x5449
+    assert sensor.read_device_id() == 0x1050
+    assert sensor.read_serial_number() == (0x0123 << 25) | (0x4567 << 9) | (0x8900 >> 7)
+    transactions = bus.transactions
+    sensor.read_manufacturer_id()
+    sensor.read_device_id()
+    sensor.read_serial_number()
+    assert bus.transactions == transactions
+    assert not sleeps
+
+
+def test_hdc1080_shadowed_config(sleeps):
+    sensor = HDC1080(bus, 0x40)
+    sensor.configure()
+    transactions, read = bus.transactions, bus.bytes_read
+    sensor.turn_heater_on()
+    sensor.set_temperature_resolution(HDC1080.TempResolution.eleven)
+    sensor.turn_heater_off()
+    assert bus.transactions == transactions + 3 and bus.bytes_read == read  # one write each, no reads
+    assert device.registers[0x02] == 0x1400
+
+
+def test_hdc1080_sampler(sleeps):
+    sensor = HDC1080(bus, 0x40)
+    with HDC1080Sampler(sensor, rate=1000.0, capacity=16) as sampler:
+        deadline = time.monotonic() + 1.0
+        while sampler.buffer.count < 20 and time.monotonic() < deadline:
+            time.sleep(0.001)
+    samples = sampler.latest(10)
+    assert len(samples) == 10
+    assert all(np.diff(samples['timestamp']) >= 0)
+    assert sampler.statistics()['humidity']['mean'] == pytest.approx(50.0)
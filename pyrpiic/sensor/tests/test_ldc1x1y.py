@@ -0,0 +1,287 @@
+import math
+import threading
+
+import pytest
+
+from pyrpiic.sensor.ldc141x import LDC141X
+from pyrpiic.sensor.ldc161x import LDC161X
+from pyrpiic.sensor.ldc_array import LDCArray
+from pyrpiic.sensor.ldc_convert import (LDCChannelConfig, decode_data, error_flags, frequency_to_inductance,
+                                        raw_to_frequency)
+from pyrpiic.sensor.ldc_stream import LDCStream
+from pyrpiic.sim import SimI2C, SimLDC1414, SimLDC1614
+
+bus = SimI2C('/dev/i2c-3')
+bus.open()
+device = bus.attach(0x2A, SimLDC1614())
+device14 = bus.attach(0x2B, SimLDC1414())
+
+
+@pytest.fixture(autouse=True)
+def fixture_reset():
+    ''' Power-on state (sleep mode) for each test. '''
+    device.reset()
+    device14.reset()
+
+
+def record_writes(monkeypatch, sim):
+    ''' Messages written to simulated device. '''
+    writes = []
+    write = sim.write
+
+    def record_write(data):
+        writes.append(bytes(data))
+        write(data)
+    monkeypatch.setattr(sim, 'write', record_write)
+    return writes
+
+
+def register_writes(writes):
+    ''' First register of messages writing register values (pointer-only writes dropped). '''
+    return [data[0] for data in writes if len(data) > 1]
+
+
+def test_ldc161x_read_all_channels():
+    ldc = LDC161X(bus, 0x2A)
+    # Data registers of last conversions (asleep device does not convert)
+    device.registers.update({0x00: 0x0123, 0x01: 0x4567, 0x02: 0x8ABC, 0x03: 0xDEF0, 0x04: 0x0001, 0x06: 0x1000})
+    transactions, read = bus.transactions, bus.bytes_read
+    channels = ldc.read_all_channels()
+    assert bus.transactions == transactions + 1 and bus.bytes_read == read + 16  # one burst read
+    assert channels == [(0x01234567, 0x0), (0x0ABCDEF0, 0x8), (0x00010000, 0x0), (0x00000000, 0x1)]
+    assert ldc.get_channel_data(1) == channels[1]
+
+
+def test_ldc141x_read_all_channels():
+    ldc = LDC141X(bus, 0x2B)
+    device14.registers.update({0x00: 0x2ABC, 0x01: 0xFFFF, 0x02: 0x0123})
+    assert ldc.read_all_channels(num_chs=2) == [(0x0ABC, 0x2), (0x0123, 0x0)]
+
+
+def test_ldc_stream_polling_sequential():
+    ldc = LDC161X(bus, 0x2A)
+    device.sensor_frequency = [2.5e6, 5e6, 3e6, 3e6]
+    for ch in range(2):
+        ldc.set_channel_clock_dividers(ch, 1, 1)
+    ldc.set_channel_reference_offset(1, 0xFFFF)  # under range
+    ldc.set_register(ldc.LDC1X1Y_ERROR_CONFIG, 0x8000, mask=0x8000)  # UR_ERR2OUT
+    ldc.sleep_mode = False
+    stream = LDCStream(ldc, channels=[0, 1], fclk=40e6, capacity=8)
+    with bus.clock.patch_sleep():
+        samples = stream.acquire(3)
+        assert device.registers[0x1B] & 0xE000 == 0x8000
+        assert stream.interval == pytest.approx(2 * (16 * 0x80 + 32) / 40e6)
+        assert samples.shape == (3,)
+        assert samples['value'].tolist() == [[0x01000000, 0]] * 3
+        assert samples['error'].tolist() == [[0, 0x8]] * 3
+        assert stream.timeouts == 0
+        stream.start()
+        stream.stop()
+        assert stream.acquire(2).shape == (2,)  # stop() does not affect later acquisitions
+
+
+def test_ldc_stream_edge_source(monkeypatch):
+    class EdgeSource:
+        ''' INTB: falls on data ready if DRDY_2INT is set and stays low until STATUS is read. '''
+        def __init__(self):
+            self.events = 0
+            self.status_reads = 0
+
+        def poll(self, timeout):
+            assert device.registers[0x19] & 0x0001, 'DRDY_2INT not enabled'
+            assert self.status_reads == self.events, 'INTB not released'
+            device.update()
+            while not device.registers[0x18] & 0x0040:
+                bus.clock.sleep(10e-6)
+                device.update()
+            return True
+
+        def read_event(self):
+            self.events += 1
+
+    edge_source = EdgeSource()
+    read_register = device.read_register
+
+    def record_read(register):
+        edge_source.status_reads += register == 0x18
+        return read_register(register)
+    monkeypatch.setattr(device, 'read_register', record_read)
+    ldc = LDC161X(bus, 0x2A)
+    device.sensor_frequency[2] = 2.5e6
+    ldc.sleep_mode = False
+    samples = LDCStream(ldc, channels=[2], edge_source=edge_source).acquire(4)
+    assert device.registers[0x1A] & 0xC000 == 0x8000
+    assert samples['value'].tolist() == [[0x01000000]] * 4
+    assert edge_source.events == 4
+
+
+def test_ldc_vectorized_conversion():
+    ldc = LDC161X(bus, 0x2A)
+    device.registers.update({0x0C: 0x0000, 0x14: 0x2002})
+    config = ldc.get_channel_config(0, fclk=40e6)
+    assert config == LDCChannelConfig(fref=20e6, fin_div=2, offset=0, data_bits=28)
+    device.registers[0x14] = 0x1001
+    assert ldc.get_channel_config(0, fclk=40e6) is config
+    raw, err = decode_data([0x0100, 0x8200], [0x0000, 0x0000])
+    assert raw.tolist() == [0x01000000, 0x02000000]
+    freq = raw_to_frequency(raw, config)
+    assert freq.tolist() == pytest.approx([2 * 20e6 / 16, 2 * 20e6 / 8])
+    inductance = frequency_to_inductance(freq, 100e-12)
+    assert inductance[0] == pytest.approx(1 / ((2 * math.pi * 2.5e6)**2 * 100e-12))
+    flags = error_flags(err)
+    assert flags['under_range'].tolist() == [False, True] and flags['any'].tolist() == [False, True]
+
+
+def test_ldc141x_data_bits_follow_gain():
+    ldc = LDC141X(bus, 0x2B)
+    ldc.set_output_gain(0b10)
+    assert ldc.get_data_bits() == 15
+
+
+def test_ldc_configuration_batches_writes(monkeypatch):
+    ldc = LDC161X(bus, 0x2A)
+    writes = record_writes(monkeypatch, device)
+    transactions = bus.transactions
+    with ldc.configuration():
+        ldc.sleep_mode = True
+        ldc.current_override_enable = True
+        ldc.automatic_amplitude_correction = False
+        ldc.configure_sequential_channels(4)
+        ldc.set_deglitch_filter_value(0b101)
+        ldc.set_channel_reference_settling_count(0, 0x000A)
+        ldc.set_channel_reference_settling_count(1, 0x000A)
+        ldc.set_channel_reference_count(2, 0x0080)  # unchanged
+        assert ldc.sleep_mode
+    assert register_writes(writes) == [0x10, 0x1B, 0x1A]  # CONFIG last
+    assert bus.transactions == transactions + 2  # preload + flush
+    assert device.registers[0x1A] == 0x2801 | (1 << 12) | (1 << 10)
+    assert device.registers[0x1B] == 0xC000 | 0x0208 | 0b101
+    assert device.registers[0x10] == device.registers[0x11] == 0x000A
+
+
+def test_ldc_configuration_writes_in_sleep_mode(monkeypatch):
+    ldc = LDC161X(bus, 0x2A)
+    ldc.sleep_mode = False
+    writes = record_writes(monkeypatch, device)
+    with ldc.configuration():
+        ldc.sleep_mode = True
+        ldc.set_channel_reference_count(0, 0x0100)
+        ldc.configure_sequential_channels(2)
+        ldc.set_channel_drive_current(0, 0x0F)
+        ldc.sleep_mode = False
+    # Awake device: sleep first, channel/MUX/drive registers, then wake up
+    assert register_writes(writes) == [0x1A, 0x08, 0x1B, 0x1E, 0x1A]
+    config_writes = [data for data in writes if data[0] == 0x1A and len(data) > 1]
+    assert config_writes == [bytes([0x1A, 0x28, 0x01]), bytes([0x1A, 0x08, 0x01])]
+
+    # Asleep device woken up: CONFIG after all other registers
+    ldc.sleep_mode = True
+    writes.clear()
+    with ldc.configuration():
+        ldc.set_channel_reference_count(0, 0x0200)
+        ldc.sleep_mode = False
+    assert register_writes(writes) == [0x08, 0x1A]
+    assert device.registers[0x1A] == 0x0801 and device.registers[0x08] == 0x0200
+
+
+def test_ldc_configuration_keeps_status():
+    ldc = LDC161X(bus, 0x2A)
+    ldc.sleep_mode = False
+    bus.clock.sleep(0.01)
+    device.update()
+    status = device.registers[0x18]
+    assert status & 0x0040
+    with ldc.configuration():
+        pass
+    assert device.registers[0x18] == status  # preload does not read (and clear) STATUS
+
+
+def test_ldc_configuration_discarded_on_error():
+    ldc = LDC161X(bus, 0x2A)
+    with pytest.raises(RuntimeError):
+        with ldc.configuration():
+            ldc.sleep_mode = False
+            raise RuntimeError()
+    assert device.registers[0x1A] == 0x2801
+
+
+def test_ldc_timing_plan(monkeypatch):
+    ldc = LDC161X(bus, 0x2A)
+    plan = ldc.plan_timing(fclk=40e6, fsensor_min=2e6, fsensor_max=3e6, num_chs=4, sample_rate=100.0)
+    assert plan.fref_div == 2 and plan.fin_div == 1 and plan.deglitch == 0b100
+    assert plan.sample_rate >= 100.0
+    assert plan.sample_rate == pytest.approx(100.0, rel=0.01)
+    assert ldc.plan_timing(40e6, 10e6, 12e6, 1, 10.0).fin_div == 2
+    with pytest.raises(ValueError):
+        ldc.plan_timing(40e6, 2e6, 3e6, 4, 1e6)
+    writes = record_writes(monkeypatch, device)
+    ldc.apply_timing_plan(plan)
+    assert register_writes(writes) == [0x08, 0x10, 0x1B]
+    assert [device.registers[0x08 + ch] for ch in range(4)] == [plan.rcount] * 4
+    assert [device.registers[0x14 + ch] for ch in range(4)] == [0x1002] * 4
+
+
+def test_ldc_array_scan():
+    buses = [SimI2C('/dev/i2c-4'), SimI2C('/dev/i2c-5')]
+    sensors = []
+    for index, array_bus in enumerate(buses):
+        array_bus.open()
+        for address in (0x2A, 0x2B):
+            sim = array_bus.attach(address, SimLDC1614())
+            sim.registers.update({0x01: 10 * index + address, 0x03: 0x0001, 0x02: 0x8000})
+            sensors.append(LDC161X(array_bus, address))
+    with LDCArray(sensors, num_chs=2) as array:
+        assert len(array.bus_groups) == 2
+        frames = array.acquire(3)
+    assert frames['value'].shape == (3, 4, 2)
+    assert frames['value'][-1, :, 0].tolist() == [0x2A, 0x2B, 0x34, 0x35]
+    assert frames['error'][-1, :, 1].tolist() == [0x8] * 4
+    assert not array.is_open
+
+
+def test_ldc_array_reopen_and_device_failure():
+    buses = [SimI2C('/dev/i2c-6'), SimI2C('/dev/i2c-7')]
+    for array_bus in buses:
+        array_bus.open()
+        array_bus.attach(0x2A, SimLDC1614()).registers[0x01] = 0x0042
+    sensors = [LDC161X(array_bus, 0x2A) for array_bus in buses]
+    array = LDCArray(sensors, num_chs=1)
+    for _ in range(2):  # reusable after close()
+        with array:
+            assert array.acquire(3).shape == (3,)
+    array.start()
+    array.stop()
+    assert array.acquire(2).shape == (2,)
+
+    # Unexpected failure of a device is raised instead of hanging its bus worker
+    sensors[1].read_all_channels = lambda num_chs: 1 / 0
+    with pytest.raises(RuntimeError):
+        array.scan()
+    del sensors[1].read_all_channels
+    assert array.scan()['value'][0, 0] == 0x0042
+    array.close()
+
+
+def test_ldc_array_concurrent_use():
+    buses = [SimI2C('/dev/i2c-8'), SimI2C('/dev/i2c-9')]
+    for array_bus in buses:
+        array_bus.open()
+        array_bus.attach(0x2A, SimLDC1614())
+    sensors = [LDC161X(array_bus, address) for array_bus in buses for address in (0x2A, 0x2B)]  # 0x2B missing
+    with LDCArray(sensors, num_chs=1, capacity=256) as array:
+        array.start()
+        with pytest.raises(RuntimeError):
+            array.acquire(1)
+        array.stop()
+
+        # Scans from several threads are serialized (frames stay paired) and bus errors of all workers counted
+        frames, errors = array.buffer.count, array.bus_errors
+        threads = [threading.Thread(target=lambda: [array.scan() for _ in range(20)]) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5.0)
+        assert not any(thread.is_alive() for thread in threads)
+        assert array.buffer.count == frames + 60
+        assert array.bus_errors == errors + 60 * 2
+        assert array.latest(1)['error'][0, :, 0].tolist() == [0, 0xFF, 0, 0xFF]
@@ -0,0 +1,27 @@
+''' Register-level simulators of supported chips on a simulated I2C bus. '''
+from typing import TYPE_CHECKING
+from pyrpiic.lazy import lazy_attributes
+
+__all__ = [
+    'LatencyModel', 'SimClock', 'SimI2C', 'SimDevice', 'SimRegisterDevice', 'SimEEPROM',
+    'SimLMK61E2', 'SimSI570',
+    'SimIOExpander', 'SimPCA9555', 'SimPCA9698', 'SimTCA6416A', 'SimTCA9535',
+    'SimHDC1080', 'SimLDC141X', 'SimLDC1412', 'SimLDC1414', 'SimLDC161X', 'SimLDC1612', 'SimLDC1614',
+]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {name: module for module, names in {
+    '.bus': ['LatencyModel', 'SimClock', 'SimI2C'],
+    '.clock': ['SimLMK61E2', 'SimSI570'],
+    '.device': ['SimDevice', 'SimRegisterDevice'],
+    '.eeprom': ['SimEEPROM'],
+    '.ioexpander': ['SimIOExpander', 'SimPCA9555', 'SimPCA9698', 'SimTCA6416A', 'SimTCA9535'],
+    '.sensor': ['SimHDC1080', 'SimLDC141X', 'SimLDC1412', 'SimLDC1414', 'SimLDC161X', 'SimLDC1612', 'SimLDC1614'],
+}.items() for name in names})
+
+if TYPE_CHECKING:
+    from .bus import LatencyModel, SimClock, SimI2C
+    from .clock import SimLMK61E2, SimSI570
+    from .device import SimDevice, SimRegisterDevice
+    from .eeprom import SimEEPROM
+    from .ioexpander import SimIOExpander, SimPCA9555, SimPCA9698, SimTCA6416A, SimTCA9535
+    from .sensor import SimHDC1080, SimLDC141X, SimLDC1412, SimLDC1414, SimLDC161X, SimLDC1612, SimLDC1614
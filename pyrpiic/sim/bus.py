@@ -0,0 +1,163 @@
+''' Simulated I2C bus w/ latency model. '''
+import errno
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from pyrpio.i2c.types import I2CBase, I2CError, I2CMessage
+
+
+class SimClock:
+    '''
+    Time source shared by a simulated bus and its devices.
+
+    In virtual mode (default) time only advances through sleep() and bus latency, so simulations are
+    fast and deterministic. In realtime mode time follows time.monotonic() and sleeps really sleep.
+    '''
+
+    def __init__(self, realtime: bool = False):
+        self.realtime = realtime
+        self._virtual = 0.0
+        self._origin = time.monotonic()
+        self._sleep = time.sleep
+
+    def now(self) -> float:
+        ''' Current time (s). '''
+        if self.realtime:
+            return time.monotonic() - self._origin
+        return self._virtual
+
+    def sleep(self, seconds: float):
+        ''' Advance time by seconds. '''
+        if seconds <= 0:
+            return
+        if self.realtime:
+            self._sleep(seconds)
+        else:
+            self._virtual += seconds
+
+    @contextmanager
+    def patch_sleep(self):
+        ''' Route time.sleep calls (e.g. driver conversion delays) to this clock. '''
+        original = time.sleep
+        self._sleep = original
+        time.sleep = self.sleep
+        try:
+            yield self
+        finally:
+            time.sleep = original
+
+
+@dataclass
+class LatencyModel:
+    '''
+    Transaction cost: overhead + (address byte + payload bytes) × 9 bits ÷ bus frequency.
+
+    Args:
+        frequency (float): SCL frequency (Hz). Defaults to 100 kHz.
+        overhead (float): Fixed cost per transaction, e.g. syscall + START/STOP (s). Defaults to 50 µs.
+    '''
+    frequency: float = 100e3
+    overhead: float = 50e-6
+
+    def cost(self, num_bytes: int, segments: int = 1) -> float:
+        ''' Time of a transaction moving num_bytes payload bytes in segments (START + address) parts. '''
+        return self.overhead + (num_bytes + segments) * 9 / self.frequency
+
+
+class SimI2C(I2CBase):
+    '''
+    Simulated I2C bus. Devices are attached by address; addressing a missing device or a device
+    that does not acknowledge raises I2CError w/ errno EREMOTEIO like the Linux driver.
+    '''
+
+    def __init__(self, path: str = '/dev/i2c-sim', clock: Optional[SimClock] = None,
+                 latency: Optional[LatencyModel] = None):
+        self.path = path
+        self.clock = clock or SimClock()
+        self.latency = latency or LatencyModel()
+        self.devices: Dict[int, 'SimDevice'] = {}
+        self.transactions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._address = 0x0
+        self._open = False
+
+    def attach(self, address: int, device):
+        ''' Attach simulated device at address. '''
+        device.attach(self.clock)
+        self.devices[address & 0x7F] = device
+        return device
+
+    def detach(self, address: int):
+        ''' Remove device at address. '''
+        self.devices.pop(address & 0x7F, None)
+
+    def open(self):
+        if not self._open:
+            self._open = True
+            self._address = 0x0
+
+    def close(self):
+        self._open = False
+
+    def _check_open(self):
+        if not self._open:
+            raise I2CError(f'Bus: {self.path} is not open')
+
+    def _device(self, address: int):
+        device = self.devices.get(address & 0x7F)
+        if device is None:
+            raise I2CError(errno.EREMOTEIO, 'Remote I/O error')
+        return device
+
+    def _account(self, written: int, read: int, segments: int = 1):
+        self.transactions += 1
+        self.bytes_written += written
+        self.bytes_read += read
+        self.clock.sleep(self.latency.cost(written + read, segments))
+
+    def set_address(self, address: int):
+        self._check_open()
+        self._address = address & 0x7F
+
+    def read(self, length: int = 1) -> bytes:
+        self._check_open()
+        self._account(0, length)
+        return bytes(self._device(self._address).read(length))
+
+    def write(self, data: bytes):
+        self._check_open()
+        self._account(len(data), 0)
+        self._device(self._address).write(bytes(data))
+
+    def read_write(self, data: bytes, length: int = 1) -> bytes:
+        self._check_open()
+        self._account(len(data), length, segments=2)
+        device = self._device(self._address)
+        device.write(bytes(data))
+        return bytes(device.read(length))
+
+    def transfer(self, address: int, messages: List[I2CMessage]):
+        self._check_open()
+        if not isinstance(messages, list):
+            raise TypeError("Invalid messages type, should be list of I2C.Message.")
+        if len(messages) == 0:
+            raise ValueError("Invalid messages data, should be non-zero length.")
+        self._account(sum(len(m.data) for m in messages), 0, segments=len(messages))
+        device = self._device(address)
+        for message in messages:
+            if message.read:
+                data = device.read(len(message.data))
+                if isinstance(message.data, list):
+                    message.data = list(data)
+                elif isinstance(message.data, bytearray):
+                    message.data = bytearray(data)
+                else:
+                    message.data = bytes(data)
+            else:
+                device.write(bytes(bytearray(message.data)))
+
+    def detect(self, first: int = 0x03, last: int = 0x77, data: Optional[bytes] = None, length: int = 1) -> List[int]:
+        self._check_open()
+        return [address for address in range(first, last + 1) if address in self.devices]
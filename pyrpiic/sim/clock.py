@@ -0,0 +1,157 @@
+''' Simulated clock ICs: LMK61E2 and SI570. '''
+from typing import Dict, Optional
+from .device import SimRegisterDevice
+
+LMK61E2_NVMCTL = 49
+LMK61E2_NVMCTL_REGCOMMIT = 0x40
+LMK61E2_NVMCTL_NVMBUSY = 0x04
+LMK61E2_NVMCTL_NVMPROG = 0x01
+LMK61E2_NVMUNLK = 56
+LMK61E2_NVMUNLK_KEY = 0xBE
+LMK61E2_PLL_REGISTERS = range(21, 36)
+
+SI570_FXTAL = 114.285e6
+SI570_RESET_REGISTER = 135
+SI570_RESET_RST = 0x80
+SI570_RESET_NEWFREQ = 0x40
+SI570_RESET_RECALL = 0x01
+SI570_FREEZE_REGISTER = 137
+SI570_FREEZE_DCO = 0x10
+
+
+class SimLMK61E2(SimRegisterDevice):
+    '''
+    LMK61E2 register model. Power-on output is 156.25 MHz LVDS. Reserved bits of the PLL
+    registers read back as 0. Writing NVMCTL.REGCOMMIT keeps R49.6 set for commit_time and
+    NVMCTL.NVMPROG (after NVMUNLK = 0xBE) keeps NVMBUSY (R49.2) set for program_time.
+    '''
+    RESET_VALUES = {
+        0: 0x10, 1: 0x0B, 2: 0x33, 3: 0x00,
+        21: 0x02,  # LVDS
+        22: 0x00, 23: 0x20,  # OUTDIV = 32
+        24: 0x00,
+        25: 0x00, 26: 0x32,  # INT = 50
+        27: 0x00, 28: 0x00, 29: 0x00,  # NUM = 0
+        30: 0x00, 31: 0x00, 32: 0x01,  # DEN = 1
+        33: 0x0C,  # DMC = 3, MEO = 0 (integer mode)
+        34: 0x28,  # PLL_D = 1, CP = 8
+        35: 0x03,  # PS = 0, C3 = 0
+        49: 0x00, 56: 0x00,
+    }
+    WRITABLE = {
+        21: 0x03, 22: 0x01, 23: 0xFF, 25: 0x0F, 26: 0xFF, 27: 0x3F, 28: 0xFF, 29: 0xFF,
+        30: 0x3F, 31: 0xFF, 32: 0xFF, 33: 0x0F, 34: 0x2F, 35: 0x77, 56: 0xFF,
+    }
+
+    def __init__(self, commit_time: float = 0.001, program_time: float = 0.1):
+        '''
+        Args:
+            commit_time (float, optional): Register to SRAM copy time (s). Defaults to 1 ms.
+            program_time (float, optional): EEPROM program time (s). Defaults to 100 ms.
+        '''
+        self.commit_time = commit_time
+        self.program_time = program_time
+        self.nvm: Dict[int, int] = {}
+        self.nvm_writes = 0
+        self._sram: Dict[int, int] = {}
+        self._commit_done = 0.0
+        self._program_done = 0.0
+        super().__init__()
+
+    def read_register(self, register: int) -> int:
+        if register == LMK61E2_NVMCTL:
+            now = self.clock.now()
+            value = self.registers.get(register, 0)
+            if now < self._commit_done:
+                value |= LMK61E2_NVMCTL_REGCOMMIT
+            if now < self._program_done:
+                value |= LMK61E2_NVMCTL_NVMBUSY
+            return value
+        return super().read_register(register)
+
+    def write_register(self, register: int, value: int):
+        if register == LMK61E2_NVMCTL:
+            now = self.clock.now()
+            if value & LMK61E2_NVMCTL_REGCOMMIT:
+                self._sram = {r: self.registers.get(r, 0) for r in LMK61E2_PLL_REGISTERS}
+                self._commit_done = now + self.commit_time
+            if value & LMK61E2_NVMCTL_NVMPROG and self.registers.get(LMK61E2_NVMUNLK) == LMK61E2_NVMUNLK_KEY:
+                self.nvm = dict(self._sram)
+                self.nvm_writes += 1
+                self._program_done = max(now, self._commit_done) + self.program_time
+            return
+        super().write_register(register, value)
+
+    @property
+    def frequency(self) -> float:
+        ''' Output frequency (Hz) of active registers. '''
+        r = self.registers
+        out_div = ((r[22] & 0x01) << 8) | r[23]
+        int_div = ((r[25] & 0x0F) << 8) | r[26]
+        num = ((r[27] & 0x3F) << 16) | (r[28] << 8) | r[29]
+        den = ((r[30] & 0x3F) << 16) | (r[31] << 8) | r[32]
+        pll_d = (r[34] >> 5) & 0x01
+        frac = num / den if den and r[33] & 0x03 else 0.0
+        return 50e6 * 2 * pll_d * (int_div + frac) / out_div if out_div else 0.0
+
+
+class SimSI570(SimRegisterDevice):
+    '''
+    SI570 register model (7 ppm / 20 ppm, registers 7-12). Power-on output is 100 MHz.
+    The output frequency only changes when NewFreq is written and writes to the frequency
+    registers while the DCO is not frozen are counted in unfrozen_writes. NewFreq, RECALL
+    and RST bits self clear.
+    '''
+    WRITABLE = {7: 0xFF, 8: 0xFF, 9: 0xFF, 10: 0xFF, 11: 0xFF, 12: 0xFF, SI570_FREEZE_REGISTER: SI570_FREEZE_DCO}
+
+    def __init__(self, fxtal: float = SI570_FXTAL, startup: Optional[Dict[int, int]] = None):
+        '''
+        Args:
+            fxtal (float, optional): Internal crystal frequency (Hz). Defaults to 114.285 MHz.
+            startup (Dict[int, int], optional): NVM startup values of registers 7-12. Defaults to 100 MHz.
+        '''
+        self.fxtal = fxtal
+        self.startup = startup or self.encode(5, 10, 5e9 / fxtal)
+        self.unfrozen_writes = 0
+        self.frequency = 0.0
+        super().__init__()
+
+    @staticmethod
+    def encode(hs_div: int, n1: int, rfreq: float, base: int = 7) -> Dict[int, int]:
+        ''' Register values for HS_DIV, N1 and RFREQ. '''
+        value = ((hs_div - 4) << 45) | ((n1 - 1) << 38) | int(rfreq * 2 ** 28)
+        return {base + i: b for i, b in enumerate(value.to_bytes(6, byteorder='big'))}
+
+    def decode(self, base: int = 7):
+        ''' HS_DIV, N1 and RFREQ of registers. '''
+        value = int.from_bytes(bytes(self.registers.get(base + i, 0) for i in range(6)), byteorder='big')
+        return (value >> 45) + 4, ((value >> 38) & 0x7F) + 1, (value & ((1 << 38) - 1)) / 2 ** 28
+
+    def reset(self):
+        super().reset()
+        self.registers.update(self.startup)
+        self.registers[SI570_RESET_REGISTER] = 0x00
+        self.registers[SI570_FREEZE_REGISTER] = 0x00
+        self._update_frequency()
+
+    def _update_frequency(self):
+        hs_div, n1, rfreq = self.decode()
+        self.frequency = self.fxtal * rfreq / (hs_div * n1)
+
+    @property
+    def frozen(self) -> bool:
+        ''' DCO is frozen. '''
+        return bool(self.registers.get(SI570_FREEZE_REGISTER, 0) & SI570_FREEZE_DCO)
+
+    def write_register(self, register: int, value: int):
+        if register == SI570_RESET_REGISTER:
+            if value & SI570_RESET_RST:
+                self.reset()
+            elif value & SI570_RESET_RECALL:
+                self.registers.update(self.startup)
+            if value & SI570_RESET_NEWFREQ:
+                self._update_frequency()
+            return
+        if 7 <= register <= 12 and not self.frozen:
+            self.unfrozen_writes += 1
+        super().write_register(register, value)
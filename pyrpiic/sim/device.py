@@ -0,0 +1,94 @@
+''' Base models for simulated I2C register devices. '''
+import errno
+from typing import Dict, Optional
+from pyrpio.i2c.types import I2CError
+from .bus import SimClock
+
+
+def nack():
+    ''' Error raised when device does not acknowledge. '''
+    return I2CError(errno.EREMOTEIO, 'Remote I/O error')
+
+
+class SimDevice:
+    ''' Simulated I2C device. write() receives every written message, read() serves every read. '''
+    clock: SimClock
+
+    def __init__(self):
+        self.clock = SimClock()
+
+    def attach(self, clock: SimClock):
+        ''' Called when attached to a bus sharing clock. '''
+        self.clock = clock
+
+    def write(self, data: bytes):
+        ''' Handle message written by host. '''
+        raise NotImplementedError()
+
+    def read(self, length: int) -> bytes:
+        ''' Serve length bytes read by host (raise nack() to not acknowledge). '''
+        raise NotImplementedError()
+
+
+class SimRegisterDevice(SimDevice):
+    '''
+    Device w/ 1-byte register pointer followed by big-endian registers of DATA_BYTES each.
+
+    RESET_VALUES holds power-on values. WRITABLE maps register to mask of writable bits; registers
+    missing from WRITABLE are read-only and reserved bits keep their value. Subclasses customize
+    auto-increment by overriding next_register() and side effects via read_register()/write_register().
+    '''
+    DATA_BYTES = 1
+    RESET_VALUES: Dict[int, int] = {}
+    WRITABLE: Dict[int, int] = {}
+
+    def __init__(self):
+        super().__init__()
+        self.registers: Dict[int, int] = {}
+        self.pointer = 0x00
+        self.auto_increment = True
+        self.reset()
+
+    def reset(self):
+        ''' Restore power-on register values. '''
+        self.registers = dict(self.RESET_VALUES)
+        self.pointer = 0x00
+
+    def decode_command(self, command: int):
+        ''' Set register pointer (and auto-increment flag) from command byte. '''
+        self.pointer = command
+        self.auto_increment = True
+
+    def next_register(self, register: int) -> int:
+        ''' Register accessed after register during sequential access. '''
+        return (register + 1) & 0xFF if self.auto_increment else register
+
+    def read_register(self, register: int) -> int:
+        ''' Value returned when register is read. '''
+        return self.registers.get(register, 0)
+
+    def write_register(self, register: int, value: int):
+        ''' Apply host write honoring read-only and reserved bits. '''
+        mask: Optional[int] = self.WRITABLE.get(register)
+        if mask is None:
+            return
+        self.registers[register] = (self.registers.get(register, 0) & ~mask) | (value & mask)
+
+    def write(self, data: bytes):
+        if not data:
+            return
+        self.decode_command(data[0])
+        register = self.pointer
+        payload = data[1:]
+        for i in range(0, len(payload) - self.DATA_BYTES + 1, self.DATA_BYTES):
+            self.write_register(register, int.from_bytes(payload[i:i + self.DATA_BYTES], byteorder='big'))
+            register = self.next_register(register)
+
+    def read(self, length: int) -> bytes:
+        data = bytearray()
+        register = self.pointer
+        while len(data) < length:
+            data += self.read_register(register).to_bytes(self.DATA_BYTES, byteorder='big')
+            register = self.next_register(register)
+        self.pointer = register
+        return bytes(data[:length])
@@ -0,0 +1,55 @@
+''' Simulated I2C EEPROM. '''
+from typing import List
+from .device import SimDevice, nack
+
+
+class SimEEPROM(SimDevice):
+    '''
+    Paged EEPROM w/ pointer_bytes address pointer. Writes roll over within a page and start an
+    internal write cycle during which the device does not acknowledge. Reads roll over at the
+    end of memory.
+    '''
+
+    def __init__(self, pages: int = 16, pointer_bytes: int = 1, page_bytes: int = 16, write_time: float = 0.005):
+        '''
+        Args:
+            pages (int, optional): Page count. Defaults to 16.
+            pointer_bytes (int, optional): Address pointer bytes. Defaults to 1.
+            page_bytes (int, optional): Bytes per page. Defaults to 16.
+            write_time (float, optional): Write cycle time (s). Defaults to 5 ms.
+        '''
+        super().__init__()
+        self.pointer_bytes = pointer_bytes
+        self.page_bytes = page_bytes
+        self.write_time = write_time
+        self.memory = bytearray([0xFF] * (pages * page_bytes))
+        self.pointer = 0
+        self.write_cycles = 0
+        self.write_cycle_starts: List[float] = []  # clock time of each write cycle start
+        self._busy_until = 0.0
+
+    def _check_ready(self):
+        if self.clock.now() < self._busy_until:
+            raise nack()
+
+    def write(self, data: bytes):
+        self._check_ready()
+        if len(data) < self.pointer_bytes:
+            return
+        address = int.from_bytes(data[:self.pointer_bytes], byteorder='big') % len(self.memory)
+        payload = data[self.pointer_bytes:]
+        page = address - address % self.page_bytes
+        for i, value in enumerate(payload):
+            self.memory[page + (address - page + i) % self.page_bytes] = value
+        self.pointer = address
+        if payload:
+            self.pointer = page + (address - page + len(payload)) % self.page_bytes
+            self.write_cycles += 1
+            self.write_cycle_starts.append(self.clock.now())
+            self._busy_until = self.clock.now() + self.write_time
+
+    def read(self, length: int) -> bytes:
+        self._check_ready()
+        data = bytes(self.memory[(self.pointer + i) % len(self.memory)] for i in range(length))
+        self.pointer = (self.pointer + length) % len(self.memory)
+        return data
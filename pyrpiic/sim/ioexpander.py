@@ -0,0 +1,116 @@
+''' Simulated GPIO expanders: TCA6416A, PCA9555, TCA9535 and PCA9698. '''
+from typing import List
+from .device import SimRegisterDevice
+
+
+class SimIOExpander(SimRegisterDevice):
+    '''
+    GPIO expander w/ input, output, polarity and configuration register banks of NUM_PORTS each.
+
+    External pin levels are set w/ the pins attribute (one byte per port). Input registers are
+    read-only and reflect pin levels for inputs and output latches for outputs, inverted by polarity.
+    '''
+    NUM_PORTS = 2
+    INPUT_BASE = 0x00
+    OUTPUT_BASE = 0x02
+    POLARITY_BASE = 0x04
+    CONFIG_BASE = 0x06
+
+    def __init__(self):
+        self.pins: List[int] = [0x00] * self.NUM_PORTS
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        for port in range(self.NUM_PORTS):
+            self.registers[self.OUTPUT_BASE + port] = 0xFF
+            self.registers[self.POLARITY_BASE + port] = 0x00
+            self.registers[self.CONFIG_BASE + port] = 0xFF
+
+    def bank(self, register: int):
+        ''' (bank base, port) of register or None. '''
+        for base in (self.INPUT_BASE, self.OUTPUT_BASE, self.POLARITY_BASE, self.CONFIG_BASE):
+            if base <= register < base + self.NUM_PORTS:
+                return base, register - base
+        return None
+
+    def output_levels(self, port: int) -> int:
+        ''' Levels driven on port (inputs read as 1 w/ pull-up). '''
+        config = self.registers[self.CONFIG_BASE + port]
+        return (self.registers[self.OUTPUT_BASE + port] & ~config | config) & 0xFF
+
+    def read_register(self, register: int) -> int:
+        location = self.bank(register)
+        if location is None:
+            return 0x00
+        base, port = location
+        if base == self.INPUT_BASE:
+            config = self.registers[self.CONFIG_BASE + port]
+            levels = (self.pins[port] & config) | (self.registers[self.OUTPUT_BASE + port] & ~config & 0xFF)
+            return levels ^ self.registers[self.POLARITY_BASE + port]
+        return self.registers[register]
+
+    def write_register(self, register: int, value: int):
+        location = self.bank(register)
+        if location is None or location[0] == self.INPUT_BASE:
+            return
+        self.registers[register] = value & 0xFF
+
+    def next_register(self, register: int) -> int:
+        # Pointer toggles within register pair
+        return register ^ 0x01
+
+
+class SimTCA6416A(SimIOExpander):
+    ''' TCA6416A 16-bit expander (command pointer toggles between port pair). '''
+
+
+class SimPCA9555(SimIOExpander):
+    ''' PCA9555 16-bit expander (command pointer toggles between port pair). '''
+
+
+class SimTCA9535(SimIOExpander):
+    ''' TCA9535 16-bit expander (command pointer toggles between port pair). '''
+
+
+class SimPCA9698(SimIOExpander):
+    '''
+    PCA9698 40-bit expander. Command bit 7 (AI) enables auto-increment, which rolls over
+    to the first register of the bank after the last port. The MODE register powers on as 0x02 (OCH).
+    '''
+    NUM_PORTS = 5
+    INPUT_BASE = 0x00
+    OUTPUT_BASE = 0x08
+    POLARITY_BASE = 0x10
+    CONFIG_BASE = 0x18
+    MODE = 0x2A
+    MODE_WRITABLE = 0x1B
+    AUTO_INCREMENT = 0x80
+
+    def reset(self):
+        super().reset()
+        self.registers[self.MODE] = 0x02
+
+    def read_register(self, register: int) -> int:
+        if register == self.MODE:
+            return self.registers[register]
+        return super().read_register(register)
+
+    def write_register(self, register: int, value: int):
+        if register == self.MODE:
+            self.registers[register] = value & self.MODE_WRITABLE
+            return
+        super().write_register(register, value)
+
+    def decode_command(self, command: int):
+        self.pointer = command & ~self.AUTO_INCREMENT
+        self.auto_increment = bool(command & self.AUTO_INCREMENT)
+
+    def next_register(self, register: int) -> int:
+        if not self.auto_increment:
+            return register
+        location = self.bank(register)
+        if location is None:
+            return (register + 1) & 0x3F
+        base, port = location
+        return base + (port + 1) % self.NUM_PORTS
@@ -0,0 +1,299 @@
+''' Simulated sensors: HDC1080, LDC1412/LDC1414 and LDC1612/LDC1614. '''
+from typing import List, Optional
+from .device import SimRegisterDevice, nack
+
+HDC1080_TEMPERATURE = 0x00
+HDC1080_HUMIDITY = 0x01
+HDC1080_CONFIG = 0x02
+HDC1080_CONFIG_RESET = 0x8000
+HDC1080_CONFIG_MODE = 0x1000
+HDC1080_CONFIG_BTST = 0x0800
+HDC1080_CONFIG_TRES = 0x0400
+HDC1080_CONFIG_HRES = 0x0300
+HDC1080_TEMPERATURE_TIMES = {0: 6.35e-3, 1: 3.65e-3}
+HDC1080_HUMIDITY_TIMES = {0: 6.5e-3, 1: 3.85e-3, 2: 2.5e-3, 3: 2.5e-3}
+HDC1080_RESOLUTION_MASKS = {14: 0xFFFC, 11: 0xFFE0, 8: 0xFF00}
+
+LDC_STATUS = 0x18
+LDC_CONFIG = 0x1A
+LDC_MUX_CONFIG = 0x1B
+LDC_RESET_DEV = 0x1C
+LDC_STATUS_UR = 0x2000
+LDC_STATUS_OR = 0x1000
+LDC_STATUS_DRDY = 0x0040
+LDC_CONFIG_SLEEP = 0x2000
+LDC_MUX_AUTOSCAN = 0x8000
+LDC_SEQUENCES = {0b00: (0, 1), 0b01: (0, 1, 2), 0b10: (0, 1, 2, 3), 0b11: (0, 1)}
+
+
+class SimHDC1080(SimRegisterDevice):
+    '''
+    HDC1080 model. Writing pointer 0x00/0x01 starts a conversion (temperature + humidity in
+    acquisition mode) whose duration follows the configured resolutions; reads NACK until it
+    completes. Results come from the temperature (°C) and humidity (%RH) attributes truncated to
+    the configured resolution.
+    '''
+    DATA_BYTES = 2
+    RESET_VALUES = {
+        HDC1080_CONFIG: 0x1000,
+        0xFB: 0x0123, 0xFC: 0x4567, 0xFD: 0x8900,
+        0xFE: 0x5449, 0xFF: 0x1050,
+    }
+    WRITABLE = {HDC1080_CONFIG: 0x3700}
+
+    def __init__(self, temperature: float = 25.0, humidity: float = 40.0):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.battery_low = False
+        self.conversions = 0
+        self._ready_at: Optional[float] = None
+        self._result: List[int] = [0, 0]
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self._ready_at = None
+
+    @property
+    def temperature_bits(self) -> int:
+        ''' Configured temperature resolution (bits). '''
+        return 11 if self.registers[HDC1080_CONFIG] & HDC1080_CONFIG_TRES else 14
+
+    @property
+    def humidity_bits(self) -> int:
+        ''' Configured humidity resolution (bits). '''
+        return {0: 14, 1: 11}.get((self.registers[HDC1080_CONFIG] & HDC1080_CONFIG_HRES) >> 8, 8)
+
+    def conversion_time(self, register: int) -> float:
+        ''' Duration of conversion triggered by pointer write (s). '''
+        config = self.registers[HDC1080_CONFIG]
+        temperature = HDC1080_TEMPERATURE_TIMES[int(bool(config & HDC1080_CONFIG_TRES))]
+        humidity = HDC1080_HUMIDITY_TIMES[(config & HDC1080_CONFIG_HRES) >> 8]
+        if register == HDC1080_HUMIDITY:
+            return humidity
+        return temperature + humidity if config & HDC1080_CONFIG_MODE else temperature
+
+    def _convert(self):
+        temperature = int((self.temperature + 40.0) / 165.0 * 65536)
+        humidity = int(self.humidity / 100.0 * 65536)
+        self._result = [
+            max(0, min(temperature, 0xFFFF)) & HDC1080_RESOLUTION_MASKS[self.temperature_bits],
+            max(0, min(humidity, 0xFFFF)) & HDC1080_RESOLUTION_MASKS[self.humidity_bits],
+        ]
+
+    def read_register(self, register: int) -> int:
+        if register in (HDC1080_TEMPERATURE, HDC1080_HUMIDITY):
+            return self._result[register]
+        if register == HDC1080_CONFIG and self.battery_low:
+            return self.registers[register] | HDC1080_CONFIG_BTST
+        return super().read_register(register)
+
+    def write_register(self, register: int, value: int):
+        if register == HDC1080_CONFIG and value & HDC1080_CONFIG_RESET:
+            self.reset()
+            return
+        super().write_register(register, value)
+
+    def write(self, data: bytes):
+        super().write(data)
+        if len(data) == 1 and self.pointer in (HDC1080_TEMPERATURE, HDC1080_HUMIDITY):
+            self._ready_at = self.clock.now() + self.conversion_time(self.pointer)
+
+    def read(self, length: int) -> bytes:
+        if self.pointer in (HDC1080_TEMPERATURE, HDC1080_HUMIDITY) and self._ready_at is not None:
+            if self.clock.now() < self._ready_at:
+                raise nack()
+            self._ready_at = None
+            self._convert()
+            self.conversions += 1
+        return super().read(length)
+
+
+class SimLDC161X(SimRegisterDevice):
+    '''
+    LDC1612/LDC1614 model. While CONFIG.SLEEP_MODE_EN is clear the device converts the active
+    channel (or the AUTOSCAN sequence) continuously w/ settle, conversion and switch times derived
+    from SETTLECOUNT, RCOUNT and the clock dividers. Each finished conversion latches DATA from
+    sensor_frequency (Hz) and sets UNREADCONV; a finished sequence sets DRDY. Reading STATUS clears
+    DRDY and error flags and reading DATA_MSB_CHx clears UNREADCONVx.
+    '''
+    NUM_CHS = 4
+    DATA_BYTES = 2
+    DATA_MAX = 0x0FFFFFFF
+    RESET_VALUES = {
+        **{0x08 + ch: 0x0080 for ch in range(4)},
+        **{0x0C + ch: 0x0000 for ch in range(4)},
+        **{0x10 + ch: 0x0000 for ch in range(4)},
+        **{0x14 + ch: 0x0000 for ch in range(4)},
+        LDC_STATUS: 0x0000, 0x19: 0x0000, LDC_CONFIG: 0x2801, LDC_MUX_CONFIG: 0x020F, LDC_RESET_DEV: 0x0000,
+        **{0x1E + ch: 0x0000 for ch in range(4)},
+        0x7E: 0x5449, 0x7F: 0x3055,
+    }
+    WRITABLE = {
+        **{0x08 + ch: 0xFFFF for ch in range(4)},
+        **{0x0C + ch: 0xFFFF for ch in range(4)},
+        **{0x10 + ch: 0xFFFF for ch in range(4)},
+        **{0x14 + ch: 0xF3FF for ch in range(4)},
+        0x19: 0xF83D, LDC_CONFIG: 0xFEC0, LDC_MUX_CONFIG: 0xE007,
+        **{0x1E + ch: 0xF800 for ch in range(4)},
+    }
+
+    def __init__(self, fclk: float = 40e6, sensor_frequency: Optional[List[float]] = None):
+        '''
+        Args:
+            fclk (float, optional): Reference clock (Hz). Defaults to 40 MHz.
+            sensor_frequency (List[float], optional): Sensor frequency per channel (Hz). Defaults to 3 MHz.
+        '''
+        self.fclk = fclk
+        self.sensor_frequency = list(sensor_frequency or [3e6] * self.NUM_CHS)
+        self.conversions = 0
+        self._start = 0.0
+        self._done = 0
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        for ch in range(self.NUM_CHS):
+            self.registers[2 * ch] = 0x0000
+            self.registers[2 * ch + 1] = 0x0000
+        self._restart()
+
+    def attach(self, clock):
+        super().attach(clock)
+        self._restart()
+
+    def _restart(self):
+        self._start = self.clock.now()
+        self._done = 0
+
+    @property
+    def active(self) -> bool:
+        ''' Device is converting (not in sleep mode). '''
+        return not self.registers[LDC_CONFIG] & LDC_CONFIG_SLEEP
+
+    def sequence(self) -> tuple:
+        ''' Channels converted in order. '''
+        mux = self.registers[LDC_MUX_CONFIG]
+        if mux & LDC_MUX_AUTOSCAN:
+            return tuple(ch for ch in LDC_SEQUENCES[(mux >> 13) & 0b11] if ch < self.NUM_CHS)
+        return ((self.registers[LDC_CONFIG] >> 14) % self.NUM_CHS,)
+
+    def fref(self, ch: int) -> float:
+        ''' Channel reference frequency (Hz). '''
+        return self.fclk / max(self.registers[0x14 + ch] & 0x03FF, 1)
+
+    def channel_time(self, ch: int) -> float:
+        ''' Settle + conversion (+ switch when sequencing) time of channel (s). '''
+        fref = self.fref(ch)
+        settle_count = self.registers[0x10 + ch]
+        settle = 32 / fref if settle_count <= 1 else 16 * settle_count / fref
+        conversion = 16 * max(self.registers[0x08 + ch], 5) / fref
+        switch = 692e-9 + 5 / fref if len(self.sequence()) > 1 else 0.0
+        return settle + conversion + switch
+
+    def _latch(self, ch: int) -> int:
+        fref = self.fref(ch)
+        fin_div = max(self.registers[0x14 + ch] >> 12, 1)
+        ratio = self.sensor_frequency[ch] / (fin_div * fref) - self.registers[0x0C + ch] / 2 ** 16
+        value = int(ratio * 2 ** self.data_bits())
+        error_config = self.registers[0x19]
+        flags = 0
+        if value > self.DATA_MAX:
+            value = self.DATA_MAX
+            self.registers[LDC_STATUS] |= LDC_STATUS_OR | (ch << 14)
+            flags |= 0x4000 if error_config & 0x4000 else 0
+        elif value < 0:
+            value = 0
+            self.registers[LDC_STATUS] |= LDC_STATUS_UR | (ch << 14)
+            flags |= 0x8000 if error_config & 0x8000 else 0
+        self._store(ch, flags, value)
+        self.conversions += 1
+        return value
+
+    def data_bits(self) -> int:
+        ''' Fractional bits of channel data (DATA ÷ 2^bits = ƒSENSOR ÷ (ƒIN_DIV × ƒREF) - OFFSET ÷ 2^16). '''
+        return 28
+
+    def _store(self, ch: int, flags: int, value: int):
+        self.registers[2 * ch] = flags | (value >> 16)
+        self.registers[2 * ch + 1] = value & 0xFFFF
+
+    def update(self):
+        ''' Latch conversions finished since last update. '''
+        if not self.active:
+            return
+        sequence = self.sequence()
+        times = [self.channel_time(ch) for ch in sequence]
+        elapsed = self.clock.now() - self._start
+        cycles, remainder = divmod(elapsed, sum(times))
+        total = int(cycles) * len(sequence)
+        for duration in times:
+            if remainder < duration:
+                break
+            remainder -= duration
+            total += 1
+        # Only latest result of each channel is observable
+        for k in range(max(self._done, total - len(sequence)), total):
+            ch = sequence[k % len(sequence)]
+            self._latch(ch)
+            self.registers[LDC_STATUS] |= 1 << (3 - ch)
+            if k % len(sequence) == len(sequence) - 1:
+                self.registers[LDC_STATUS] |= LDC_STATUS_DRDY
+        self._done = max(self._done, total)
+
+    def read_register(self, register: int) -> int:
+        self.update()
+        value = super().read_register(register)
+        if register == LDC_STATUS:
+            self.registers[LDC_STATUS] &= 0x000F
+        elif register < 2 * self.NUM_CHS and register % 2 == 0:
+            self.registers[LDC_STATUS] &= ~(1 << (3 - register // 2))
+        return value
+
+    def write_register(self, register: int, value: int):
+        self.update()
+        if register == LDC_RESET_DEV and value & 0x8000:
+            self.reset()
+            return
+        was_active = self.active
+        super().write_register(register, value)
+        if register in (LDC_CONFIG, LDC_MUX_CONFIG) and (self.active or was_active):
+            self._restart()
+
+
+class SimLDC1612(SimLDC161X):
+    ''' 2-channel LDC1612. '''
+    NUM_CHS = 2
+
+
+class SimLDC1614(SimLDC161X):
+    ''' 4-channel LDC1614. '''
+    NUM_CHS = 4
+
+
+class SimLDC141X(SimLDC161X):
+    '''
+    LDC1412/LDC1414 model. Channel data is 12 bits in DATA_CHx (DATA_LSB_CHx unused) and
+    OUTPUT_GAIN (RESET_DEV bits 10:9) shifts it by 0, 2, 3 or 4 bits.
+    '''
+    DATA_MAX = 0x0FFF
+    GAIN_SHIFTS = (0, 2, 3, 4)
+    RESET_VALUES = {**SimLDC161X.RESET_VALUES, 0x7F: 0x3054}
+    WRITABLE = {**SimLDC161X.WRITABLE, LDC_RESET_DEV: 0x0600}
+
+    def data_bits(self) -> int:
+        return 12 + self.GAIN_SHIFTS[(self.registers[LDC_RESET_DEV] >> 9) & 0b11]
+
+    def _store(self, ch: int, flags: int, value: int):
+        self.registers[2 * ch] = flags | value
+        self.registers[2 * ch + 1] = 0x0000
+
+
+class SimLDC1412(SimLDC141X):
+    ''' 2-channel LDC1412. '''
+    NUM_CHS = 2
+
+
+class SimLDC1414(SimLDC141X):
+    ''' 4-channel LDC1414. '''
+    NUM_CHS = 4
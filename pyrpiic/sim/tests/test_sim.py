@@ -0,0 +1,134 @@
+import pytest
+
+from pyrpiic.clock.lmk61e2 import LMK61E2
+from pyrpiic.clock.si570 import SI570
+from pyrpiic.ioexpander import GPIODir, PCA9698, TCA6416A
+from pyrpiic.sensor.hdc1080 import HDC1080
+from pyrpiic.sensor.ldc141x import LDC141X
+from pyrpiic.sensor.ldc161x import LDC161X
+from pyrpiic.sim import (LatencyModel, SimClock, SimHDC1080, SimI2C, SimLDC1414, SimLDC1614, SimLMK61E2, SimPCA9698,
+                         SimSI570, SimTCA6416A)
+
+
+@pytest.fixture(name='bus')
+def fixture_bus():
+    bus = SimI2C('/dev/i2c-sim', clock=SimClock(), latency=LatencyModel(frequency=400e3, overhead=0.0))
+    bus.open()
+    with bus.clock.patch_sleep():
+        yield bus
+
+
+def test_sim_bus_latency_and_nack(bus):
+    bus.attach(0x20, SimTCA6416A())
+    bus.set_address(0x20)
+    bus.read_write(b'\x06', 2)
+    assert bus.clock.now() == pytest.approx(5 * 9 / 400e3)  # 2 address + 1 pointer + 2 data bytes
+    assert bus.detect() == [0x20]
+    bus.set_address(0x21)
+    with pytest.raises(OSError):
+        bus.read(1)
+
+
+def test_sim_lmk61e2_frequency_and_nvm(bus):
+    sim = bus.attach(0x5A, SimLMK61E2())
+    clock = LMK61E2(bus, 0x5A)
+    assert clock.get_frequency()[0] == pytest.approx(156.25e6)
+    clock.set_frequency(100e6, nonvolatile=True)
+    assert sim.frequency == pytest.approx(100e6)
+    assert clock.get_frequency()[0] == pytest.approx(100e6)
+    assert sim.nvm_writes == 1 and sim.nvm[23] == sim.registers[23]
+    assert bus.clock.now() >= sim.program_time
+
+
+def test_sim_si570_freeze_and_newfreq(bus):
+    sim = bus.attach(0x55, SimSI570())
+    clock = SI570(bus, 0x55)
+    assert clock.get_frequency()[0] == pytest.approx(100e6)
+    clock.set_frequency(156.25e6)
+    assert sim.frequency == pytest.approx(156.25e6)
+    assert sim.unfrozen_writes == 0
+    assert not sim.frozen
+
+
+def test_sim_expander_auto_increment(bus):
+    tca = bus.attach(0x20, SimTCA6416A())
+    pca = bus.attach(0x21, SimPCA9698())
+    bus.set_address(0x20)
+    bus.write(b'\x03\xAA\xBB')  # pointer toggles within pair: 0x03 then 0x02
+    assert (tca.registers[0x02], tca.registers[0x03]) == (0xBB, 0xAA)
+    bus.set_address(0x21)
+    bus.write(b'\x0C\x11\x22')  # no AI flag: both writes hit 0x0C
+    assert pca.registers[0x0C] == 0x22 and pca.registers[0x08] == 0xFF
+    bus.write(b'\x8C\x11\x22')  # AI rolls over to first port of bank
+    assert (pca.registers[0x0C], pca.registers[0x08]) == (0x11, 0x22)
+
+
+def test_sim_expander_drivers(bus):
+    tca = bus.attach(0x20, SimTCA6416A())
+    pca = bus.attach(0x21, SimPCA9698())
+    for driver, sim, out_pin, in_pin in ((TCA6416A(bus, 0x20), tca, 'P12', 'P00'),
+                                         (PCA9698(bus, 0x21), pca, 'IO1_2', 'IO0_0')):
+        driver.set_gpio_direction(out_pin, GPIODir.OUT)
+        driver.set_gpio_output(out_pin, False)
+        assert not driver.get_gpio_input(out_pin)  # input register reflects output latch
+        assert not driver.get_gpio_input(in_pin)
+        sim.pins[0] = 0x01
+        assert driver.get_gpio_input(in_pin)
+    bus.set_address(0x21)
+    bus.write(b'\x00\x55')  # input registers are read-only
+    assert pca.read_register(0x00) == 0x01
+
+
+def test_sim_hdc1080_conversion_timing(bus):
+    sim = bus.attach(0x40, SimHDC1080(temperature=30.0, humidity=55.0))
+    bus.set_address(0x40)
+    bus.write(b'\x00')
+    with pytest.raises(OSError):
+        bus.read(4)
+    sensor = HDC1080(bus, 0x40, poll_ready=True)
+    sensor.configure()
+    temperature, humidity = sensor.read_temperature_humidity()
+    assert temperature == pytest.approx(30.0, abs=0.02)
+    assert humidity == pytest.approx(55.0, abs=0.01)
+    sensor.set_humidity_resolution(HDC1080.HumidityResolution.eight)
+    assert sim.humidity_bits == 8
+    assert sensor.read_temperature_humidity()[1] == pytest.approx(55.0, abs=0.4)
+    assert sensor.read_manufacturer_id() == 0x5449 and sensor.read_device_id() == 0x1050
+
+
+def test_sim_ldc1614_data_ready(bus):
+    sim = bus.attach(0x2A, SimLDC1614(fclk=40e6, sensor_frequency=[2e6, 3e6, 4e6, 5e6]))
+    ldc = LDC161X(bus, 0x2A)
+    assert ldc.get_manufacturer_id() == 0x5449 and ldc.get_device_id() == 0x3055
+    with ldc.configuration():
+        for ch in range(2):
+            ldc.set_channel_reference_count(ch, 0x0400)
+            ldc.set_channel_reference_settling_count(ch, 0x000A)
+            ldc.set_channel_clock_dividers(ch, 1, 1)
+        ldc.configure_sequential_channels(2)
+        ldc.sleep_mode = False
+    assert not ldc.data_ready
+    cycle = sim.channel_time(0) + sim.channel_time(1)
+    bus.clock.sleep(cycle)
+    assert ldc.data_ready
+    assert not ldc.data_ready  # cleared by STATUS read
+    values = ldc.read_all_channels(num_chs=2)
+    assert values[0] == (int(2e6 / 40e6 * 2 ** 28), 0)
+    assert values[1] == (int(3e6 / 40e6 * 2 ** 28), 0)
+    ldc.sleep_mode = True
+    conversions = sim.conversions
+    bus.clock.sleep(10 * cycle)
+    ldc.read_all_channels(num_chs=2)
+    assert sim.conversions == conversions
+
+
+def test_sim_ldc1414_output_gain(bus):
+    bus.attach(0x2B, SimLDC1414(fclk=40e6, sensor_frequency=[2e6] * 4))
+    ldc = LDC141X(bus, 0x2B)
+    assert ldc.get_device_id() == 0x3054
+    ldc.set_output_gain(0b01)
+    ldc.sleep_mode = False
+    bus.clock.sleep(0.01)
+    value, error = ldc.read_all_channels(num_chs=1)[0]
+    assert ldc.get_data_bits() == 14 and error == 0
+    assert value == int(2e6 / 40e6 * 2 ** 14)
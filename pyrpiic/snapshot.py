@@ -0,0 +1,209 @@
+''' Register snapshots: capture, restore and (de)serialize the writable register map of a device. '''
+import json
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from pyrpio.i2c.types import I2CBase
+from pyrpiic.batch import RegisterBatch
+from pyrpiic.registers import contiguous_runs
+
+# (first register, count) of registers accessible w/ one sequential read/write
+RegisterBlock = Tuple[int, int]
+
+SNAPSHOT_MAGIC = b'PRSN'
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct('>4sBBBB')  # magic, version, address, data size, device name length
+_RUN = struct.Struct('>BB')  # first register, count
+_FORMATS = {1: 'B', 2: 'H'}
+
+
+@dataclass
+class RegisterSnapshot:
+    '''
+    Writable register values of one device as captured by the driver's snapshot().
+
+    Args:
+        device (str): Driver class name. Restoring checks it matches the target driver.
+        address (int): I2C address the snapshot was taken from
+        data_size (int): Register size in bytes (1 or 2)
+        registers (Dict[int, int]): register address -> value
+    '''
+    device: str
+    address: int
+    data_size: int = 1
+    registers: Dict[int, int] = field(default_factory=dict)
+
+    def diff(self, other: 'RegisterSnapshot') -> Dict[int, Tuple[int, int]]:
+        ''' Registers whose values differ: register -> (own value, other value). '''
+        return {
+            r: (self.registers.get(r), other.registers.get(r))
+            for r in sorted(set(self.registers) | set(other.registers))
+            if self.registers.get(r) != other.registers.get(r)
+        }
+
+    def to_dict(self) -> Dict[str, object]:
+        ''' JSON-serializable form (register addresses as hex strings). '''
+        return {
+            'device': self.device,
+            'address': self.address,
+            'data_size': self.data_size,
+            'registers': {f'0x{r:02X}': v for r, v in sorted(self.registers.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> 'RegisterSnapshot':
+        ''' Inverse of to_dict(). '''
+        return cls(
+            device=data['device'], address=data['address'], data_size=data.get('data_size', 1),
+            registers={int(r, 0): v for r, v in data['registers'].items()},
+        )
+
+    def to_json(self, indent: int = 2) -> str:
+        ''' JSON form of to_dict(). '''
+        return json.dumps(self.to_dict(), indent=indent)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'RegisterSnapshot':
+        ''' Inverse of to_json(). '''
+        return cls.from_dict(json.loads(text))
+
+    def to_bytes(self) -> bytes:
+        '''
+        Compact binary form: header, device name and one (first register, count, values) record
+        per run of consecutive registers. Values are big-endian of data_size bytes.
+        '''
+        name = self.device.encode('utf-8')
+        runs = [(start, values[i:i + 0xFF]) for start, values in contiguous_runs(self.registers)
+                for i in range(0, len(values), 0xFF)]
+        data = bytearray(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.address, self.data_size, len(name)))
+        data += name
+        data += struct.pack('>H', len(runs))
+        for start, values in runs:
+            data += _RUN.pack(start, len(values))
+            data += struct.pack(f'>{len(values)}{_FORMATS[self.data_size]}', *values)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'RegisterSnapshot':
+        ''' Inverse of to_bytes(). '''
+        magic, version, address, data_size, name_length = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError('Not a register snapshot (or unsupported version)')
+        offset = _HEADER.size
+        device = data[offset:offset + name_length].decode('utf-8')
+        offset += name_length
+        num_runs, = struct.unpack_from('>H', data, offset)
+        offset += 2
+        registers: Dict[int, int] = {}
+        for _ in range(num_runs):
+            start, count = _RUN.unpack_from(data, offset)
+            offset += _RUN.size
+            values = struct.unpack_from(f'>{count}{_FORMATS[data_size]}', data, offset)
+            offset += count * data_size
+            registers.update(zip(range(start, start + count), values))
+        return cls(device=device, address=address, data_size=data_size, registers=registers)
+
+    def save(self, path: str):
+        ''' Write snapshot to path. Paths ending in .json are written as JSON, others as binary. '''
+        if str(path).endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as fp:
+                fp.write(self.to_json())
+        else:
+            with open(path, 'wb') as fp:
+                fp.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'RegisterSnapshot':
+        ''' Read snapshot written by save(). '''
+        with open(path, 'rb') as fp:
+            data = fp.read()
+        if data.startswith(SNAPSHOT_MAGIC):
+            return cls.from_bytes(data)
+        return cls.from_json(data.decode('utf-8'))
+
+
+def read_blocks(bus: I2CBase, address: int, blocks: Sequence[RegisterBlock], data_size: int = 1,
+                command: int = 0x00) -> Dict[int, int]:
+    '''
+    Read register blocks w/ one sequential read each, all submitted as one combined transfer.
+
+    Args:
+        bus (I2CBase): I2C bus of the device
+        address (int): I2C address of the device
+        blocks (Sequence[RegisterBlock]): (first register, count) per sequential read
+        data_size (int, optional): Register size in bytes. Defaults to 1.
+        command (int, optional): Bits OR'ed into register address of sequential reads
+            (e.g. auto-increment flag). Defaults to 0x00.
+
+    Returns:
+        Dict[int, int]: register -> value
+    '''
+    with RegisterBatch(bus, address, data_size=data_size) as batch:
+        reads = [(start, batch.read_register_sequential(start | (command if count > 1 else 0), count))
+                 for start, count in blocks]
+    return {start + i: v for start, read in reads for i, v in enumerate(read.values())}
+
+
+def changed_runs(blocks: Sequence[RegisterBlock], current: Dict[int, int],
+                 target: Dict[int, int]) -> List[Tuple[int, List[int]]]:
+    '''
+    Group target registers that differ from current into runs of consecutive registers.
+    Runs never cross block boundaries so each can be written w/ one sequential write.
+
+    Returns:
+        List[Tuple[int, List[int]]]: (first register, values) per run
+    '''
+    runs: List[Tuple[int, List[int]]] = []
+    for start, count in blocks:
+        changes = {r: target[r] for r in range(start, start + count) if r in target and current.get(r) != target[r]}
+        runs.extend(contiguous_runs(changes))
+    return runs
+
+
+def queue_runs(batch: RegisterBatch, runs: Sequence[Tuple[int, List[int]]], command: int = 0x00):
+    ''' Queue one (sequential) write per run. '''
+    for start, values in runs:
+        if len(values) == 1:
+            batch.write_register(start, values[0])
+        else:
+            batch.write_register_sequential(start | command, values)
+
+
+def check_snapshot(driver: object, snapshot: RegisterSnapshot, blocks: Sequence[RegisterBlock]):
+    ''' Raise ValueError if snapshot was not taken from same kind of device or has unknown registers. '''
+    if snapshot.device != type(driver).__name__:
+        raise ValueError(f'Snapshot of {snapshot.device} cannot be restored to {type(driver).__name__}')
+    known = {r for start, count in blocks for r in range(start, start + count)}
+    unknown = sorted(set(snapshot.registers) - known)
+    if unknown:
+        raise ValueError(f'Snapshot has registers not restorable by {snapshot.device}: '
+                         f'{", ".join(f"0x{r:02X}" for r in unknown)}')
+
+
+def take_snapshot(driver: object, blocks: Sequence[RegisterBlock], data_size: int = 1,
+                  command: int = 0x00) -> RegisterSnapshot:
+    ''' Snapshot of driver's device (driver needs bus and address attributes) w/ one combined transfer. '''
+    registers = read_blocks(driver.bus, driver.address, blocks, data_size=data_size, command=command)
+    return RegisterSnapshot(type(driver).__name__, driver.address, data_size, registers)
+
+
+def restore_snapshot(driver: object, snapshot: RegisterSnapshot, blocks: Sequence[RegisterBlock],
+                     command: int = 0x00, write_blocks: Optional[Sequence[RegisterBlock]] = None) -> Dict[int, int]:
+    '''
+    Write registers of snapshot that differ from the device. Current values are read w/ one
+    combined transfer and changed registers are written w/ another, grouped into sequential writes.
+
+    Args:
+        write_blocks (Sequence[RegisterBlock], optional): Blocks the writes are grouped by, in write
+            order (for devices that need some registers written last). Defaults to blocks.
+
+    Returns:
+        Dict[int, int]: registers written
+    '''
+    check_snapshot(driver, snapshot, blocks)
+    data_size = snapshot.data_size
+    current = read_blocks(driver.bus, driver.address, blocks, data_size=data_size, command=command)
+    runs = changed_runs(write_blocks or blocks, current, snapshot.registers)
+    with RegisterBatch(driver.bus, driver.address, data_size=data_size) as batch:
+        queue_runs(batch, runs, command=command)
+    return {start + i: v for start, values in runs for i, v in enumerate(values)}
@@ -0,0 +1,32 @@
+''' Driver operations split into bus I/O steps separated by waits. '''
+import time
+from typing import Generator, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Generator performing bus I/O, yielding delays (s) to wait before it is resumed and
+# returning the operation's result. Drivers expose these as <operation>_steps() so the
+# same sequence can be run blocking (run_steps), on asyncio (pyrpiic.aio) or by a scheduler.
+Steps = Generator[float, None, T]
+
+
+def advance(steps: Steps) -> Tuple[bool, object]:
+    '''
+    Run steps up to their next wait.
+
+    Returns:
+        Tuple[bool, object]: (True, result) once finished otherwise (False, delay)
+    '''
+    try:
+        return False, next(steps)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+def run_steps(steps: Steps[T]) -> T:
+    ''' Run steps to completion blocking w/ time.sleep for each wait. '''
+    done, value = advance(steps)
+    while not done:
+        time.sleep(value)
+        done, value = advance(steps)
+    return value
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from pyrpiic.aio import AsyncDriver, bus_executor
+from pyrpiic.eeprom import EEPROM
+from pyrpiic.sensor.hdc1080 import HDC1080
+from pyrpiic.sim import LatencyModel, SimClock, SimEEPROM, SimHDC1080, SimI2C
+
+
+def make_bus(path):
+    bus = SimI2C(path, clock=SimClock(realtime=True), latency=LatencyModel(frequency=1e9, overhead=0.0))
+    bus.open()
+    return bus
+
+
+def test_async_eeprom_write_cycles_overlap():
+    bus = make_bus('/dev/i2c-aio0')
+    sims = [bus.attach(0x50 + i, SimEEPROM(write_time=0.02)) for i in range(4)]
+    eeproms = [AsyncDriver(EEPROM(bus, 0x50 + i, write_time_ms=20)) for i in range(4)]
+    data = [bytes([i]) * 64 for i in range(4)]  # 4 pages (80 ms) per device
+
+    async def program():
+        await asyncio.gather(*(eeprom.write_sequential_bytes(0, d) for eeprom, d in zip(eeproms, data)))
+        return await asyncio.gather(*(eeprom.read_sequential_bytes(0, 64) for eeprom in eeproms))
+
+    readback = asyncio.run(program())
+    assert readback == data
+    assert [sim.write_cycles for sim in sims] == [4] * 4
+    # Write cycles interleave: every device starts before any device writes its last page
+    # (serialized, each device would finish all 4 pages before the next one starts)
+    assert max(sim.write_cycle_starts[0] for sim in sims) < min(sim.write_cycle_starts[-1] for sim in sims)
+
+
+def test_async_drivers_across_buses():
+    hdc_bus, eeprom_bus = make_bus('/dev/i2c-aio1'), make_bus('/dev/i2c-aio2')
+    hdc_bus.attach(0x40, SimHDC1080(temperature=30.0, humidity=55.0))
+    eeprom_bus.attach(0x50, SimEEPROM())
+    assert bus_executor(hdc_bus) is not bus_executor(eeprom_bus)
+
+    async def main():
+        sensor = await AsyncDriver.create(HDC1080, hdc_bus, 0x40)
+        eeprom = AsyncDriver(EEPROM(eeprom_bus, 0x50))
+        await sensor.configure()
+        reading, _ = await asyncio.gather(sensor.read_temperature_humidity(), eeprom.write_string(0, 'SN42'))
+        return reading, await eeprom.read_string(0), sensor
+
+    (temperature, humidity), serial, sensor = asyncio.run(main())
+    assert temperature == pytest.approx(30.0, abs=0.1) and humidity == pytest.approx(55.0, abs=0.1)
+    assert serial == 'SN42'
+    assert sensor.address == 0x40
+    with pytest.raises(AttributeError):
+        sensor.unknown_method  # pylint: disable=pointless-statement
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from pyrpiic.arbiter import BusArbiter, SharedBus
+from pyrpiic.ioexpander import PCA9698, TCA6416A
+from pyrpiic.sim import SimI2C, SimPCA9698, SimTCA6416A
+
+
+class SlowI2C(SimI2C):
+    ''' Simulated bus that yields between set_address and transfer to provoke interleaving. '''
+
+    def set_address(self, address: int):
+        super().set_address(address)
+        time.sleep(0.0001)
+
+
+@pytest.fixture(autouse=True)
+def fixture_registry():
+    yield
+    BusArbiter.clear()
+
+
+def make_bus(path: str) -> SlowI2C:
+    bus = SlowI2C(path)
+    bus.attach(0x20, SimTCA6416A()).pins[0] = 0x12
+    bus.attach(0x21, SimPCA9698()).pins[0] = 0x34
+    bus.open()
+    return bus
+
+
+def test_shared_bus_serializes_threads():
+    bus = SharedBus(make_bus('/dev/i2c-arbiter-0'))
+    drivers = {0x12: TCA6416A(bus, 0x20), 0x34: PCA9698(bus, 0x21)}
+    errors = []
+
+    def work(expected, expander):
+        for _ in range(50):
+            value = expander.get_register(0x00)
+            if value != expected:
+                errors.append(value)
+
+    threads = [threading.Thread(target=work, args=item) for item in drivers.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert bus.stats.acquisitions == 100
+    assert bus.stats.max_queue_depth <= 2
+
+
+def test_shared_bus_transaction():
+    raw = make_bus('/dev/i2c-arbiter-1')
+    bus = SharedBus(raw)
+    assert SharedBus(raw).arbiter is bus.arbiter is BusArbiter.for_bus(raw)
+    expander = TCA6416A(bus, 0x20)
+    for _ in range(5):
+        expander.get_register(0x00)
+    with bus.transaction(0x21):
+        bus.write(b'\x88\x55')
+        assert bus.read_write(b'\x08') == b'\x55'
+    assert bus.stats.acquisitions == 6  # nested operations join transaction
+
+
+def test_arbiter_registry_removal():
+    raw = make_bus('/dev/i2c-arbiter-2')
+    bus = SharedBus(raw)
+    TCA6416A(bus, 0x20).get_register(0x00)
+    assert BusArbiter.arbiters() == {'/dev/i2c-arbiter-2': bus.arbiter}
+    assert BusArbiter.remove(raw) is bus.arbiter
+    assert BusArbiter.remove(raw) is None and not BusArbiter.arbiters()
+    fresh = SharedBus(raw)
+    assert fresh.arbiter is not bus.arbiter and fresh.stats.acquisitions == 0
+    SharedBus(make_bus('/dev/i2c-arbiter-3'))
+    BusArbiter.clear()
+    assert not BusArbiter.arbiters()
@@ -0,0 +1,54 @@
+import pytest
+
+from pyrpiic.batch import I2C_RDWR_MAX_MESSAGES, RegisterBatch
+from pyrpiic.sim import SimI2C, SimLDC1614, SimSI570
+
+
+class NoTransferI2C(SimI2C):
+    def transfer(self, address, messages):
+        raise NotImplementedError()
+
+
+def test_register_batch_single_transfer():
+    bus = SimI2C()
+    sim = bus.attach(0x2A, SimLDC1614())
+    bus.open()
+    with RegisterBatch(bus, 0x2A, data_size=2) as batch:
+        batch.write_register_sequential(0x08, [0x1000, 0x2000])
+        ids = batch.read_register_sequential(0x7E, 2)
+        rcount = batch.read_register(0x09)
+        with pytest.raises(RuntimeError):
+            rcount.result()
+    assert bus.transactions == 1
+    assert ids.values() == (0x5449, 0x3055)
+    assert rcount.result() == 0x2000
+    assert sim.registers[0x08] == 0x1000
+
+
+def test_register_batch_chunks_and_fallback():
+    bus = SimI2C()
+    bus.attach(0x55, SimSI570())
+    bus.open()
+    batch = RegisterBatch(bus, 0x55)
+    reads = [batch.read_register(7 + i % 6) for i in range(I2C_RDWR_MAX_MESSAGES)]
+    assert batch.submit() == 2  # 84 messages split at ioctl limit
+    assert all(read.done() for read in reads)
+    slow_bus = NoTransferI2C()
+    slow_bus.attach(0x55, SimSI570())
+    slow_bus.open()
+    with RegisterBatch(slow_bus, 0x55) as batch:
+        hs_n1 = batch.read_register(7)
+        batch.write_register(137, 0x10)
+    assert slow_bus.transactions == 2
+    assert hs_n1.result() == reads[0].result()
+
+
+def test_register_batch_discarded_on_error():
+    bus = SimI2C()
+    sim = bus.attach(0x55, SimSI570())
+    bus.open()
+    with pytest.raises(ValueError):
+        with RegisterBatch(bus, 0x55) as batch:
+            batch.write_register(137, 0x10)
+            raise ValueError()
+    assert bus.transactions == 0 and not sim.frozen
@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from pyrpiic.cli import Session, main, parse_frequency, run_script
+from pyrpiic.sim import SimClock, SimEEPROM, SimHDC1080, SimI2C, SimLMK61E2, SimTCA6416A
+
+
+@pytest.fixture(name='sim')
+def fixture_sim():
+    bus = SimI2C('/dev/i2c-sim', clock=SimClock())
+    bus.attach(0x50, SimEEPROM())
+    bus.attach(0x5A, SimLMK61E2())
+    bus.attach(0x20, SimTCA6416A()).pins[0] = 0x04  # P02 input high
+    bus.attach(0x40, SimHDC1080(temperature=30.0, humidity=50.0))
+    opened = []
+
+    def factory(path):
+        assert path == '/dev/i2c-sim'
+        opened.append(path)
+        return bus
+    bus.factory, bus.opened = factory, opened
+    with bus.clock.patch_sleep():
+        yield bus
+
+
+def test_parse_frequency():
+    assert parse_frequency('156.25M') == pytest.approx(156.25e6)
+    assert parse_frequency('100MHz') == pytest.approx(100e6)
+    assert parse_frequency('32768') == 32768
+
+
+def test_batch_session(sim, tmp_path):
+    image = tmp_path / 'board.bin'
+    image.write_bytes(b'SN-0042' + bytes(range(40)))
+    script = f'''
+    # board bring-up
+    eeprom program {image} --offset 0x10 --verify
+    clock set 100M --nonvolatile
+    clock get
+    gpio set P00=1 P01=low
+    gpio get P00 P01 P02
+    sensor stream --count 2 --interval 0
+    eeprom dump --offset 0x10 --length 16
+    '''
+    out = io.StringIO()
+    session = Session(bus_factory=sim.factory, out=out)
+    run_script(session, script.splitlines(), bus='/dev/i2c-sim')
+    session.close()
+
+    lines = out.getvalue().splitlines()
+    assert lines[:4] == ['programmed 47 bytes at 0x0010', 'verified 47 bytes at 0x0010', '100000000.000000',
+                         '100000000.000000']
+    assert lines[4] == 'P00=1 P01=0 P02=1'
+    assert lines[5] == 'timestamp,temperature,humidity'
+    for line in lines[6:8]:
+        assert [float(v) for v in line.split(',')[1:]] == pytest.approx([30.0, 50.0], abs=0.01)
+    assert lines[8].startswith('0010: 53 4E 2D 30 30 34 32 00') and lines[8].endswith('|SN-0042.........|')
+    assert sim.opened == ['/dev/i2c-sim']  # one bus session for all commands
+    assert sim.devices[0x5A].nvm_writes == 1
+
+
+def test_main_errors(sim, tmp_path, capsys):
+    image = tmp_path / 'board.bin'
+    image.write_bytes(b'\x00' * 8)
+    assert main(['--bus', '/dev/i2c-sim', 'eeprom', 'verify', str(image)], bus_factory=sim.factory) == 1
+    assert 'verify failed: 8 byte(s) differ, first at 0x0000' in capsys.readouterr().err
+    assert main(['clock', 'set', 'fast'], bus_factory=sim.factory) == 2
+
+    script = tmp_path / 'steps.txt'
+    script.write_text('gpio set P00\nclock get\n')
+    assert main(['--bus', '/dev/i2c-sim', 'batch', str(script), '--keep-going'], bus_factory=sim.factory) == 1
+    captured = capsys.readouterr()
+    assert 'line 1: expected PIN=LEVEL: P00' in captured.err
+    assert captured.out == '156250000.000000\n'
+
+    # Help and unbalanced quotes fail their line instead of ending the batch
+    script.write_text('scan --help\ngpio set "P00=1\nclock get\n')
+    assert main(['--bus', '/dev/i2c-sim', 'batch', str(script), '--keep-going'], bus_factory=sim.factory) == 1
+    captured = capsys.readouterr()
+    assert 'line 1: help cannot be used in batch' in captured.err
+    assert 'line 2: No closing quotation' in captured.err
+    assert captured.out.endswith('156250000.000000\n')
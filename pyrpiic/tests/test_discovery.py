@@ -0,0 +1,60 @@
+from pyrpiic.discovery import discover
+from pyrpiic.ioexpander import PCA9698
+from pyrpiic.sensor.hdc1080 import HDC1080
+from pyrpiic.sim import (SimEEPROM, SimHDC1080, SimI2C, SimLDC1614, SimLMK61E2, SimPCA9698, SimSI570,
+                         SimTCA6416A)
+
+
+def make_buses():
+    sensors, clocks = SimI2C('/dev/i2c-sim3'), SimI2C('/dev/i2c-sim4')
+    sensors.attach(0x20, SimTCA6416A())
+    sensors.attach(0x21, SimPCA9698())
+    sensors.attach(0x2A, SimLDC1614())
+    sensors.attach(0x40, SimHDC1080())
+    sensors.attach(0x50, SimEEPROM())
+    clocks.attach(0x55, SimSI570())
+    clocks.attach(0x5A, SimLMK61E2())
+    return {bus.path: bus for bus in (sensors, clocks)}
+
+
+def test_discover_identifies_devices(tmp_path):
+    buses = make_buses()
+    cache_path = str(tmp_path / 'inventory.json')
+    inventory = discover(list(buses), bus_factory=buses.__getitem__, cache_path=cache_path)
+    assert not inventory.cached and not inventory.errors
+    found = {(device.bus, device.address): device.name for device in inventory.devices}
+    assert found == {
+        ('/dev/i2c-sim3', 0x20): 'TCA6416A', ('/dev/i2c-sim3', 0x21): 'PCA9698',
+        ('/dev/i2c-sim3', 0x2A): 'LDC161X', ('/dev/i2c-sim3', 0x40): 'HDC1080',
+        ('/dev/i2c-sim3', 0x50): 'unknown', ('/dev/i2c-sim4', 0x55): 'SI570',
+        ('/dev/i2c-sim4', 0x5A): 'LMK61E2',
+    }
+    assert [d.address for d in inventory.find('PCA9555')] == [0x20]
+    bus = buses['/dev/i2c-sim3']
+    bus.open()
+    assert isinstance(inventory.find('HDC1080')[0].create(bus), HDC1080)
+    assert isinstance(inventory.find('PCA9698')[0].create(bus), PCA9698)
+
+
+def test_discover_uses_cache(tmp_path):
+    buses = make_buses()
+    cache_path = str(tmp_path / 'inventory.json')
+    first = discover(list(buses), bus_factory=buses.__getitem__, cache_path=cache_path)
+    transactions = sum(bus.transactions for bus in buses.values())
+
+    cached = discover(list(buses), bus_factory=buses.__getitem__, cache_path=cache_path)
+    assert cached.cached and cached.devices == first.devices
+    assert sum(bus.transactions for bus in buses.values()) == transactions  # no probing
+
+    refreshed = discover(list(buses), bus_factory=buses.__getitem__, cache_path=cache_path, refresh=True)
+    assert not refreshed.cached and refreshed.devices == first.devices
+    other = discover(['/dev/i2c-sim4'], bus_factory=buses.__getitem__, cache_path=cache_path)
+    assert not other.cached and {d.name for d in other.devices} == {'SI570', 'LMK61E2'}
+
+
+def test_discover_bus_errors(tmp_path):
+    def factory(path):
+        raise FileNotFoundError(path)
+    inventory = discover(['/dev/i2c-missing'], bus_factory=factory, cache_path=str(tmp_path / 'inventory.json'))
+    assert not inventory.devices and '/dev/i2c-missing' in inventory.errors
+    assert not (tmp_path / 'inventory.json').exists()
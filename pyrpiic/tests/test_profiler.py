@@ -0,0 +1,50 @@
+import time
+
+from pyrpiic.ioexpander.pca9698 import PCA9698
+from pyrpiic.profiler import I2CProfiler
+from pyrpiic.sim import SimI2C, SimPCA9698
+
+
+def test_profiler_counts_per_device_and_method():
+    bus = SimI2C('/dev/i2c-3')
+    bus.attach(0x20, SimPCA9698())
+    bus.open()
+    profiler = I2CProfiler()
+    expander = profiler.instrument(PCA9698(profiler.wrap_bus(bus), 0x20))
+    expander.set_gpio_output('IO0_1', True)
+    expander.get_output_ports()
+    device = profiler.devices[('/dev/i2c-3', 0x20)]
+    assert (device.transactions, device.reads, device.writes) == (3, 2, 3)
+    method = profiler.methods['PCA9698.set_gpio_output']
+    assert (method.calls, method.transactions, method.bytes_written) == (1, 2, 3)
+    assert profiler.methods['PCA9698.set_register_bit'].transactions == 2
+    assert profiler.methods['PCA9698.get_output_ports'].bytes_read == 5
+    assert 'PCA9698.set_gpio_output' in profiler.summary()
+    assert sum(count for _, count in profiler.histogram('PCA9698.set_gpio_output')) == 1
+    assert profiler.as_dict()['devices']['/dev/i2c-3@0x20']['transactions'] == 3
+    I2CProfiler.uninstrument(expander)
+    expander.set_gpio_output('IO0_1', False)
+    assert profiler.methods['PCA9698.set_gpio_output'].calls == 1
+
+
+def test_profiler_records_sleeps():
+    slept = []
+    profiler = I2CProfiler(sleep=slept.append)
+    with profiler:
+        time.sleep(0.25)
+    time.sleep(0)
+    assert slept == [0.25]
+
+
+def test_profilers_overlap():
+    original = time.sleep
+    first_slept, second_slept = [], []
+    first, second = I2CProfiler(sleep=first_slept.append), I2CProfiler(sleep=second_slept.append)
+    first.start()
+    second.start()
+    time.sleep(0.5)  # slept once, w/ sleep of latest profiler
+    first.stop()  # stopped out of order
+    time.sleep(0.25)
+    second.stop()
+    assert time.sleep is original
+    assert first_slept == [] and second_slept == [0.5, 0.25]
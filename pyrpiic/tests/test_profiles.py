@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from pyrpiic import profiles
+from pyrpiic.ioexpander.pca9698 import PCA9698
+from pyrpiic.profiles import apply_profile, compile_profile
+from pyrpiic.sensor.ldc161x import LDC161X
+from pyrpiic.sim import SimI2C, SimLDC1614, SimLMK61E2, SimPCA9698, SimSI570
+
+TIMING = {'fclk': 40e6, 'fsensor_min': 1e6, 'fsensor_max': 5e6, 'num_chs': 4, 'sample_rate': 1000}
+
+
+def make_bus(address, device) -> SimI2C:
+    bus = SimI2C()
+    bus.attach(address, device)
+    bus.open()
+    return bus
+
+
+def test_clock_profiles():
+    lmk = SimLMK61E2()
+    bus = make_bus(0x5A, lmk)
+    compiled = compile_profile({'device': 'LMK61E2', 'address': 0x5A, 'settings': {'frequency': 100e6}},
+                               cache_dir=None)
+    assert [register for register, _ in compiled.writes] == [22, 21]  # R22-R35 merged, then R21
+    assert compiled.apply(bus) == 1
+    assert lmk.frequency == pytest.approx(100e6)
+
+    si570 = SimSI570()
+    bus = make_bus(0x55, si570)
+    si570.registers[137] = 0x80  # reserved bit set
+    writes = []
+    write_register = si570.write_register
+
+    def record_write(register, value):
+        writes.append((register, value))
+        write_register(register, value)
+
+    si570.write_register = record_write
+    compiled = compile_profile({'device': 'SI570', 'settings': {'frequency': 156.25e6}}, cache_dir=None)
+    assert profiles.CompiledProfile.from_dict(json.loads(json.dumps(compiled.to_dict()))) == compiled
+    assert apply_profile(bus, compiled, address=0x55) == 2  # read control registers, write
+    assert si570.frequency == pytest.approx(156.25e6)
+    assert si570.unfrozen_writes == 0 and not si570.frozen
+    # Control registers are read-modify-written (other bits kept)
+    assert [w for w in writes if w[0] in (135, 137)] == [(137, 0x90), (137, 0x80), (135, 0x40)]
+
+
+def test_expander_profile_matches_setters():
+    settings = {'outputs': {'IO0_0': 1, 'IO3_7': 0}, 'directions': {'IO0_0': 'OUT', 'IO3_7': 'OUT'}}
+    compiled = compile_profile({'device': 'PCA9698', 'settings': settings}, cache_dir=None)
+    assert compiled.writes == [(0x88, [0xFF, 0xFF, 0xFF, 0x7F, 0xFF]), (0x98, [0xFE, 0xFF, 0xFF, 0x7F, 0xFF])]
+    profiled, configured = SimPCA9698(), SimPCA9698()
+    compiled.apply(make_bus(0x20, profiled), address=0x20)
+    expander = PCA9698(make_bus(0x20, configured), 0x20)
+    expander.set_gpio_outputs(settings['outputs'])
+    expander.set_gpio_directions(settings['directions'])
+    assert profiled.registers == configured.registers
+    with pytest.raises(ValueError):
+        compile_profile({'device': 'PCA9698', 'settings': {'outputs': {'P00': 1}}}, cache_dir=None)
+
+
+def test_ldc_profile_cached(tmp_path, monkeypatch):
+    path = tmp_path / 'ldc.json'
+    path.write_text(json.dumps({'device': 'LDC161X', 'address': 0x2A, 'settings': {
+        'timing': TIMING, 'sequential_channels': 4, 'channels': {'1': {'drive_current': 0x0F}}, 'sleep_mode': False
+    }}))
+    cache_dir = tmp_path / 'cache'
+    compiled = compile_profile(str(path), cache_dir=str(cache_dir))
+    assert compiled.writes[0] == (0x1A, [0x2801]) and compiled.writes[-1] == (0x1A, [0x0801])
+    profiled, configured = SimLDC1614(), SimLDC1614()
+    assert compiled.apply(make_bus(0x2A, profiled)) == 1
+    ldc = LDC161X(make_bus(0x2A, configured))
+    ldc.apply_timing_plan(ldc.plan_timing(**TIMING))
+    ldc.configure_sequential_channels(4)
+    ldc.set_channel_drive_current(1, 0x0F)
+    ldc.sleep_mode = False
+    registers = [r for r in range(0x08, 0x22) if r in configured.RESET_VALUES and r != 0x18]
+    assert [profiled.registers[r] for r in registers] == [configured.registers[r] for r in registers]
+
+    # Cached plan is used w/o compiling again
+    monkeypatch.setattr(profiles, 'profile_driver', None)
+    assert compile_profile(str(path), cache_dir=str(cache_dir)) == compiled
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # Plans compiled by another package version are not reused
+    monkeypatch.setattr(profiles, '__version__', '0.0.0')
+    assert profiles.profile_key(profiles.load_profile(str(path))) != compiled.key
@@ -0,0 +1,23 @@
+import numpy as np
+
+from pyrpiic.ringbuffer import RingBuffer
+
+
+def test_ringbuffer_latest_wraps_contiguously():
+    buffer = RingBuffer(4, [('timestamp', 'f8'), ('value', 'i4')])
+    for i in range(10):
+        buffer.append((i * 0.1, i))
+    latest = buffer.latest(3)
+    assert list(latest['value']) == [7, 8, 9]
+    assert np.shares_memory(latest, buffer.latest())
+    assert list(buffer.latest()['value']) == [6, 7, 8, 9]
+    assert len(buffer) == 4 and buffer.count == 10
+
+
+def test_ringbuffer_statistics():
+    buffer = RingBuffer(8, [('value', 'f8')])
+    assert buffer.statistics('value')['count'] == 0
+    for value in (1.0, 2.0, 3.0):
+        buffer.append((value,))
+    stats = buffer.statistics('value')
+    assert stats['mean'] == 2.0 and stats['min'] == 1.0 and stats['max'] == 3.0
@@ -0,0 +1,65 @@
+import pytest
+
+from pyrpiic.eeprom import EEPROM
+from pyrpiic.scheduler import StepScheduler
+from pyrpiic.sensor.hdc1080 import HDC1080
+from pyrpiic.sim import LatencyModel, SimClock, SimEEPROM, SimHDC1080, SimI2C
+
+
+@pytest.fixture(name='bus')
+def fixture_bus():
+    bus = SimI2C('/dev/i2c-sim', clock=SimClock(), latency=LatencyModel(frequency=400e3))
+    bus.open()
+    bus.eeproms = [bus.attach(0x50 + i, SimEEPROM()) for i in range(20)]
+    bus.attach(0x40, SimHDC1080(temperature=30.0))
+    with bus.clock.patch_sleep():
+        yield bus
+
+
+def program_steps(bus):
+    image = bytes(range(64))  # 4 pages
+    steps = [EEPROM(bus, 0x50 + i).write_sequential_bytes_steps(0, image) for i in range(20)]
+    return steps + [HDC1080(bus, 0x40).read_temperature_steps()]
+
+
+def test_scheduler_overlaps_waits(bus):
+    operations = program_steps(bus)
+    start = bus.clock.now()
+    scheduler = StepScheduler(clock=bus.clock.now)
+    tasks = [scheduler.submit(steps) for steps in operations]
+    stats = scheduler.run()
+    scheduled_time = bus.clock.now() - start
+
+    assert all(task.done() for task in tasks)
+    assert tasks[-1].result() == pytest.approx(30.0, abs=0.1)
+    assert all(sim.memory[:64] == bytes(range(64)) for sim in bus.eeproms)
+    assert stats.tasks == 21 and stats.steps == 20 * 5 + 2
+    assert stats.elapsed == pytest.approx(scheduled_time)
+    assert stats.busy_time + stats.idle_time == pytest.approx(stats.elapsed)
+    assert 0 < stats.utilization < 1
+
+    # Same operations as blocking calls (waits serialize)
+    operations = program_steps(bus)
+    scheduler = StepScheduler(clock=bus.clock.now)
+    start = bus.clock.now()
+    for steps in operations:
+        scheduler.submit(steps)
+        scheduler.run()
+    assert bus.clock.now() - start > 5 * scheduled_time
+
+
+def test_scheduler_task_errors(bus):
+    def failing():
+        yield 0.001
+        raise ValueError('boom')
+
+    scheduler = StepScheduler(clock=bus.clock.now)
+    bad = scheduler.submit(failing(), name='bad')
+    good = scheduler.submit(EEPROM(bus, 0x50).write_byte_steps(0, b'\x5A'))
+    assert not bad.done()
+    with pytest.raises(RuntimeError):
+        bad.result()
+    scheduler.run()
+    with pytest.raises(ValueError):
+        bad.result()
+    assert good.result() is None and bus.eeproms[0].memory[0] == 0x5A
@@ -0,0 +1,132 @@
+import pytest
+
+from pyrpiic.clock.defs import LMK61E2ClockMode
+from pyrpiic.clock.lmk61e2 import LMK61E2
+from pyrpiic.clock.si570 import SI570
+from pyrpiic.ioexpander.pca9698 import PCA9698
+from pyrpiic.ioexpander.tca6416a import TCA6416A
+from pyrpiic.sensor.hdc1080 import HDC1080
+from pyrpiic.sensor.ldc141x import LDC141X
+from pyrpiic.sensor.ldc161x import LDC161X
+from pyrpiic.sim import (SimClock, SimHDC1080, SimI2C, SimLDC1414, SimLDC1614, SimLMK61E2, SimPCA9698, SimSI570,
+                         SimTCA6416A)
+from pyrpiic.snapshot import RegisterSnapshot
+
+
+@pytest.fixture(name='bus')
+def fixture_bus():
+    bus = SimI2C(clock=SimClock())
+    bus.attach(0x20, SimTCA6416A())
+    bus.attach(0x21, SimPCA9698())
+    bus.attach(0x40, SimHDC1080())
+    bus.attach(0x2A, SimLDC1614())
+    bus.attach(0x2B, SimLDC1414())
+    bus.attach(0x55, SimSI570())
+    bus.attach(0x5A, SimLMK61E2())
+    bus.open()
+    with bus.clock.patch_sleep():
+        yield bus
+
+
+def test_expander_snapshot_restore(bus, tmp_path):
+    expander = PCA9698(bus, 0x21, shadow=True)
+    expander.set_gpio_direction('IO0_0', 'OUT')
+    expander.set_gpio_output('IO3_7', False)
+    start = bus.transactions
+    snapshot = expander.snapshot()
+    assert bus.transactions - start == 1
+    assert snapshot.registers[0x18] == 0xFE and snapshot.registers[0x0B] == 0x7F
+
+    expander.set_output_ports([0x00] * 5)
+    start = bus.transactions
+    written = expander.restore(snapshot)
+    assert bus.transactions - start == 2  # read current, write changes
+    assert written == {0x08: 0xFF, 0x09: 0xFF, 0x0A: 0xFF, 0x0B: 0x7F, 0x0C: 0xFF}
+    assert bus.devices[0x21].registers[0x0B] == 0x7F
+    assert not expander.get_gpio_output('IO3_7') and expander.get_gpio_output('IO0_1')
+    assert expander.restore(snapshot) == {}
+
+    path = tmp_path / 'pca9698.bin'
+    snapshot.save(path)
+    assert RegisterSnapshot.load(path) == snapshot
+    assert len(path.read_bytes()) < len(snapshot.to_json())
+    with pytest.raises(ValueError):
+        TCA6416A(bus, 0x20).restore(snapshot)
+
+
+def test_tca6416a_snapshot_restore(bus):
+    expander = TCA6416A(bus, 0x20)
+    expander.set_gpio_direction('P10', 'OUT')
+    snapshot = expander.snapshot()
+    assert sorted(snapshot.registers) == list(range(0x02, 0x08))
+    expander.set_gpio_direction('P10', 'IN')
+    expander.set_gpio_polarity('P00', True)
+    assert expander.restore(snapshot) == {0x04: 0x00, 0x07: 0xFE}
+    assert expander.get_gpio_direction('P10') == 'OUT' and not expander.get_gpio_polarity('P00')
+
+
+def test_clock_snapshot_restore(bus, tmp_path, monkeypatch):
+    lmk = LMK61E2(bus, 0x5A)
+    snapshot = lmk.snapshot()
+    regs = lmk.freq2regs(100e6)
+    regs.odf = LMK61E2ClockMode.HCSL.value
+    lmk.set_registers(regs)
+    transfers = []
+    transfer = bus.transfer
+
+    def record_transfer(address, messages):
+        transfers.append([bytes(m.data)[0] for m in messages])
+        transfer(address, messages)
+
+    monkeypatch.setattr(bus, 'transfer', record_transfer)
+    assert 21 in lmk.restore(snapshot)
+    assert len(transfers[-1]) > 1 and transfers[-1][-1] == 21  # R21 (output format) last
+    monkeypatch.undo()
+    assert bus.devices[0x5A].frequency == pytest.approx(156.25e6)
+    assert lmk.restore(snapshot) == {}
+
+    si570 = SI570(bus, 0x55)
+    sim = bus.devices[0x55]
+    path = tmp_path / 'si570.json'
+    si570.snapshot().save(path)
+    si570.set_registers(si570.freq2reg(156.25e6))
+    assert sim.frequency == pytest.approx(156.25e6)
+    start, unfrozen = bus.transactions, sim.unfrozen_writes
+    assert si570.restore(RegisterSnapshot.load(path))
+    assert bus.transactions - start == 2
+    assert sim.frequency == pytest.approx(100e6) and sim.unfrozen_writes == unfrozen and not sim.frozen
+
+
+def test_sensor_snapshot_restore(bus):
+    hdc = HDC1080(bus, 0x40)
+    hdc.set_temperature_resolution(HDC1080.TempResolution.eleven)
+    hdc.turn_heater_on()
+    snapshot = hdc.snapshot()
+    hdc.configure()
+    assert hdc.restore(snapshot) == {0x02: snapshot.registers[0x02]}
+    assert hdc.temperature_resolution == HDC1080.TempResolution.eleven
+    assert hdc.restore(snapshot) == {}
+
+    ldc = LDC161X(bus, 0x2A)
+    sim = bus.devices[0x2A]
+    ldc.set_channel_reference_count(1, 0x1234)
+    ldc.configure_sequential_channels(2)
+    ldc.sleep_mode = False
+    snapshot = ldc.snapshot()
+    assert snapshot.data_size == 2 and RegisterSnapshot.from_bytes(snapshot.to_bytes()) == snapshot
+    ldc.sleep_mode = True
+    ldc.set_channel_reference_count(1, 0x0080)
+    written = ldc.restore(snapshot)
+    assert written == {0x09: 0x1234, 0x1A: snapshot.registers[0x1A]}
+    assert sim.registers[0x09] == 0x1234 and sim.active
+    assert ldc.restore(snapshot) == {}
+
+    # LDC141X snapshots include OUTPUT_GAIN (RESET_DEV bits 10:9) but never the reset bit
+    ldc14 = LDC141X(bus, 0x2B)
+    ldc14.set_output_gain(0b10)
+    snapshot = ldc14.snapshot()
+    assert snapshot.registers[0x1C] == 0x0400
+    ldc14.set_output_gain(0b00)
+    assert ldc14.restore(snapshot) == {0x1C: 0x0400}
+    assert ldc14.get_output_gain() == 0b10 and ldc14.get_data_bits() == 15
+    assert ldc14.restore(snapshot) == {}
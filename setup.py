@@ -20,5 +20,8 @@ setup(
     author_email='samtec-ash@samtec.com',
     url='https://github.com/Samtec-ASH/pyrpiic',
     packages=find_packages(),
+    entry_points={
+        'console_scripts': ['pyrpiic=pyrpiic.cli:main'],
+    },
     python_requires='>=3.6'
 )